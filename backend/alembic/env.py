@@ -10,7 +10,7 @@ from app.database import Base
 
 # Import all models so Alembic can detect them for autogenerate.
 # Without this import, Alembic sees an empty Base.metadata and generates nothing.
-from app.models import User, Room, RoomMember, Column, Card  # noqa: F401
+from app.models import User, Room, RoomMember, Column, Card, ArchivedCard, Activity, RecentOp  # noqa: F401
 
 
 # this is the Alembic Config object, which provides
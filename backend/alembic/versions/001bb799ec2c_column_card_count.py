@@ -0,0 +1,32 @@
+"""column card count
+
+Revision ID: 001bb799ec2c
+Revises: f410f1170309
+Create Date: 2026-10-19 11:48:05.907314
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '001bb799ec2c'
+down_revision: Union[str, None] = 'f410f1170309'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('columns', sa.Column('card_count', sa.Integer(), server_default='0', nullable=False))
+    # Backfill from the existing cards in one set-based statement
+    op.execute(
+        "UPDATE columns SET card_count = counts.n "
+        "FROM (SELECT column_id, count(*) AS n FROM cards GROUP BY column_id) AS counts "
+        "WHERE columns.id = counts.column_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('columns', 'card_count')
@@ -0,0 +1,36 @@
+"""recent ops
+
+Revision ID: 009506fcd3ed
+Revises: ec81a73842f2
+Create Date: 2026-10-19 14:41:37.902615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '009506fcd3ed'
+down_revision: Union[str, None] = 'ec81a73842f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('recent_ops',
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('action', sa.String(length=32), nullable=False),
+    sa.Column('card_id', sa.Uuid(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'key')
+    )
+    op.create_index('idx_recent_ops_created', 'recent_ops', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_recent_ops_created', table_name='recent_ops')
+    op.drop_table('recent_ops')
@@ -0,0 +1,28 @@
+"""room soft delete
+
+Revision ID: 0b6096c1d1b5
+Revises: 001bb799ec2c
+Create Date: 2026-10-19 12:31:52.204716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6096c1d1b5'
+down_revision: Union[str, None] = '001bb799ec2c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('rooms', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.create_index('idx_rooms_deleted', 'rooms', ['deleted_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_rooms_deleted', table_name='rooms')
+    op.drop_column('rooms', 'deleted_at')
@@ -0,0 +1,47 @@
+"""archived cards
+
+Revision ID: 167aa4d1dbcb
+Revises: 0b6096c1d1b5
+Create Date: 2026-10-19 13:20:44.371852
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '167aa4d1dbcb'
+down_revision: Union[str, None] = '0b6096c1d1b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('columns', sa.Column('auto_archive_days', sa.Integer(), nullable=True))
+    op.create_table('archived_cards',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('room_id', sa.Uuid(), nullable=False),
+    sa.Column('column_id', sa.Uuid(), nullable=True),
+    sa.Column('title', sa.String(length=300), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('created_by', sa.Uuid(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.Column('archived_by', sa.Uuid(), nullable=True),
+    sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['column_id'], ['columns.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['archived_by'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_archived_cards_room', 'archived_cards', ['room_id', 'archived_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_archived_cards_room', table_name='archived_cards')
+    op.drop_table('archived_cards')
+    op.drop_column('columns', 'auto_archive_days')
@@ -0,0 +1,26 @@
+"""room ws compression
+
+Revision ID: 9e3757be9c1e
+Revises: 009506fcd3ed
+Create Date: 2026-10-19 15:20:06.114237
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e3757be9c1e'
+down_revision: Union[str, None] = '009506fcd3ed'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('rooms', sa.Column('ws_compression', sa.Boolean(), server_default=sa.true(), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('rooms', 'ws_compression')
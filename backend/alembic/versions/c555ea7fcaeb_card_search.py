@@ -0,0 +1,45 @@
+"""card search
+
+Revision ID: c555ea7fcaeb
+Revises: 4e4afd60bb9d
+Create Date: 2026-10-19 10:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c555ea7fcaeb'
+down_revision: Union[str, None] = '4e4afd60bb9d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Trigram operators/index support for the prefix/typo fallback
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column('cards', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('idx_cards_search', 'cards', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'idx_cards_title_trgm', 'cards', ['title'], unique=False,
+        postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_cards_title_trgm', table_name='cards')
+    op.drop_index('idx_cards_search', table_name='cards')
+    op.drop_column('cards', 'search_vector')
@@ -0,0 +1,59 @@
+"""labels and assignees
+
+Revision ID: c938b07b2c29
+Revises: 9e3757be9c1e
+Create Date: 2026-10-19 18:02:41.508311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c938b07b2c29'
+down_revision: Union[str, None] = '9e3757be9c1e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('labels',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('room_id', sa.Uuid(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('color', sa.String(length=7), server_default='#6b7280', nullable=False),
+    sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('room_id', 'name', name='uq_label_room_name')
+    )
+    op.create_table('card_labels',
+    sa.Column('card_id', sa.Uuid(), nullable=False),
+    sa.Column('label_id', sa.Uuid(), nullable=False),
+    sa.ForeignKeyConstraint(['card_id'], ['cards.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['label_id'], ['labels.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('card_id', 'label_id')
+    )
+    op.create_index('idx_card_labels_label', 'card_labels', ['label_id', 'card_id'], unique=False)
+    op.create_table('card_assignees',
+    sa.Column('card_id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.ForeignKeyConstraint(['card_id'], ['cards.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('card_id', 'user_id')
+    )
+    op.create_index('idx_card_assignees_user', 'card_assignees', ['user_id', 'card_id'], unique=False)
+    op.add_column('archived_cards', sa.Column('label_ids', postgresql.JSONB(astext_type=sa.Text()), server_default='[]', nullable=False))
+    op.add_column('archived_cards', sa.Column('assignee_ids', postgresql.JSONB(astext_type=sa.Text()), server_default='[]', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('archived_cards', 'assignee_ids')
+    op.drop_column('archived_cards', 'label_ids')
+    op.drop_index('idx_card_assignees_user', table_name='card_assignees')
+    op.drop_table('card_assignees')
+    op.drop_index('idx_card_labels_label', table_name='card_labels')
+    op.drop_table('card_labels')
+    op.drop_table('labels')
@@ -0,0 +1,38 @@
+"""column position gaps
+
+Revision ID: ec81a73842f2
+Revises: 167aa4d1dbcb
+Create Date: 2026-10-19 14:02:11.508317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ec81a73842f2'
+down_revision: Union[str, None] = '167aa4d1dbcb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match app.columns.service.COLUMN_POSITION_GAP
+GAP = 1024
+
+
+def upgrade() -> None:
+    # Existing rooms have columns at 0,1,2 — spread them out so reorders can use the gaps
+    op.execute(sa.text(
+        "UPDATE columns SET position = ranked.rn * :gap "
+        "FROM (SELECT id, ROW_NUMBER() OVER (PARTITION BY room_id ORDER BY position) - 1 AS rn FROM columns) AS ranked "
+        "WHERE columns.id = ranked.id"
+    ).bindparams(gap=GAP))
+
+
+def downgrade() -> None:
+    op.execute(sa.text(
+        "UPDATE columns SET position = ranked.rn "
+        "FROM (SELECT id, ROW_NUMBER() OVER (PARTITION BY room_id ORDER BY position) - 1 AS rn FROM columns) AS ranked "
+        "WHERE columns.id = ranked.id"
+    ))
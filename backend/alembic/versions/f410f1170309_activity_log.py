@@ -0,0 +1,54 @@
+"""activity log
+
+Revision ID: f410f1170309
+Revises: c555ea7fcaeb
+Create Date: 2026-10-19 11:02:17.560391
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f410f1170309'
+down_revision: Union[str, None] = 'c555ea7fcaeb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _month(offset: int) -> date:
+    today = date.today()
+    total = today.year * 12 + (today.month - 1) + offset
+    return date(total // 12, total % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    op.create_table('activity_log',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('room_id', sa.Uuid(), nullable=False),
+    sa.Column('card_id', sa.Uuid(), nullable=True),
+    sa.Column('user_id', sa.Uuid(), nullable=True),
+    sa.Column('action', sa.String(length=32), nullable=False),
+    sa.Column('details', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.create_index('idx_activity_room_created', 'activity_log', ['room_id', 'created_at'], unique=False)
+    # Monthly partitions for this month and the next two; the writer keeps creating them from here on
+    for i in range(3):
+        start, end = _month(i), _month(i + 1)
+        op.execute(
+            f"CREATE TABLE activity_log_y{start.year}m{start.month:02d} "
+            f"PARTITION OF activity_log FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+
+
+def downgrade() -> None:
+    # Dropping the parent drops every partition with it
+    op.drop_index('idx_activity_room_created', table_name='activity_log')
+    op.drop_table('activity_log')
@@ -0,0 +1,59 @@
+import base64
+import uuid
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.auth.dependencies import get_current_reader, get_read_db
+from app.cards.router import verify_membership
+from app.models import User, Activity
+from app.schemas import ActivityResponse, ActivityPage
+
+router = APIRouter(prefix="/api/rooms/{room_id}/activity", tags=["activity"])
+
+
+def encode_cursor(entry: Activity) -> str:
+    # base64 so timezone offsets like "+00:00" survive being pasted into a query string
+    raw = f"{entry.created_at.isoformat()}|{entry.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        created_at, entry_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(entry_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+@router.get("", response_model=ActivityPage)
+def list_activity(
+    room_id: uuid.UUID,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader),
+):
+    """
+    Newest-first card history for a room.
+    Keyset-paginated on (created_at, id) so deep pages cost the same as the first one,
+    and the (room_id, created_at) index lets Postgres prune to the relevant partitions.
+    Events are written in the background, so the last second or so may not show yet.
+    """
+    verify_membership(db, room_id, current_user.id)
+
+    query = db.query(Activity).filter(Activity.room_id == room_id)
+    if cursor:
+        created_at, entry_id = decode_cursor(cursor)
+        query = query.filter(
+            (Activity.created_at < created_at)
+            | ((Activity.created_at == created_at) & (Activity.id < entry_id))
+        )
+    entries = query.order_by(Activity.created_at.desc(), Activity.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        next_cursor = encode_cursor(entries[-1])
+    return ActivityPage(items=entries, next_cursor=next_cursor)
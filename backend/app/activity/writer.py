@@ -0,0 +1,196 @@
+import asyncio
+import re
+import time
+import uuid
+from collections import deque
+from datetime import date
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Activity, utcnow
+
+PARTITION_NAME = re.compile(r"^activity_log_y(\d{4})m(\d{2})$")
+# How often the writer creates upcoming partitions and drops expired ones
+MAINTENANCE_INTERVAL_SECONDS = 3600
+
+
+def _to_uuid(value) -> uuid.UUID | None:
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    return uuid.UUID(str(value))
+
+
+def _add_months(d: date, months: int) -> date:
+    total = d.year * 12 + (d.month - 1) + months
+    return date(total // 12, total % 12 + 1, 1)
+
+
+def ensure_partitions(db: Session, months_ahead: int = 2):
+    """Create monthly partitions from the current month through `months_ahead` months out."""
+    if db.bind.dialect.name != "postgresql":
+        return
+    this_month = utcnow().date().replace(day=1)
+    for i in range(months_ahead + 1):
+        start = _add_months(this_month, i)
+        end = _add_months(start, 1)
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS activity_log_y{start.year}m{start.month:02d} "
+            f"PARTITION OF activity_log FOR VALUES FROM ('{start}') TO ('{end}')"
+        ))
+    db.commit()
+
+
+def drop_expired_partitions(db: Session, retention_months: int) -> list[str]:
+    """Drop whole monthly partitions older than the retention window — no row-by-row DELETE."""
+    if db.bind.dialect.name != "postgresql":
+        return []
+    cutoff = _add_months(utcnow().date().replace(day=1), -retention_months)
+    children = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = 'activity_log'"
+    )).scalars().all()
+    dropped = []
+    for name in children:
+        match = PARTITION_NAME.match(name)
+        if match and date(int(match[1]), int(match[2]), 1) < cutoff:
+            db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+            dropped.append(name)
+    db.commit()
+    return dropped
+
+
+class ActivityWriter:
+    """
+    Write-behind buffer for the activity log.
+    Handlers call `record()`, which only appends to an in-memory deque (safe from both the
+    event loop and FastAPI's sync-route threadpool). A background task drains the deque
+    every `flush_interval` seconds and writes each batch with one multi-row INSERT in its
+    own transaction, so card mutations never pay for an extra commit.
+    If the queue is full (DB down for a long time), new events are dropped and counted
+    rather than growing memory without bound. A batch that keeps failing (say, one row's
+    details can't be serialised) is retried `max_retries` times, then written row by row so
+    only the rows that still fail are dropped — and counted — instead of blocking the queue.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float, max_queue: int, retention_months: int,
+                 max_retries: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.retention_months = retention_months
+        self.max_retries = max_retries
+        self.queue: deque[dict] = deque()
+        self.written = 0
+        self.dropped = 0
+        # Rows given up on after repeated insert failures, and how often the head batch has failed so far
+        self.failed = 0
+        self._head_failures = 0
+        self._last_maintenance = 0.0
+        self._task: asyncio.Task | None = None
+
+    def record(self, room_id, action: str, user_id=None, card_id=None, **details):
+        if len(self.queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        self.queue.append({
+            "id": uuid.uuid4(),
+            "created_at": utcnow(),
+            "room_id": _to_uuid(room_id),
+            "card_id": _to_uuid(card_id),
+            "user_id": _to_uuid(user_id),
+            "action": action,
+            "details": details,
+        })
+
+    def _take_batch(self) -> list[dict]:
+        batch = []
+        while self.queue and len(batch) < self.batch_size:
+            batch.append(self.queue.popleft())
+        return batch
+
+    def flush(self) -> int:
+        """Drain everything currently queued. Blocking — run it off the event loop."""
+        total = 0
+        with SessionLocal(info={"op_class": "bulk"}) as db:
+            if time.monotonic() - self._last_maintenance > MAINTENANCE_INTERVAL_SECONDS:
+                ensure_partitions(db)
+                drop_expired_partitions(db, self.retention_months)
+                self._last_maintenance = time.monotonic()
+
+            while batch := self._take_batch():
+                try:
+                    db.execute(insert(Activity), batch)
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    self._head_failures += 1
+                    if self._head_failures < self.max_retries:
+                        # Put the batch back in order so nothing is lost; retry next interval
+                        self.queue.extendleft(reversed(batch))
+                        self.written += total
+                        raise
+                    total += self._write_rows(db, batch)
+                else:
+                    total += len(batch)
+                self._head_failures = 0
+        self.written += total
+        return total
+
+    def _write_rows(self, db: Session, batch: list[dict]) -> int:
+        """Last attempt for a batch that keeps failing: one row per transaction, dropping the ones that fail."""
+        written = 0
+        for row in batch:
+            try:
+                db.execute(insert(Activity), [row])
+                db.commit()
+                written += 1
+            except Exception:
+                db.rollback()
+                self.failed += 1
+        return written
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if not self.queue:
+                continue
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception:
+                pass  # DB hiccup — events stay queued for the next attempt
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Last chance to persist whatever is still buffered
+        if self.queue:
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception:
+                pass
+
+    def stats(self) -> dict:
+        return {"queued": len(self.queue), "written": self.written, "dropped": self.dropped, "failed": self.failed}
+
+
+# Shared instance, same pattern as the WebSocket `manager`
+activity = ActivityWriter(
+    batch_size=settings.activity_batch_size,
+    flush_interval=settings.activity_flush_interval_seconds,
+    max_queue=settings.activity_max_queue,
+    retention_months=settings.activity_retention_months,
+    max_retries=settings.activity_max_retries,
+)
@@ -0,0 +1,103 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.auth.dependencies import get_admin_user
+from app.models import User
+from app.ws.manager import manager
+from app.ws.heartbeat import heartbeats
+from app.ws.admission import admission
+from app.ws.dashboard import dashboard
+from app.ws.drain import drainer
+from app.ws.hibernate import room_hibernator
+from app.memory import allocations, connection_memory
+from app.timeouts import shed
+from app.activity.writer import activity
+from app.query_stats import query_stats
+from app.tracing import tracer
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+@router.get("/ws/rtt")
+def ws_rtt(admin: User = Depends(get_admin_user)):
+    """
+    Per-room heartbeat round-trip distributions, for capacity planning.
+    Buckets are cumulative-free counts (each sample lands in exactly one bucket).
+    """
+    return {
+        "connections": sum(len(conns) for conns in manager.rooms.values()),
+        "tracked": len(heartbeats.wheel),
+        "rooms": heartbeats.rtt_snapshot(),
+    }
+
+
+@router.get("/ws/admission")
+def ws_admission(admin: User = Depends(get_admin_user)):
+    """Current state of the WebSocket handshake admission queue."""
+    return admission.stats()
+
+
+@router.get("/ws/dashboard")
+def ws_dashboard(admin: User = Depends(get_admin_user)):
+    """Open dashboard channels, rooms they watch, and summary messages pushed so far."""
+    return dashboard.stats()
+
+
+@router.get("/ws/drain")
+def ws_drain(admin: User = Depends(get_admin_user)):
+    """Graceful-drain state: whether this worker is draining, sockets closed and turned away."""
+    return drainer.stats()
+
+
+@router.get("/memory")
+def memory(limit: int = Query(20, ge=1, le=500), admin: User = Depends(get_admin_user)):
+    """
+    Estimated memory held by the connection layer, per room (largest first) and per connection,
+    plus idle-room hibernation counters. Sizes are deep sizes of the manager's own structures.
+    """
+    return {
+        **connection_memory(limit),
+        "hibernation": {
+            "idle_seconds": room_hibernator.idle_seconds,
+            "rooms_hibernated": room_hibernator.hibernated,
+        },
+    }
+
+
+@router.get("/memory/allocations")
+async def memory_allocations(
+    seconds: float = Query(5.0, gt=0),
+    limit: int = Query(25, ge=1, le=200),
+    group_by: Literal["lineno", "filename", "traceback"] = "lineno",
+    admin: User = Depends(get_admin_user),
+):
+    """
+    Top allocators over a sampling window: tracemalloc runs only for `seconds`
+    (capped at MEMORY_TRACE_MAX_SECONDS), then the live allocations made in that window are grouped.
+    """
+    if allocations.busy:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A memory sample is already running")
+    return await allocations.sample(seconds, limit, group_by)
+
+
+@router.get("/shed")
+def shed_counts(admin: User = Depends(get_admin_user)):
+    """Requests / WS messages shed by statement, lock or pool timeouts, per endpoint, plus the limits in force."""
+    return shed.stats()
+
+
+@router.get("/activity")
+def activity_writer_stats(admin: User = Depends(get_admin_user)):
+    """Activity log write-behind queue: backlog, rows written, events dropped on overflow."""
+    return activity.stats()
+
+
+@router.get("/queries")
+def query_counts(admin: User = Depends(get_admin_user)):
+    """Statement counts and DB time per endpoint / WebSocket message type since startup."""
+    return {"debug": query_stats.debug, "endpoints": query_stats.snapshot(), "suspected_n_plus_one": len(query_stats.suspects)}
+
+
+@router.get("/slow-ops")
+def slow_ops(admin: User = Depends(get_admin_user)):
+    """The most recent operations over SLOW_OP_THRESHOLD_MS, newest first, each with its full span tree."""
+    return {"threshold_ms": tracer.slow_ms, "ops": list(reversed(tracer.recent_slow))}
@@ -0,0 +1,141 @@
+import base64
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.auth.dependencies import get_current_user, get_current_reader, get_read_db
+from app.cards.router import verify_membership
+from app.timeouts import use_timeouts
+from app.models import User, Column, ArchivedCard, utcnow
+from app.schemas import (
+    ArchiveCardsRequest,
+    ArchiveResult,
+    RestoreCardsRequest,
+    RestoreResult,
+    ArchivedCardPage,
+    ArchivePolicyRequest,
+    BoardCardResponse,
+)
+from app.archive.service import archive_cards, restore_cards, list_archived
+from app.activity.writer import activity
+from app.ws.manager import manager
+
+router = APIRouter(prefix="/api/rooms/{room_id}/archive", tags=["archive"])
+
+
+def encode_cursor(card: ArchivedCard) -> str:
+    raw = f"{card.archived_at.isoformat()}|{card.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        archived_at, card_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(archived_at), uuid.UUID(card_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+# ---------- List Archived Cards ----------
+
+@router.get("", response_model=ArchivedCardPage)
+def get_archived_cards(
+    room_id: uuid.UUID,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader),
+):
+    verify_membership(db, room_id, current_user.id)
+
+    cards = list_archived(db, room_id, limit, decode_cursor(cursor) if cursor else None)
+    next_cursor = None
+    if len(cards) > limit:
+        cards = cards[:limit]
+        next_cursor = encode_cursor(cards[-1])
+    return ArchivedCardPage(items=cards, next_cursor=next_cursor)
+
+
+# ---------- Archive Cards ----------
+
+@router.post("", response_model=ArchiveResult)
+def archive(
+    room_id: uuid.UUID,
+    body: ArchiveCardsRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Archive specific cards, or every card in a column (optionally only those untouched for N days)."""
+    verify_membership(db, room_id, current_user.id)
+    use_timeouts(db, "bulk")
+    if body.card_ids is None and body.column_id is None:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Provide card_ids or column_id")
+
+    untouched_since = utcnow() - timedelta(days=body.older_than_days) if body.older_than_days else None
+    rows = archive_cards(
+        db, room_id, current_user.id,
+        card_ids=body.card_ids, column_id=body.column_id, untouched_since=untouched_since,
+    )
+    db.commit()
+
+    card_ids = [row["id"] for row in rows]
+    if card_ids:
+        activity.record(room_id, "cards_archived", user_id=current_user.id, card_ids=[str(c) for c in card_ids])
+        background_tasks.add_task(manager.broadcast, str(room_id), {
+            "type": "cards_archived",
+            "card_ids": [str(c) for c in card_ids],
+            "by": str(current_user.id)
+        })
+    return ArchiveResult(archived=len(card_ids), card_ids=card_ids)
+
+
+# ---------- Restore Cards ----------
+
+@router.post("/restore", response_model=RestoreResult)
+def restore(
+    room_id: uuid.UUID,
+    body: RestoreCardsRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Put archived cards back at the bottom of `column_id`, or of their original column."""
+    verify_membership(db, room_id, current_user.id)
+    use_timeouts(db, "bulk")
+
+    rows = restore_cards(db, room_id, body.card_ids, body.column_id)
+    db.commit()
+
+    cards = [BoardCardResponse.model_validate(row) for row in rows]
+    if cards:
+        activity.record(room_id, "cards_restored", user_id=current_user.id, card_ids=[str(c.id) for c in cards])
+        background_tasks.add_task(manager.broadcast, str(room_id), {
+            "type": "cards_restored",
+            "cards": [c.model_dump(mode="json") for c in cards],
+            "by": str(current_user.id)
+        })
+    return RestoreResult(restored=cards)
+
+
+# ---------- Auto-Archive Policy ----------
+
+@router.put("/policies/{column_id}", status_code=status.HTTP_204_NO_CONTENT)
+def set_archive_policy(
+    room_id: uuid.UUID,
+    column_id: uuid.UUID,
+    body: ArchivePolicyRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Auto-archive cards in this column after N days without changes. null turns it off."""
+    verify_membership(db, room_id, current_user.id)
+
+    column = db.query(Column).filter(Column.id == column_id, Column.room_id == room_id).first()
+    if not column:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Column not found in this room")
+    column.auto_archive_days = body.auto_archive_days
+    db.commit()
@@ -0,0 +1,211 @@
+import asyncio
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from sqlalchemy import exists, select, delete, insert, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Card, Column, Room, ArchivedCard, utcnow
+from app.cards.service import renumber_columns
+from app.labels.service import card_tags, relink_tags
+from app.activity.writer import activity
+from app.ws.manager import manager
+
+# Card columns copied verbatim between the hot and cold tables
+CARD_FIELDS = ("id", "column_id", "title", "description", "position", "created_by", "created_at", "updated_at")
+
+
+def archive_cards(
+    db: Session,
+    room_id: uuid.UUID,
+    user_id: uuid.UUID | None,
+    card_ids: list[uuid.UUID] | None = None,
+    column_id: uuid.UUID | None = None,
+    untouched_since: datetime | None = None,
+    limit: int | None = None,
+) -> list[dict]:
+    """
+    Move matching cards of a room from `cards` to `archived_cards` in bulk:
+    one DELETE ... RETURNING pulls them out of the hot table, one multi-row INSERT
+    writes them to the cold one, then counts and positions of the affected columns
+    are fixed up set-based. All in the caller's transaction, so it's all-or-nothing.
+    Returns the archived rows (as dicts).
+    """
+    room_columns = select(Column.id).where(Column.room_id == room_id)
+    if column_id is not None:
+        room_columns = room_columns.where(Column.id == column_id)
+    targets = select(Card.id).where(Card.column_id.in_(room_columns))
+    if card_ids is not None:
+        targets = targets.where(Card.id.in_(card_ids))
+    if untouched_since is not None:
+        targets = targets.where(Card.updated_at < untouched_since)
+    if limit is not None:
+        targets = targets.order_by(Card.updated_at).limit(limit)
+
+    # Snapshot labels/assignees first — their link rows cascade away with the cards
+    tags = card_tags(db, targets)
+    moved = db.execute(
+        delete(Card)
+        .where(Card.id.in_(targets))
+        .returning(*(getattr(Card, f) for f in CARD_FIELDS)),
+        execution_options={"synchronize_session": False},
+    ).mappings().all()
+    if not moved:
+        return []
+
+    now = utcnow()
+    rows = [{**row, "room_id": room_id, "archived_at": now, "archived_by": user_id} for row in moved]
+    for row in rows:
+        row_tags = tags.get(row["id"], {})
+        row["label_ids"] = [str(i) for i in row_tags.get("label_ids", [])]
+        row["assignee_ids"] = [str(i) for i in row_tags.get("assignee_ids", [])]
+    db.execute(insert(ArchivedCard), rows)
+
+    per_column = Counter(row["column_id"] for row in moved)
+    for col_id, n in per_column.items():
+        db.execute(update(Column).where(Column.id == col_id).values(card_count=Column.card_count - n))
+    renumber_columns(db, per_column.keys())
+    return rows
+
+
+def restore_cards(
+    db: Session,
+    room_id: uuid.UUID,
+    card_ids: list[uuid.UUID],
+    column_id: uuid.UUID | None = None,
+) -> list[dict]:
+    """
+    Move archived cards back onto the board, appended to the bottom of `column_id`
+    (or of the column each card came from, if that column still exists).
+    Cards whose original column is gone and no column_id was given stay archived, and so do
+    cards whose id is already taken on the board.
+    """
+    room_column_ids = set(db.execute(select(Column.id).where(Column.room_id == room_id)).scalars())
+    if column_id is not None and column_id not in room_column_ids:
+        return []
+
+    candidates = db.execute(
+        select(ArchivedCard.id, ArchivedCard.column_id)
+        .where(
+            ArchivedCard.room_id == room_id,
+            ArchivedCard.id.in_(card_ids),
+            ~exists().where(Card.id == ArchivedCard.id),
+        )
+    ).all()
+    restorable = [
+        card_id for card_id, origin in candidates
+        if column_id is not None or origin in room_column_ids
+    ]
+    if not restorable:
+        return []
+
+    archived = db.execute(
+        delete(ArchivedCard)
+        .where(ArchivedCard.id.in_(restorable))
+        .returning(*(getattr(ArchivedCard, f) for f in CARD_FIELDS), ArchivedCard.label_ids, ArchivedCard.assignee_ids),
+        execution_options={"synchronize_session": False},
+    ).mappings().all()
+
+    rows = [dict(row) for row in archived]
+    for row in rows:
+        row["column_id"] = column_id or row["column_id"]
+
+    # Reserve a block of slots at the bottom of each target column with one UPDATE ... RETURNING
+    per_column = Counter(row["column_id"] for row in rows)
+    next_slot = {}
+    for col_id, n in per_column.items():
+        new_count = db.execute(
+            update(Column)
+            .where(Column.id == col_id)
+            .values(card_count=Column.card_count + n)
+            .returning(Column.card_count)
+        ).scalar_one()
+        next_slot[col_id] = new_count - n
+    for row in sorted(rows, key=lambda r: r["position"]):
+        row["position"] = next_slot[row["column_id"]]
+        next_slot[row["column_id"]] += 1
+
+    db.execute(insert(Card), [{f: row[f] for f in CARD_FIELDS} for row in rows])
+    relink_tags(db, room_id, rows)
+    return rows
+
+
+def list_archived(db: Session, room_id: uuid.UUID, limit: int, before: tuple[datetime, uuid.UUID] | None):
+    """Newest-archived first, keyset-paginated on (archived_at, id) via idx_archived_cards_room."""
+    query = db.query(ArchivedCard).filter(ArchivedCard.room_id == room_id)
+    if before is not None:
+        archived_at, card_id = before
+        query = query.filter(
+            (ArchivedCard.archived_at < archived_at)
+            | ((ArchivedCard.archived_at == archived_at) & (ArchivedCard.id < card_id))
+        )
+    return query.order_by(ArchivedCard.archived_at.desc(), ArchivedCard.id.desc()).limit(limit + 1).all()
+
+
+def run_auto_archive(batch_size: int) -> dict[str, list[str]]:
+    """
+    One pass of the archive policy: for every column with auto_archive_days set, archive
+    up to `batch_size` cards that haven't been touched in that many days. Columns of
+    soft-deleted rooms are skipped — nobody will see them again until the purge.
+    Each column is its own transaction so one busy board can't hold up the rest.
+    Returns room_id → archived card ids, for the caller to broadcast.
+    """
+    archived: dict[str, list[str]] = {}
+    with SessionLocal(info={"op_class": "bulk"}) as db:
+        policies = db.execute(
+            select(Column.id, Column.room_id, Column.auto_archive_days)
+            .join(Room, Room.id == Column.room_id)
+            .where(Column.auto_archive_days.is_not(None), Room.deleted_at.is_(None))
+        ).all()
+        for col_id, room_id, days in policies:
+            cutoff = utcnow() - timedelta(days=days)
+            rows = archive_cards(db, room_id, None, column_id=col_id, untouched_since=cutoff, limit=batch_size)
+            db.commit()
+            if rows:
+                archived.setdefault(str(room_id), []).extend(str(row["id"]) for row in rows)
+    return archived
+
+
+class ArchivePolicyJob:
+    """Periodic runner for run_auto_archive, started from the app lifespan."""
+
+    def __init__(self, interval: float, batch_size: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.last_run_archived = 0
+        self._task: asyncio.Task | None = None
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                archived = await asyncio.to_thread(run_auto_archive, self.batch_size)
+            except Exception:
+                continue  # Try again next interval
+            self.last_run_archived = sum(len(card_ids) for card_ids in archived.values())
+            for room_id, card_ids in archived.items():
+                activity.record(room_id, "cards_archived", card_ids=card_ids)
+                # Same event as a manual archive, so open boards drop the cards without a reload
+                if room_id in manager.rooms:
+                    await manager.broadcast(room_id, {"type": "cards_archived", "card_ids": card_ids, "by": None})
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+archive_policy = ArchivePolicyJob(
+    interval=settings.archive_policy_interval_seconds,
+    batch_size=settings.archive_batch_size,
+)
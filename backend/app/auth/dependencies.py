@@ -1,9 +1,11 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.config import settings
+from app.database import SessionLocal, ReadSessionLocal, engine, get_db, read_your_writes
 from app.auth.utils import verify_access_token
 from app.models import User
+from app.tracing import tracer
 
 # Extracts the token from the "Authorization: Bearer <token>" header
 bearer_scheme = HTTPBearer()
@@ -24,7 +26,8 @@ def get_current_user(
     is automatically protected — unauthenticated requests get rejected.
     """
     token = credentials.credentials
-    user_id = verify_access_token(token)
+    with tracer.span("auth.jwt"):
+        user_id = verify_access_token(token)
 
     if user_id is None:
         raise HTTPException(
@@ -32,7 +35,54 @@ def get_current_user(
             detail="Invalid or expired token",
         )
 
+    with tracer.span("auth.user"):
+        user = db.query(User).filter(User.id == user_id).first()
+
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
+
+    # Lets the session's after_commit hook pin this user's reads to the primary after a write
+    db.info["user_id"] = str(user.id)
+    return user
+
+
+def get_read_db(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)):
+    """
+    Session for read-only endpoints. Goes to the replica, unless the caller wrote
+    something recently (read-your-writes) — then it stays on the primary so they
+    see their own changes.
+    """
+    user_id = verify_access_token(credentials.credentials)
+    pinned = user_id is not None and read_your_writes.needs_primary(user_id)
+    db = SessionLocal(info={"op_class": "read"}) if pinned else ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_current_reader(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: Session = Depends(get_read_db),
+) -> User:
+    """
+    get_current_user for read-only endpoints — the user lookup runs on the read session.
+    A brand-new account may not have reached the replica yet, so a miss falls back to the primary.
+    """
+    user_id = verify_access_token(credentials.credentials)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+        )
+
     user = db.query(User).filter(User.id == user_id).first()
+    if user is None and db.get_bind() is not engine:
+        with SessionLocal() as primary:
+            user = primary.query(User).filter(User.id == user_id).first()
 
     if user is None:
         raise HTTPException(
@@ -40,4 +90,14 @@ def get_current_user(
             detail="User not found",
         )
 
-    return user
\ No newline at end of file
+    return user
+
+
+def get_admin_user(user: User = Depends(get_current_user)) -> User:
+    """Like get_current_user, but only lets through emails listed in settings.admin_emails."""
+    if user.email not in settings.admin_emails:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return user
@@ -4,7 +4,7 @@ from app.database import get_db
 from app.models import User
 from app.schemas import RegisterRequest, LoginRequest, TokenResponse, UserResponse
 from app.auth.utils import hash_password, verify_password, create_access_token
-from app.auth.dependencies import get_current_user
+from app.auth.dependencies import get_current_reader
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
@@ -62,10 +62,10 @@ def login(data: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(user: User = Depends(get_current_user)):
+def get_me(user: User = Depends(get_current_reader)):
     """
     Protected route — returns the current user's profile.
-    The get_current_user dependency does all the work:
+    The get_current_reader dependency does all the work (on the read replica):
     extracts token, verifies it, looks up the user.
     If we reach this function body, auth has already succeeded.
     """
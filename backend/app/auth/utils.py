@@ -1,21 +1,29 @@
 from datetime import datetime, timedelta, timezone
+from functools import cache
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from app.config import settings
 
-# bcrypt context — handles hashing and verification
-# "deprecated='auto'" means if we switch algorithms later, old hashes still verify
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@cache
+def pwd_context():
+    """
+    bcrypt context — handles hashing and verification.
+    "deprecated='auto'" means if we switch algorithms later, old hashes still verify.
+    Built on first use: passlib is only needed by register/login, so it stays off the boot path.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def hash_password(password: str) -> str:
     """Hash a plain-text password. Never store the original."""
-    return pwd_context.hash(password)
+    return pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Check a plain-text password against its hash. Used at login."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context().verify(plain_password, hashed_password)
 
 
 def create_access_token(user_id: str) -> str:
@@ -0,0 +1,77 @@
+import asyncio
+import uuid
+from datetime import timedelta
+from sqlalchemy import select, delete
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import RecentOp, utcnow
+from app.cards.service import insert_ignoring_conflicts
+
+
+def claim_op(db: Session, user_id, key: str, action: str, card_id) -> uuid.UUID | None:
+    """
+    Record that `user_id` is performing the operation named by `key`, inside the caller's
+    transaction. Returns None the first time a key is seen — go ahead and do the work.
+    If the key was used before, returns the card id it was used for so the caller can
+    replay the original result instead of repeating the mutation.
+    A concurrent retry of an in-flight operation blocks on the primary key until the
+    first transaction commits (then sees the key) or rolls back (then claims it).
+    """
+    user_id = uuid.UUID(str(user_id))
+    claimed = db.execute(
+        insert_ignoring_conflicts(db, RecentOp)
+        .values(user_id=user_id, key=key, action=action, card_id=card_id, created_at=utcnow())
+        .on_conflict_do_nothing(index_elements=["user_id", "key"])
+        .returning(RecentOp.key)
+    ).first()
+    if claimed is not None:
+        return None
+    return db.execute(
+        select(RecentOp.card_id).where(RecentOp.user_id == user_id, RecentOp.key == key)
+    ).scalar_one()
+
+
+def prune_recent_ops(ttl_seconds: float) -> int:
+    with SessionLocal(info={"op_class": "bulk"}) as db:
+        cutoff = utcnow() - timedelta(seconds=ttl_seconds)
+        deleted = db.execute(delete(RecentOp).where(RecentOp.created_at < cutoff)).rowcount
+        db.commit()
+    return deleted
+
+
+class RecentOpsPruner:
+    """Periodically drops expired idempotency keys, started from the app lifespan."""
+
+    def __init__(self, interval: float, ttl: float):
+        self.interval = interval
+        self.ttl = ttl
+        self._task: asyncio.Task | None = None
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(prune_recent_ops, self.ttl)
+            except Exception:
+                pass  # Try again next interval
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+recent_ops_pruner = RecentOpsPruner(
+    interval=settings.idempotency_prune_interval_seconds,
+    ttl=settings.idempotency_ttl_seconds,
+)
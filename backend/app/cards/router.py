@@ -1,23 +1,36 @@
 import uuid
 from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.auth.dependencies import get_current_user
-from app.models import User, RoomMember, Column, Card
-from app.schemas import CreateCardRequest, UpdateCardRequest, CardResponse
+from app.auth.dependencies import get_current_user, get_current_reader, get_read_db
+from app.models import User, Room, RoomMember, Column, Card
+from app.schemas import (
+    CreateCardRequest, UpdateCardRequest, CardResponse, CardSearchHit, CardSearchResponse,
+    SetCardLabelsRequest, SetCardAssigneesRequest, CardTags,
+)
+from app.activity.writer import activity
+from app.cards.service import claim_position, adjust_card_count, insert_card, id_archived, open_slot, renumber_columns
+from app.cards.idempotency import claim_op
+from app.labels.service import get_room_card, set_card_labels, set_card_assignees, tags_of
+from app.ws.manager import manager
+from app.tracing import tracer
+from app.serialization import FastJSONResponse, json_response, card_serializer
 
 router = APIRouter(prefix="/api/rooms/{room_id}/cards", tags=["cards"])
 
 
 def verify_membership(db: Session, room_id: uuid.UUID, user_id: uuid.UUID):
-    """Reusable check — ensures the user belongs to the room."""
-    member = (
-        db.query(RoomMember)
-        .filter(RoomMember.room_id == room_id, RoomMember.user_id == user_id)
-        .first()
-    )
+    """Reusable check — ensures the user belongs to the room (and the room hasn't been deleted)."""
+    with tracer.span("auth.membership"):
+        member = (
+            db.query(RoomMember)
+            .join(Room, Room.id == RoomMember.room_id)
+            .filter(RoomMember.room_id == room_id, RoomMember.user_id == user_id, Room.deleted_at.is_(None))
+            .first()
+        )
     if not member:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this room")
 
@@ -25,47 +38,99 @@ def verify_membership(db: Session, room_id: uuid.UUID, user_id: uuid.UUID):
 def reindex_column(db: Session, column_id: uuid.UUID):
     """Re-assign positions 0, 1, 2, ... to all cards in a column.
     This is the simple approach from the spec — after any move/delete,
-    we just renumber everything sequentially. No gaps, no fractional positions."""
-    cards = (
-        db.query(Card)
-        .filter(Card.column_id == column_id)
-        .order_by(Card.position)
-        .all()
-    )
-    for i, card in enumerate(cards):
-        card.position = i
+    we just renumber everything sequentially. No gaps, no fractional positions.
+    One set-based UPDATE that leaves updated_at alone: a shift isn't an edit, and the
+    archive policy reads updated_at as "last edited"."""
+    with tracer.span("reindex_column", column_id=str(column_id)):
+        renumber_columns(db, [column_id])
 
 
 # ---------- Create Card ----------
 
+def replay_card(db: Session, room_id: uuid.UUID, card_id: uuid.UUID, user_id: uuid.UUID) -> FastJSONResponse:
+    """Answer a retried request with the card the first attempt produced (200 instead of 201)."""
+    card = (
+        db.query(Card)
+        .join(Column, Card.column_id == Column.id)
+        .filter(Card.id == card_id, Column.room_id == room_id, Card.created_by == user_id)
+        .first()
+    )
+    if not card:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Card id or idempotency key already used")
+    return json_response(card_serializer.from_object(card), status_code=status.HTTP_200_OK)
+
+
 @router.post("", response_model=CardResponse, status_code=status.HTTP_201_CREATED)
 def create_card(
     room_id: uuid.UUID,
     body: CreateCardRequest,
+    background_tasks: BackgroundTasks,
+    idempotency_key: Optional[str] = Header(default=None, max_length=64),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     verify_membership(db, room_id, current_user.id)
 
-    # Verify the target column belongs to this room
-    column = db.query(Column).filter(Column.id == body.column_id, Column.room_id == room_id).first()
-    if not column:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Column not found in this room")
+    card_id = body.id or uuid.uuid4()
+    if body.id is not None and id_archived(db, body.id):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Card id belongs to an archived card")
+    if idempotency_key:
+        prior = claim_op(db, current_user.id, idempotency_key, "card_create", card_id)
+        if prior is not None:
+            db.rollback()
+            return replay_card(db, room_id, prior, current_user.id)
 
-    # New cards go at the bottom — position = count of existing cards
-    card_count = db.query(Card).filter(Card.column_id == body.column_id).count()
+    # New cards go at the bottom. Claiming the slot also verifies the column belongs to this room.
+    position = claim_position(db, body.column_id, room_id)
+    if position is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Column not found in this room")
 
-    card = Card(
+    card = insert_card(
+        db,
+        id=card_id,
         column_id=body.column_id,
         title=body.title,
         description=body.description,
-        position=card_count,
+        position=position,
         created_by=current_user.id,
     )
-    db.add(card)
+    if card is None:
+        # A card with this client id already exists — a retry that didn't send a key, or a clash
+        db.rollback()
+        return replay_card(db, room_id, card_id, current_user.id)
+
+    # Serialise from the RETURNING row before commit expires it, so there's no refresh SELECT
+    created = card_serializer.from_object(card)
     db.commit()
-    db.refresh(card)
-    return card
+    activity.record(room_id, "card_created", user_id=current_user.id, card_id=created["id"],
+                    column_id=str(created["column_id"]), title=created["title"])
+    background_tasks.add_task(manager.notify, str(room_id), {"type": "card_created", "card_id": str(created["id"])})
+    return json_response(created, status_code=status.HTTP_201_CREATED)
+
+
+# ---------- Search Cards ----------
+
+@router.get("/search", response_model=CardSearchResponse)
+def search_cards(
+    room_id: uuid.UUID,
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader),
+):
+    """Ranked full-text search over the room's cards, with trigram fallback for typos."""
+    verify_membership(db, room_id, current_user.id)
+
+    # Imported here: search is rarely hit and isn't needed to start serving
+    from app.cards.search import search_cards as run_card_search
+
+    rows, next_cursor = run_card_search(db, room_id, q, limit, cursor)
+    items = [
+        CardSearchHit(rank=rank, **CardResponse.model_validate(card).model_dump())
+        for card, rank in rows
+    ]
+    return CardSearchResponse(items=items, next_cursor=next_cursor)
 
 
 # ---------- Update Card (including moves) ----------
@@ -75,6 +140,8 @@ def update_card(
     room_id: uuid.UUID,
     card_id: uuid.UUID,
     body: UpdateCardRequest,
+    background_tasks: BackgroundTasks,
+    idempotency_key: Optional[str] = Header(default=None, max_length=64),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -89,6 +156,11 @@ def update_card(
     if not column:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Card does not belong to this room")
 
+    # A retried move must not shift the card a second time — reply with where it is now
+    if idempotency_key and claim_op(db, current_user.id, idempotency_key, "card_update", card.id) is not None:
+        db.rollback()
+        return json_response(card_serializer.from_object(card))
+
     # Track whether we need to reindex columns
     source_column_id = card.column_id
     moving = body.column_id is not None and body.column_id != card.column_id
@@ -101,35 +173,40 @@ def update_card(
 
     # Handle column move and/or position change
     if moving:
-        # Verify target column belongs to this room
-        target_col = db.query(Column).filter(Column.id == body.column_id, Column.room_id == room_id).first()
-        if not target_col:
+        # Claim a slot in the target column (verifies it belongs to this room) and release the old one
+        end_position = claim_position(db, body.column_id, room_id)
+        if end_position is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Target column not found in this room")
+        adjust_card_count(db, source_column_id, -1)
 
         card.column_id = body.column_id
-
-        # Set position: use requested position, or default to end of target column
-        if body.position is not None:
-            card.position = body.position
-        else:
-            card_count = db.query(Card).filter(Card.column_id == body.column_id, Card.id != card.id).count()
-            card.position = card_count
-
         db.flush()
-        # Reindex both source (card left) and target (card arrived) columns
+        # Close the gap the card left in the source column
         reindex_column(db, source_column_id)
-        reindex_column(db, body.column_id)
+
+        # Set position: use requested position (clamped to the column), or default to end of target column
+        position = end_position if body.position is None else max(0, min(body.position, end_position))
+        open_slot(db, body.column_id, card.id, position)
+        card.position = position
 
     elif body.position is not None:
         # Reordering within the same column
-        card.position = body.position
-        db.flush()
-        reindex_column(db, card.column_id)
+        position = max(0, min(body.position, column.card_count - 1))
+        open_slot(db, card.column_id, card.id, position)
+        card.position = position
 
     card.updated_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(card)
-    return card
+    if moving or body.position is not None:
+        activity.record(room_id, "card_moved", user_id=current_user.id, card_id=card.id,
+                        from_column_id=str(source_column_id), to_column_id=str(card.column_id),
+                        to_position=card.position)
+    else:
+        activity.record(room_id, "card_updated", user_id=current_user.id, card_id=card.id,
+                        fields=sorted(body.model_dump(exclude_none=True)))
+    background_tasks.add_task(manager.notify, str(room_id), {"type": "card_updated", "card_id": str(card_id)})
+    return json_response(card_serializer.from_object(card))
 
 
 # ---------- Delete Card ----------
@@ -138,6 +215,7 @@ def update_card(
 def delete_card(
     room_id: uuid.UUID,
     card_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -153,8 +231,76 @@ def delete_card(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Card does not belong to this room")
 
     column_id = card.column_id
+    title = card.title
     db.delete(card)
+    adjust_card_count(db, column_id, -1)
     db.flush()
     # Reindex to close the gap left by the deleted card
     reindex_column(db, column_id)
-    db.commit()
\ No newline at end of file
+    db.commit()
+    activity.record(room_id, "card_deleted", user_id=current_user.id, card_id=card_id,
+                    column_id=str(column_id), title=title)
+    background_tasks.add_task(manager.notify, str(room_id), {"type": "card_deleted", "card_id": str(card_id)})
+
+# ---------- Card Labels & Assignees ----------
+
+def broadcast_tags(background_tasks: BackgroundTasks, room_id: uuid.UUID, card: Card, user_id: uuid.UUID, tags: dict):
+    background_tasks.add_task(manager.broadcast_card, str(room_id), {
+        "type": "card_tags_updated",
+        "card_id": str(card.id),
+        "column_id": str(card.column_id),
+        **tags,
+        "by": str(user_id)
+    }, {str(card.column_id): 0})
+
+
+@router.put("/{card_id}/labels", response_model=CardTags)
+def set_labels(
+    room_id: uuid.UUID,
+    card_id: uuid.UUID,
+    body: SetCardLabelsRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Replace the card's labels ([] clears them). Every label must belong to this room."""
+    verify_membership(db, room_id, current_user.id)
+
+    card = get_room_card(db, room_id, card_id)
+    if not card:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found in this room")
+    if set_card_labels(db, room_id, card.id, body.label_ids) is None:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Unknown label for this room")
+    tags = tags_of(db, card.id)
+    db.commit()
+
+    activity.record(room_id, "card_labels_set", user_id=current_user.id, card_id=card.id,
+                    label_ids=tags["label_ids"])
+    broadcast_tags(background_tasks, room_id, card, current_user.id, tags)
+    return {"card_id": card.id, **tags}
+
+
+@router.put("/{card_id}/assignees", response_model=CardTags)
+def set_assignees(
+    room_id: uuid.UUID,
+    card_id: uuid.UUID,
+    body: SetCardAssigneesRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Replace the card's assignees ([] clears them). Only room members can be assigned."""
+    verify_membership(db, room_id, current_user.id)
+
+    card = get_room_card(db, room_id, card_id)
+    if not card:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found in this room")
+    if set_card_assignees(db, room_id, card.id, body.user_ids) is None:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Assignees must be room members")
+    tags = tags_of(db, card.id)
+    db.commit()
+
+    activity.record(room_id, "card_assignees_set", user_id=current_user.id, card_id=card.id,
+                    assignee_ids=tags["assignee_ids"])
+    broadcast_tags(background_tasks, room_id, card, current_user.id, tags)
+    return {"card_id": card.id, **tags}
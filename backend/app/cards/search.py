@@ -0,0 +1,104 @@
+import base64
+import json
+import re
+import uuid
+from sqlalchemy import select, func, or_, and_, case, literal
+from sqlalchemy.orm import Session
+
+from app.models import Card, Column
+
+# Below this many characters a trigram match is mostly noise
+TRIGRAM_MIN_LENGTH = 3
+
+
+def build_prefix_tsquery(q: str) -> str | None:
+    """
+    Turn free text into a safe tsquery string: every word must match, and the
+    words are prefix-matched so "deplo" finds "deployment" while the user is still typing.
+    Only word characters survive, so user input can't inject tsquery operators.
+    """
+    words = re.findall(r"\w+", q.lower())
+    if not words:
+        return None
+    return " & ".join(f"{w}:*" for w in words)
+
+
+def encode_cursor(mode: str, rank: float, card_id: uuid.UUID) -> str:
+    raw = json.dumps({"m": mode, "r": rank, "id": str(card_id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str, float, uuid.UUID] | None:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return data["m"], float(data["r"]), uuid.UUID(data["id"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _page(db: Session, stmt, rank, limit: int, after: tuple[float, uuid.UUID] | None):
+    """Keyset pagination on (rank DESC, id ASC) — stable and index-friendly, no OFFSET scans."""
+    if after is not None:
+        last_rank, last_id = after
+        stmt = stmt.where(or_(rank < last_rank, and_(rank == last_rank, Card.id > last_id)))
+    stmt = stmt.order_by(rank.desc(), Card.id).limit(limit + 1)
+    return db.execute(stmt).all()
+
+
+def _like_search(db: Session, room_cards, q: str, limit: int, after: tuple[float, uuid.UUID] | None):
+    """
+    SQLite stand-in for the Postgres path (benchmarks and tests run there): every word must
+    appear in the title or description; title hits rank above description-only hits.
+    """
+    words = re.findall(r"\w+", q.lower())
+    if not words:
+        return []
+    in_title = [func.lower(Card.title).contains(w, autoescape=True) for w in words]
+    in_text = [func.lower(Card.search_vector).contains(w, autoescape=True) for w in words]
+    rank = case((and_(*in_title), literal(1.0)), else_=literal(0.5))
+    stmt = room_cards.add_columns(rank).where(and_(*in_text))
+    return _page(db, stmt, rank, limit, after)
+
+
+def search_cards(db: Session, room_id: uuid.UUID, q: str, limit: int, cursor: str | None):
+    """
+    Ranked full-text search over a room's cards.
+    Uses the GIN-indexed search_vector first; if that finds nothing (typos, partial words
+    in the middle of a token), falls back to trigram similarity on titles.
+    Returns (rows of (Card, rank), next_cursor).
+    """
+    mode, after = "fts", None
+    if cursor:
+        decoded = decode_cursor(cursor)
+        if decoded:
+            mode, last_rank, last_id = decoded
+            after = (last_rank, last_id)
+
+    room_cards = select(Card).join(Column, Card.column_id == Column.id).where(Column.room_id == room_id)
+
+    rows = []
+    if db.get_bind().dialect.name == "sqlite":
+        mode = "like"
+        rows = _like_search(db, room_cards, q, limit, after)
+    elif mode == "fts":
+        tsquery = build_prefix_tsquery(q)
+        if tsquery:
+            query = func.to_tsquery("english", tsquery)
+            rank = func.ts_rank_cd(Card.search_vector, query)
+            stmt = room_cards.add_columns(rank).where(Card.search_vector.op("@@")(query))
+            rows = _page(db, stmt, rank, limit, after)
+        # Only fall back on the first page — a later FTS page coming back empty just means "done"
+        if not rows and after is None:
+            mode = "trgm"
+
+    if mode == "trgm" and len(q.strip()) >= TRIGRAM_MIN_LENGTH:
+        rank = func.similarity(Card.title, q)
+        stmt = room_cards.add_columns(rank).where(Card.title.op("%")(q))
+        rows = _page(db, stmt, rank, limit, after)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_card, last_rank = rows[-1]
+        next_cursor = encode_cursor(mode, last_rank, last_card.id)
+    return rows, next_cursor
@@ -0,0 +1,116 @@
+import uuid
+from sqlalchemy import case, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models import Card, Column, ArchivedCard
+
+
+def claim_position(db: Session, column_id, room_id=None) -> int | None:
+    """
+    Reserve the bottom slot of a column for a new (or incoming) card.
+    Bumps columns.card_count with a single UPDATE ... RETURNING inside the caller's
+    transaction — the UPDATE takes the column's row lock, so two concurrent creates can
+    no longer read the same count and end up with the same position, and there's no
+    COUNT(*) scan over the column's cards.
+    Passing room_id also proves the column belongs to that room.
+    Returns the position for the card, or None if the column doesn't exist (in that room).
+    """
+    stmt = update(Column).where(Column.id == _as_uuid(column_id))
+    if room_id is not None:
+        stmt = stmt.where(Column.room_id == _as_uuid(room_id))
+    stmt = stmt.values(card_count=Column.card_count + 1).returning(Column.card_count)
+    new_count = db.execute(stmt).scalar_one_or_none()
+    return None if new_count is None else new_count - 1
+
+
+def adjust_card_count(db: Session, column_id, delta: int):
+    """Keep columns.card_count in step when cards leave a column (delete, move out)."""
+    db.execute(
+        update(Column)
+        .where(Column.id == _as_uuid(column_id))
+        .values(card_count=Column.card_count + delta)
+    )
+
+
+def insert_ignoring_conflicts(db: Session, model):
+    """INSERT builder with .on_conflict_do_nothing() for the session's dialect (Postgres or SQLite)."""
+    dialect = sqlite if db.bind.dialect.name == "sqlite" else postgresql
+    return dialect.insert(model)
+
+
+def id_archived(db: Session, card_id) -> bool:
+    """A client-chosen id must not reuse an archived card's — its restore would then collide."""
+    return db.execute(select(ArchivedCard.id).where(ArchivedCard.id == _as_uuid(card_id))).first() is not None
+
+
+def insert_card(db: Session, **values) -> Card | None:
+    """
+    INSERT the card with ON CONFLICT (id) DO NOTHING ... RETURNING, so the caller gets the
+    stored row (server-side defaults included) without a refresh() round-trip.
+    `id` may come from the client; returns None if a card with that id already exists.
+    """
+    values.setdefault("id", uuid.uuid4())
+    return db.scalars(
+        insert_ignoring_conflicts(db, Card)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=["id"])
+        .returning(Card)
+    ).first()
+
+
+def renumber_columns(db: Session, column_ids):
+    """
+    Close position gaps (0, 1, 2, ...) in several columns with one set-based statement:
+    UPDATE cards ... FROM (ROW_NUMBER() OVER (PARTITION BY column_id ORDER BY position)).
+    Only rows whose position actually changes are written.
+    """
+    column_ids = [_as_uuid(c) for c in column_ids]
+    if not column_ids:
+        return
+    ranked = (
+        select(
+            Card.id.label("card_id"),
+            (func.row_number().over(
+                partition_by=Card.column_id,
+                order_by=(Card.position, Card.created_at),
+            ) - 1).label("new_position"),
+        )
+        .where(Card.column_id.in_(column_ids))
+        .subquery()
+    )
+    db.execute(
+        update(Card)
+        .where(Card.id == ranked.c.card_id, Card.position != ranked.c.new_position)
+        # Setting updated_at to itself stops onupdate from firing — a shift isn't an edit
+        .values(position=ranked.c.new_position, updated_at=Card.updated_at),
+        execution_options={"synchronize_session": False},
+    )
+
+
+def open_slot(db: Session, column_id, card_id, slot: int):
+    """
+    Make room for `card_id` at `slot` in a column: every other card is renumbered 0, 1, 2, ...
+    in its current order, skipping `slot`, with one UPDATE ... FROM (ROW_NUMBER() OVER ...).
+    Like renumber_columns it keeps updated_at, so shifting neighbours doesn't count as editing
+    them. The caller sets the card's own position.
+    """
+    ranked = (
+        select(
+            Card.id.label("card_id"),
+            (func.row_number().over(order_by=(Card.position, Card.created_at)) - 1).label("rank"),
+        )
+        .where(Card.column_id == _as_uuid(column_id), Card.id != _as_uuid(card_id))
+        .subquery()
+    )
+    new_position = ranked.c.rank + case((ranked.c.rank >= slot, 1), else_=0)
+    db.execute(
+        update(Card)
+        .where(Card.id == ranked.c.card_id, Card.position != new_position)
+        .values(position=new_position, updated_at=Card.updated_at),
+        execution_options={"synchronize_session": False},
+    )
+
+
+def _as_uuid(value) -> uuid.UUID:
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
@@ -0,0 +1,226 @@
+import uuid
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.auth.dependencies import get_current_user
+from app.cards.router import verify_membership
+from app.models import User
+from app.schemas import (
+    CreateColumnRequest, UpdateColumnRequest, ColumnResponse,
+    MoveColumnCardsRequest, SortColumnRequest, ColumnCardsResult,
+)
+from app.columns.service import (
+    create_column, get_column, move_column, delete_column, column_payload,
+    move_all_cards, clear_column, sort_column,
+)
+from app.activity.writer import activity
+from app.ws.manager import manager
+from app.timeouts import use_timeouts
+
+router = APIRouter(prefix="/api/rooms/{room_id}/columns", tags=["columns"])
+
+
+# ---------- Create Column ----------
+
+@router.post("", response_model=ColumnResponse, status_code=status.HTTP_201_CREATED)
+def add_column(
+    room_id: uuid.UUID,
+    body: CreateColumnRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    verify_membership(db, room_id, current_user.id)
+
+    column = create_column(db, room_id, body.title)
+    db.commit()
+
+    payload = column_payload(column)
+    background_tasks.add_task(manager.broadcast, str(room_id), {
+        "type": "column_created",
+        "column": payload,
+        "by": str(current_user.id)
+    })
+    return payload
+
+
+# ---------- Rename / Move Column ----------
+
+@router.patch("/{column_id}", response_model=ColumnResponse)
+def update_column(
+    room_id: uuid.UUID,
+    column_id: uuid.UUID,
+    body: UpdateColumnRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    verify_membership(db, room_id, current_user.id)
+
+    column = get_column(db, room_id, column_id)
+    if not column:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Column not found in this room")
+
+    if body.title is not None:
+        column.title = body.title
+    if body.to_index is not None:
+        move_column(db, column, body.to_index)
+    db.commit()
+
+    payload = column_payload(column)
+    if body.title is not None:
+        background_tasks.add_task(manager.broadcast, str(room_id), {
+            "type": "column_renamed",
+            "column_id": payload["id"],
+            "title": column.title,
+            "by": str(current_user.id)
+        })
+    if body.to_index is not None:
+        background_tasks.add_task(manager.broadcast, str(room_id), {
+            "type": "column_moved",
+            "column_id": payload["id"],
+            "position": column.position,
+            "to_index": body.to_index,
+            "by": str(current_user.id)
+        })
+    return payload
+
+
+# ---------- Delete Column ----------
+
+@router.delete("/{column_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_column(
+    room_id: uuid.UUID,
+    column_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+    move_cards_to: Optional[uuid.UUID] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Delete a column. Pass ?move_cards_to={column_id} to keep its cards, otherwise they're deleted with it."""
+    verify_membership(db, room_id, current_user.id)
+    # Touches every card in the column — bulk limits, not the card-mutation ones
+    use_timeouts(db, "bulk")
+
+    column = get_column(db, room_id, column_id)
+    if not column:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Column not found in this room")
+
+    target = None
+    if move_cards_to is not None:
+        target = get_column(db, room_id, move_cards_to)
+        if not target or target.id == column.id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Target column not found in this room")
+
+    delete_column(db, column, target)
+    db.commit()
+
+    background_tasks.add_task(manager.broadcast, str(room_id), {
+        "type": "column_deleted",
+        "column_id": str(column_id),
+        "moved_cards_to": str(move_cards_to) if target else None,
+        "by": str(current_user.id)
+    })
+
+
+# ---------- Column-wide Card Operations ----------
+# One set-based statement per operation and one broadcast, however many cards are involved
+
+def _get_column_or_404(db: Session, room_id: uuid.UUID, column_id: uuid.UUID, detail: str = "Column not found in this room"):
+    column = get_column(db, room_id, column_id)
+    if not column:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+    return column
+
+
+@router.post("/{column_id}/cards/move", response_model=ColumnCardsResult)
+def move_column_cards(
+    room_id: uuid.UUID,
+    column_id: uuid.UUID,
+    body: MoveColumnCardsRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Move every card in the column to the bottom of `to_column_id`, keeping their order."""
+    verify_membership(db, room_id, current_user.id)
+    use_timeouts(db, "bulk")
+
+    column = _get_column_or_404(db, room_id, column_id)
+    target = _get_column_or_404(db, room_id, body.to_column_id, "Target column not found in this room")
+    if target.id == column.id:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Source and target are the same column")
+
+    moved = move_all_cards(db, column, target)
+    db.commit()
+
+    if moved:
+        activity.record(room_id, "column_cards_moved", user_id=current_user.id,
+                        from_column_id=str(column_id), to_column_id=str(body.to_column_id), count=moved)
+        background_tasks.add_task(manager.broadcast, str(room_id), {
+            "type": "column_cards_moved",
+            "from_column_id": str(column_id),
+            "to_column_id": str(body.to_column_id),
+            "count": moved,
+            "by": str(current_user.id)
+        })
+    return ColumnCardsResult(count=moved)
+
+
+@router.delete("/{column_id}/cards", response_model=ColumnCardsResult)
+def clear_column_cards(
+    room_id: uuid.UUID,
+    column_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Delete every card in the column (the column itself stays)."""
+    verify_membership(db, room_id, current_user.id)
+    use_timeouts(db, "bulk")
+
+    column = _get_column_or_404(db, room_id, column_id)
+    deleted = clear_column(db, column)
+    db.commit()
+
+    if deleted:
+        activity.record(room_id, "column_cleared", user_id=current_user.id, column_id=str(column_id), count=deleted)
+        background_tasks.add_task(manager.broadcast, str(room_id), {
+            "type": "column_cleared",
+            "column_id": str(column_id),
+            "count": deleted,
+            "by": str(current_user.id)
+        })
+    return ColumnCardsResult(count=deleted)
+
+
+@router.post("/{column_id}/sort", response_model=ColumnCardsResult)
+def sort_column_cards(
+    room_id: uuid.UUID,
+    column_id: uuid.UUID,
+    body: SortColumnRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Reorder the column by title or creation date. `count` is how many cards changed position."""
+    verify_membership(db, room_id, current_user.id)
+    use_timeouts(db, "bulk")
+
+    column = _get_column_or_404(db, room_id, column_id)
+    positions = sort_column(db, column, body.by, body.descending)
+    db.commit()
+
+    if positions:
+        activity.record(room_id, "column_sorted", user_id=current_user.id, column_id=str(column_id),
+                        sort_by=body.by, descending=body.descending)
+        # Only the cards that actually moved — clients patch positions and re-sort locally
+        background_tasks.add_task(manager.broadcast, str(room_id), {
+            "type": "column_sorted",
+            "column_id": str(column_id),
+            "positions": positions,
+            "by": str(current_user.id)
+        })
+    return ColumnCardsResult(count=len(positions))
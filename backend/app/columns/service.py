@@ -0,0 +1,181 @@
+import uuid
+from sqlalchemy import case, select, update, delete, func
+from sqlalchemy.orm import Session
+
+from app.models import Column, Card
+
+# Columns are spaced this far apart so a reorder can drop a column into the gap between its
+# new neighbours — one UPDATE of one row — instead of renumbering every column in the room.
+COLUMN_POSITION_GAP = 1024
+
+
+def create_column(db: Session, room_id: uuid.UUID, title: str) -> Column:
+    """Append a new column to the right of the existing ones."""
+    last = db.execute(select(func.max(Column.position)).where(Column.room_id == room_id)).scalar()
+    column = Column(
+        id=uuid.uuid4(),
+        room_id=room_id,
+        title=title,
+        position=0 if last is None else last + COLUMN_POSITION_GAP,
+        card_count=0,
+    )
+    db.add(column)
+    return column
+
+
+def get_column(db: Session, room_id: uuid.UUID, column_id: uuid.UUID) -> Column | None:
+    return db.query(Column).filter(Column.id == column_id, Column.room_id == room_id).first()
+
+
+def move_column(db: Session, column: Column, to_index: int) -> int:
+    """
+    Place `column` at `to_index` among the room's other columns by giving it a position
+    between its new neighbours. Only this column's row is written; if the neighbours
+    have no gap left (rare), the room's columns are respaced first.
+    Returns the new position.
+    """
+    others = db.execute(
+        select(Column.id, Column.position)
+        .where(Column.room_id == column.room_id, Column.id != column.id)
+        .order_by(Column.position)
+    ).all()
+    to_index = max(0, min(to_index, len(others)))
+    position = _slot_between(others, to_index)
+    if position is None:
+        _respace(db, column.room_id, [c.id for c in others])
+        others = [(c_id, i * COLUMN_POSITION_GAP) for i, (c_id, _) in enumerate(others)]
+        position = _slot_between(others, to_index)
+
+    column.position = position
+    return position
+
+
+def _slot_between(others, to_index: int) -> int | None:
+    before = others[to_index - 1][1] if to_index > 0 else None
+    after = others[to_index][1] if to_index < len(others) else None
+    if before is None and after is None:
+        return 0
+    if before is None:
+        return after - COLUMN_POSITION_GAP
+    if after is None:
+        return before + COLUMN_POSITION_GAP
+    if after - before < 2:
+        return None
+    return (before + after) // 2
+
+
+def _respace(db: Session, room_id: uuid.UUID, ordered_ids: list[uuid.UUID]):
+    for i, column_id in enumerate(ordered_ids):
+        db.execute(update(Column).where(Column.id == column_id).values(position=i * COLUMN_POSITION_GAP))
+
+
+def delete_column(db: Session, column: Column, move_cards_to: Column | None) -> int:
+    """
+    Delete a column. With `move_cards_to`, its cards are first appended to that column by
+    move_all_cards (set-based, renumbered, under both row locks). Without it the cards go
+    with the column via ON DELETE CASCADE. Returns how many cards were moved.
+    """
+    moved = move_all_cards(db, column, move_cards_to) if move_cards_to is not None else 0
+    db.execute(delete(Column).where(Column.id == column.id), execution_options={"synchronize_session": False})
+    return moved
+
+
+# ---------- Column-wide card operations ----------
+# Each is a fixed number of set-based statements no matter how many cards the column holds —
+# no ORM loading, no per-card flush, no reindex_column.
+
+SORT_KEYS = {
+    "title": lambda: func.lower(Card.title),
+    "created_at": lambda: Card.created_at,
+}
+
+
+def move_all_cards(db: Session, source: Column, target: Column) -> int:
+    """
+    Append every card of `source` to the bottom of `target`, keeping their order:
+    one SELECT ... FOR UPDATE locks both columns (in id order, so two opposite moves can't
+    deadlock) and reads the target's count under the lock, one UPDATE ... FROM
+    (ROW_NUMBER() OVER ...) moves and renumbers the cards — whatever positions they had —
+    and one UPDATE shifts both counts by the number of rows actually moved.
+    Returns how many cards moved.
+    """
+    counts = dict(db.execute(
+        select(Column.id, Column.card_count)
+        .where(Column.id.in_([source.id, target.id]))
+        .order_by(Column.id)
+        .with_for_update()
+    ).all())
+    offset = counts[target.id]
+    ranked = (
+        select(
+            Card.id.label("card_id"),
+            (func.row_number().over(order_by=(Card.position, Card.created_at)) - 1 + offset).label("new_position"),
+        )
+        .where(Card.column_id == source.id)
+        .subquery()
+    )
+    moved = db.execute(
+        update(Card)
+        .where(Card.id == ranked.c.card_id)
+        .values(column_id=target.id, position=ranked.c.new_position),
+        execution_options={"synchronize_session": False},
+    ).rowcount
+    if moved:
+        db.execute(
+            update(Column)
+            .where(Column.id.in_([source.id, target.id]))
+            .values(card_count=Column.card_count + case((Column.id == target.id, moved), else_=-moved)),
+            execution_options={"synchronize_session": False},
+        )
+    return moved
+
+
+def clear_column(db: Session, column: Column) -> int:
+    """Delete every card in a column with one DELETE. Returns how many were deleted."""
+    deleted = db.execute(
+        delete(Card).where(Card.column_id == column.id),
+        execution_options={"synchronize_session": False},
+    ).rowcount
+    if deleted:
+        db.execute(update(Column).where(Column.id == column.id).values(card_count=Column.card_count - deleted))
+    return deleted
+
+
+def sort_column(db: Session, column: Column, by: str, descending: bool = False) -> dict[str, int]:
+    """
+    Reorder a column's cards by title (case-insensitive) or creation date with one
+    UPDATE ... FROM (ROW_NUMBER() OVER (ORDER BY key, id)). Only cards whose position
+    changes are written; returns {card_id: new_position} for exactly those.
+    """
+    key = SORT_KEYS[by]()
+    ranked = (
+        select(
+            Card.id.label("card_id"),
+            (func.row_number().over(
+                order_by=(key.desc(), Card.id) if descending else (key, Card.id),
+            ) - 1).label("new_position"),
+        )
+        .where(Card.column_id == column.id)
+        .subquery()
+    )
+    changed = db.execute(
+        update(Card)
+        .where(Card.id == ranked.c.card_id, Card.position != ranked.c.new_position)
+        # A reorder isn't an edit — keep updated_at (same trick as renumber_columns)
+        .values(position=ranked.c.new_position, updated_at=Card.updated_at)
+        .returning(Card.id, Card.position),
+        execution_options={"synchronize_session": False},
+    ).all()
+    return {str(card_id): position for card_id, position in changed}
+
+
+def column_payload(column: Column) -> dict:
+    """JSON-ready column for WebSocket broadcasts (no cards — new/changed columns carry none)."""
+    return {
+        "id": str(column.id),
+        "title": column.title,
+        "position": column.position,
+        "card_count": column.card_count,
+        "auto_archive_days": column.auto_archive_days,
+        "cards": [],
+    }
@@ -0,0 +1,190 @@
+import asyncio
+import gzip
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+
+from app.config import settings
+
+# Optional codecs — used when the packages are installed, otherwise we fall back to gzip
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+def _gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=settings.compression_gzip_level, mtime=0)
+
+
+CODECS = {"gzip": _gzip}
+if brotli is not None:
+    CODECS["br"] = lambda data: brotli.compress(data, quality=settings.compression_brotli_quality)
+if zstandard is not None:
+    CODECS["zstd"] = lambda data: zstandard.ZstdCompressor(level=settings.compression_zstd_level).compress(data)
+
+# Best ratio-per-CPU first
+PREFERENCE = ("zstd", "br", "gzip")
+COMPRESSIBLE_TYPES = (b"application/json", b"text/")
+# Bodies at least this big are hashed/compressed in a worker thread
+OFFLOAD_BYTES = 64 * 1024
+
+
+def _digest(body: bytes) -> str:
+    return hashlib.sha1(body).hexdigest()
+
+
+def _matches(if_none_match: bytes, etag: bytes) -> bool:
+    """If-None-Match uses the weak comparison: any listed tag (W/ or not) equal to ours, or `*`."""
+    tags = [tag.strip() for tag in if_none_match.split(b",")]
+    return any(tag == b"*" or tag.removeprefix(b"W/") == etag for tag in tags)
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """Pick the best codec the client accepts. q-values only matter for excluding a codec (q=0)."""
+    offered = set()
+    for part in accept_encoding.lower().split(","):
+        name, *params = [p.strip() for p in part.split(";")]
+        q = next((p[2:] for p in params if p.startswith("q=")), "1")
+        try:
+            if float(q) == 0:
+                continue
+        except ValueError:
+            continue
+        offered.add(name)
+    for codec in PREFERENCE:
+        if codec in CODECS and (codec in offered or "*" in offered):
+            return codec
+    return None
+
+
+class CompressionCache:
+    """
+    LRU of compressed bodies keyed by (sha1 of the uncompressed body, codec), bounded by
+    total bytes. A board that hasn't changed serialises to the same bytes, so repeat
+    loads of it are served from here instead of being compressed again.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compress(self, digest: str, codec: str, body: bytes) -> bytes:
+        key = (digest, codec)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+        compressed = CODECS[codec](body)
+        with self._lock:
+            self.misses += 1
+            if key not in self._entries and len(compressed) <= self.max_bytes:
+                self._entries[key] = compressed
+                self.size += len(compressed)
+                while self.size > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.size -= len(evicted)
+        return compressed
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self.size, "hits": self.hits, "misses": self.misses}
+
+
+compression_cache = CompressionCache(settings.compression_cache_mb * 1024 * 1024)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing JSON/text responses above `minimum_size` with the best
+    codec the client accepts. Responses get a strong ETag from the body digest — suffixed
+    with the codec, since each encoding is a different byte sequence — so an unchanged
+    board can also be answered with 304 Not Modified. Unsized (streaming)
+    responses and ones that already carry a Content-Encoding pass through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int, cache: CompressionCache):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = dict(scope["headers"])
+        codec = negotiate(request_headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if_none_match = request_headers.get(b"if-none-match")
+        start = None
+        chunks: list[bytes] = []
+
+        async def buffered_send(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                if self._wants(message):
+                    start = message
+                    return
+                await send(message)
+                return
+            if start is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+            # Sized responses may still arrive in several chunks (e.g. through BaseHTTPMiddleware)
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                await self._finish(start, b"".join(chunks), codec, if_none_match, send)
+
+        await self.app(scope, receive, buffered_send)
+
+    def _wants(self, start: dict) -> bool:
+        """Only buffer complete, sized, uncompressed JSON/text 200s that are big enough to be worth it."""
+        headers = {k.lower(): v for k, v in start["headers"]}
+        length = headers.get(b"content-length")
+        return (
+            start["status"] == 200
+            and length is not None
+            and int(length) >= self.minimum_size
+            and b"content-encoding" not in headers
+            and headers.get(b"content-type", b"").startswith(COMPRESSIBLE_TYPES)
+        )
+
+    async def _finish(self, start: dict, body: bytes, codec: str | None, if_none_match: bytes | None, send):
+        headers = [(k, v) for k, v in start["headers"] if k.lower() not in (b"content-length", b"etag")]
+        # Hashing and compressing a multi-MB board takes real CPU — keep it off the event loop
+        if len(body) >= OFFLOAD_BYTES:
+            digest = await asyncio.to_thread(_digest, body)
+        else:
+            digest = _digest(body)
+        etag = (f'"{digest}-{codec}"' if codec is not None else f'"{digest}"').encode()
+        headers += [(b"etag", etag), (b"vary", b"Accept-Encoding")]
+        if if_none_match is not None and _matches(if_none_match, etag):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        if codec is not None:
+            if len(body) >= OFFLOAD_BYTES:
+                body = await asyncio.to_thread(self.cache.get_or_compress, digest, codec, body)
+            else:
+                body = self.cache.get_or_compress(digest, codec, body)
+            headers.append((b"content-encoding", codec.encode()))
+        headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": start["status"], "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+def deflate_frame(payload: str) -> bytes:
+    """Raw DEFLATE for WebSocket messages — what the browser's DecompressionStream('deflate-raw') reads."""
+    compressor = zlib.compressobj(settings.ws_compress_level, zlib.DEFLATED, -15)
+    return compressor.compress(payload.encode()) + compressor.flush()
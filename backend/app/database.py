@@ -1,19 +1,67 @@
-from sqlalchemy import create_engine
+import time
+import uuid
+from sqlalchemy import create_engine, event, text, Uuid
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.types import TypeDecorator
 from app.config import settings
 
 # Engine: manages the connection pool to PostgreSQL
-engine = create_engine(settings.database_url)
+engine = create_engine(settings.database_url, pool_timeout=settings.db_pool_timeout_seconds)
+
+# Read engine: points at the replica when one is configured, otherwise it *is* the primary
+read_engine = (
+    create_engine(settings.database_read_url, pool_timeout=settings.db_pool_timeout_seconds)
+    if settings.database_read_url else engine
+)
+
+
+def _configure_sqlite(sqlite_engine):
+    """
+    SQLite is supported for hermetic tests and benchmarks. Turn on foreign keys so
+    ON DELETE CASCADE behaves like Postgres, use WAL for concurrent readers, and stand in
+    for the two full-text functions the generated cards.search_vector column calls.
+    """
+    @event.listens_for(sqlite_engine, "connect")
+    def _on_connect(dbapi_conn, connection_record):
+        dbapi_conn.execute("PRAGMA foreign_keys=ON")
+        dbapi_conn.execute("PRAGMA journal_mode=WAL")
+        dbapi_conn.execute("PRAGMA synchronous=NORMAL")
+        dbapi_conn.create_function("to_tsvector", 2, lambda config, doc: (doc or "").lower(), deterministic=True)
+        dbapi_conn.create_function("setweight", 2, lambda vector, weight: vector, deterministic=True)
+
+
+for _engine in {engine, read_engine}:
+    if _engine.dialect.name == "sqlite":
+        _configure_sqlite(_engine)
+
 
 # SessionLocal: factory that produces new database sessions
 # autocommit=False means we control when changes are saved
 # autoflush=False means we control when pending changes are sent to the DB
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+# info["op_class"] picks the statement/lock timeouts each transaction gets (see app.timeouts)
+SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, info={"op_class": "mutation"})
+
+# Sessions for read-only endpoints — never commit through these
+ReadSessionLocal = sessionmaker(bind=read_engine, autocommit=False, autoflush=False, info={"op_class": "read"})
+
+
+class FlexibleUuid(TypeDecorator):
+    """
+    UUID column that also accepts string ids (WebSocket payloads carry them as strings).
+    Postgres casts those itself; SQLite's UUID storage needs a real uuid.UUID.
+    """
+    impl = Uuid
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, str):
+            return uuid.UUID(value)
+        return value
 
 
 # Base class for all ORM models — every table class will inherit from this
 class Base(DeclarativeBase):
-    pass
+    type_annotation_map = {uuid.UUID: FlexibleUuid}
 
 
 def get_db():
@@ -27,4 +75,75 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+class ReadYourWrites:
+    """
+    Remembers which users committed a write recently, so their next reads go to the
+    primary instead of a replica that may not have caught up yet. Otherwise a user
+    could create a card and then not see it on the next board load.
+    A user is released back to the replica after `window` seconds, or earlier if LSN
+    checking is on and the replica has replayed past the user's last commit.
+    """
+
+    def __init__(self, window: float, lsn_check: bool):
+        self.window = window
+        self.lsn_check = lsn_check
+        # user_id → (monotonic time of last write, primary WAL LSN right after it, or None)
+        self._writes: dict[str, tuple[float, str | None]] = {}
+
+    def mark(self, user_id: str):
+        lsn = None
+        if self.lsn_check and engine.dialect.name == "postgresql":
+            with engine.connect() as conn:
+                lsn = conn.execute(text("SELECT pg_current_wal_lsn()::text")).scalar()
+        self._writes[user_id] = (time.monotonic(), lsn)
+        if len(self._writes) > 10_000:
+            self._prune()
+
+    def needs_primary(self, user_id: str) -> bool:
+        if read_engine is engine:
+            return False
+        entry = self._writes.get(user_id)
+        if entry is None:
+            return False
+        written_at, lsn = entry
+        if time.monotonic() - written_at > self.window or (lsn and self._replica_has(lsn)):
+            self._writes.pop(user_id, None)
+            return False
+        return True
+
+    def _replica_has(self, lsn: str) -> bool:
+        with read_engine.connect() as conn:
+            return bool(conn.execute(
+                text("SELECT pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn)"), {"lsn": lsn}
+            ).scalar())
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.window
+        self._writes = {uid: entry for uid, entry in self._writes.items() if entry[0] >= cutoff}
+
+
+read_your_writes = ReadYourWrites(settings.read_your_writes_seconds, settings.replica_lsn_check)
+
+
+# Sessions learn who they're acting for via session.info["user_id"] (set by the auth
+# dependency and the WebSocket handshake). Any ORM flush or DML statement marks the
+# session dirty; committing a dirty session pins that user to the primary.
+
+@event.listens_for(SessionLocal, "after_flush")
+def _flagged_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _flagged_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _pin_writer(session):
+    if session.info.pop("wrote", False) and session.info.get("user_id"):
+        read_your_writes.mark(session.info["user_id"])
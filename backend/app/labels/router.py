@@ -0,0 +1,121 @@
+import uuid
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.auth.dependencies import get_current_user, get_current_reader, get_read_db
+from app.cards.router import verify_membership
+from app.models import User, Label
+from app.schemas import CreateLabelRequest, UpdateLabelRequest, LabelResponse
+from app.serialization import label_serializer
+from app.ws.manager import manager
+
+router = APIRouter(prefix="/api/rooms/{room_id}/labels", tags=["labels"])
+
+
+def get_label(db: Session, room_id: uuid.UUID, label_id: uuid.UUID) -> Label:
+    label = db.scalars(select(Label).where(Label.id == label_id, Label.room_id == room_id)).first()
+    if not label:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Label not found in this room")
+    return label
+
+
+def ensure_name_free(db: Session, room_id: uuid.UUID, name: str):
+    taken = db.scalars(select(Label.id).where(Label.room_id == room_id, Label.name == name)).first()
+    if taken:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A label with this name already exists")
+
+
+# ---------- List Labels ----------
+
+@router.get("", response_model=list[LabelResponse])
+def list_labels(
+    room_id: uuid.UUID,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader),
+):
+    verify_membership(db, room_id, current_user.id)
+    rows = db.execute(select(*label_serializer.columns).where(Label.room_id == room_id).order_by(Label.name))
+    return [label_serializer.from_row(row) for row in rows]
+
+
+# ---------- Create Label ----------
+
+@router.post("", response_model=LabelResponse, status_code=status.HTTP_201_CREATED)
+def create_label(
+    room_id: uuid.UUID,
+    body: CreateLabelRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    verify_membership(db, room_id, current_user.id)
+    ensure_name_free(db, room_id, body.name)
+
+    label = Label(room_id=room_id, name=body.name, color=body.color)
+    db.add(label)
+    db.flush()
+    payload = label_serializer.from_object(label)
+    db.commit()
+
+    background_tasks.add_task(manager.broadcast, str(room_id), {
+        "type": "label_created",
+        "label": {**payload, "id": str(payload["id"])},
+        "by": str(current_user.id)
+    })
+    return payload
+
+
+# ---------- Rename / Recolour Label ----------
+
+@router.patch("/{label_id}", response_model=LabelResponse)
+def update_label(
+    room_id: uuid.UUID,
+    label_id: uuid.UUID,
+    body: UpdateLabelRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    verify_membership(db, room_id, current_user.id)
+
+    label = get_label(db, room_id, label_id)
+    if body.name is not None and body.name != label.name:
+        ensure_name_free(db, room_id, body.name)
+        label.name = body.name
+    if body.color is not None:
+        label.color = body.color
+    payload = label_serializer.from_object(label)
+    db.commit()
+
+    background_tasks.add_task(manager.broadcast, str(room_id), {
+        "type": "label_updated",
+        "label": {**payload, "id": str(payload["id"])},
+        "by": str(current_user.id)
+    })
+    return payload
+
+
+# ---------- Delete Label ----------
+
+@router.delete("/{label_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_label(
+    room_id: uuid.UUID,
+    label_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Delete a label; its card links go with it (ON DELETE CASCADE)."""
+    verify_membership(db, room_id, current_user.id)
+
+    label = get_label(db, room_id, label_id)
+    db.delete(label)
+    db.commit()
+
+    background_tasks.add_task(manager.broadcast, str(room_id), {
+        "type": "label_deleted",
+        "label_id": str(label_id),
+        "by": str(current_user.id)
+    })
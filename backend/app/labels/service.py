@@ -0,0 +1,115 @@
+import uuid
+from sqlalchemy import select, delete, insert, literal, union_all
+from sqlalchemy.orm import Session
+
+from app.models import Card, Column, Label, CardLabel, CardAssignee, RoomMember
+
+
+def card_filter(label_ids: list[uuid.UUID] | None, assignee_ids: list[uuid.UUID] | None) -> list:
+    """
+    Conditions on Card.id for a filtered board: any of the labels AND any of the assignees.
+    Each is a semi-join answered from the link table's reverse (label_id, card_id) /
+    (user_id, card_id) index, never by scanning the room's cards.
+    """
+    conditions = []
+    if label_ids:
+        conditions.append(Card.id.in_(select(CardLabel.card_id).where(CardLabel.label_id.in_(label_ids))))
+    if assignee_ids:
+        conditions.append(Card.id.in_(select(CardAssignee.card_id).where(CardAssignee.user_id.in_(assignee_ids))))
+    return conditions
+
+
+def room_card_ids(room_id, *conditions):
+    """Subquery: ids of the room's cards matching `conditions`."""
+    return select(Card.id).join(Column, Card.column_id == Column.id).where(Column.room_id == room_id, *conditions)
+
+
+def card_tags(db: Session, card_ids) -> dict[uuid.UUID, dict[str, list[uuid.UUID]]]:
+    """
+    Label and assignee ids for many cards in one statement (UNION ALL over both link tables).
+    `card_ids` is a list or a subquery. Cards without tags are simply absent from the result.
+    """
+    rows = db.execute(
+        union_all(
+            select(CardLabel.card_id, CardLabel.label_id.label("ref"), literal("label_ids").label("kind"))
+            .where(CardLabel.card_id.in_(card_ids)),
+            select(CardAssignee.card_id, CardAssignee.user_id.label("ref"), literal("assignee_ids").label("kind"))
+            .where(CardAssignee.card_id.in_(card_ids)),
+        ).order_by("card_id", "kind", "ref")
+    )
+    tags: dict[uuid.UUID, dict[str, list[uuid.UUID]]] = {}
+    for card_id, ref, kind in rows:
+        card_id = card_id if isinstance(card_id, uuid.UUID) else uuid.UUID(str(card_id))
+        ref = ref if isinstance(ref, uuid.UUID) else uuid.UUID(str(ref))
+        tags.setdefault(card_id, {"label_ids": [], "assignee_ids": []})[kind].append(ref)
+    return tags
+
+
+def tags_of(db: Session, card_id) -> dict[str, list[str]]:
+    """One card's tags as strings, ready for a WebSocket broadcast."""
+    tags = card_tags(db, [card_id]).get(uuid.UUID(str(card_id)), {})
+    return {
+        "label_ids": [str(i) for i in tags.get("label_ids", [])],
+        "assignee_ids": [str(i) for i in tags.get("assignee_ids", [])],
+    }
+
+
+def get_room_card(db: Session, room_id, card_id) -> Card | None:
+    return db.scalars(
+        select(Card).join(Column, Card.column_id == Column.id).where(Card.id == card_id, Column.room_id == room_id)
+    ).first()
+
+
+def _replace_links(db: Session, model, ref_column: str, card_id, refs: list[uuid.UUID]):
+    db.execute(delete(model).where(model.card_id == card_id))
+    if refs:
+        db.execute(insert(model), [{"card_id": card_id, ref_column: ref} for ref in refs])
+
+
+def set_card_labels(db: Session, room_id, card_id, label_ids: list[uuid.UUID]) -> list[uuid.UUID] | None:
+    """Replace a card's labels. Returns the sorted ids, or None if any label isn't the room's."""
+    wanted = set(label_ids)
+    if wanted:
+        found = set(db.scalars(select(Label.id).where(Label.room_id == room_id, Label.id.in_(wanted))))
+        if found != wanted:
+            return None
+    _replace_links(db, CardLabel, "label_id", card_id, sorted(wanted))
+    return sorted(wanted)
+
+
+def set_card_assignees(db: Session, room_id, card_id, user_ids: list[uuid.UUID]) -> list[uuid.UUID] | None:
+    """Replace a card's assignees. Returns the sorted ids, or None if anyone isn't a room member."""
+    wanted = set(user_ids)
+    if wanted:
+        found = set(db.scalars(
+            select(RoomMember.user_id).where(RoomMember.room_id == room_id, RoomMember.user_id.in_(wanted))
+        ))
+        if found != wanted:
+            return None
+    _replace_links(db, CardAssignee, "user_id", card_id, sorted(wanted))
+    return sorted(wanted)
+
+
+def relink_tags(db: Session, room_id, rows: list[dict]):
+    """
+    Restore archived cards' tags (rows carry the label_ids/assignee_ids snapshot taken at archive
+    time). Labels deleted and users who left the room in the meantime are skipped.
+    """
+    label_ids = {uuid.UUID(i) for row in rows for i in row.get("label_ids") or ()}
+    user_ids = {uuid.UUID(i) for row in rows for i in row.get("assignee_ids") or ()}
+    if label_ids:
+        label_ids = set(db.scalars(select(Label.id).where(Label.room_id == room_id, Label.id.in_(label_ids))))
+    if user_ids:
+        user_ids = set(db.scalars(
+            select(RoomMember.user_id).where(RoomMember.room_id == room_id, RoomMember.user_id.in_(user_ids))
+        ))
+    for row in rows:
+        # Rows end up carrying only the tags actually restored
+        row["label_ids"] = [i for i in row.get("label_ids") or () if uuid.UUID(i) in label_ids]
+        row["assignee_ids"] = [i for i in row.get("assignee_ids") or () if uuid.UUID(i) in user_ids]
+    labels = [{"card_id": row["id"], "label_id": uuid.UUID(i)} for row in rows for i in row["label_ids"]]
+    assignees = [{"card_id": row["id"], "user_id": uuid.UUID(i)} for row in rows for i in row["assignee_ids"]]
+    if labels:
+        db.execute(insert(CardLabel), labels)
+    if assignees:
+        db.execute(insert(CardAssignee), assignees)
@@ -1,18 +1,125 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeout
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.auth.router import router as auth_router
 from app.rooms.router import router as rooms_router
 from app.cards.router import router as cards_router
+from app.columns.router import router as columns_router
 from app.ws.router import router as ws_router
+from app.admin.router import router as admin_router
+from app.activity.router import router as activity_router
+from app.archive.router import router as archive_router
+from app.labels.router import router as labels_router
+from app.ws.heartbeat import heartbeats
+from app.ws.focus import focus_sweeper
+from app.ws.drain import drainer
+from app.ws.hibernate import room_hibernator
+from app.activity.writer import activity
+from app.rooms.purge import room_purger
+from app.archive.service import archive_policy
+from app.cards.idempotency import recent_ops_pruner
+from app.query_stats import query_stats
+from app.tracing import tracer
+from app.compression import CompressionMiddleware, compression_cache
+from app.startup import readiness
+from app.serialization import FastJSONResponse
+from app.timeouts import shed, timeout_reason
 
-app = FastAPI(title="SyncBoard", version="0.1.0")
+logger = logging.getLogger("syncboard.errors")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background loops when the server boots and stop them on shutdown."""
+    # Schema check runs in the background — sockets can connect while it finishes
+    readiness.start()
+    heartbeats.start()
+    focus_sweeper.start()
+    room_hibernator.start()
+    activity.start()
+    room_purger.start()
+    archive_policy.start()
+    recent_ops_pruner.start()
+    # SIGTERM drains sockets gradually before uvicorn's own shutdown closes them all at once
+    drainer.install_signal_handler()
+    yield
+    await heartbeats.stop()
+    await focus_sweeper.stop()
+    await room_hibernator.stop()
+    await activity.stop()  # flushes whatever is still queued
+    await room_purger.stop()
+    await archive_policy.stop()
+    await recent_ops_pruner.stop()
+    await readiness.stop()
+
+
+# orjson for every JSON response; hot endpoints also skip response_model validation (app.serialization)
+app = FastAPI(title="SyncBoard", version="0.1.0", lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # Register routers
 app.include_router(auth_router)
 app.include_router(rooms_router)
 app.include_router(cards_router)
+app.include_router(columns_router)
 app.include_router(ws_router)
+app.include_router(activity_router)
+app.include_router(archive_router)
+app.include_router(labels_router)
+app.include_router(admin_router)
+
+@app.exception_handler(OperationalError)
+@app.exception_handler(PoolTimeout)
+async def shed_on_db_timeout(request: Request, exc: Exception):
+    """
+    A statement/lock/pool limit fired: answer 503 with a retry hint instead of a 500.
+    Any other database error is a plain 500 — logged here, since re-raising from an
+    exception handler would bypass the normal error response.
+    """
+    reason = timeout_reason(exc)
+    if reason is None:
+        logger.error("Unhandled database error on %s %s", request.method, request.url.path, exc_info=exc)
+        return JSONResponse(status_code=500, content={"detail": "Internal Server Error"})
+    route = request.scope.get("route")
+    retry_after = shed.record(f"{request.method} {route.path if route else 'unmatched'}", reason)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database busy, please retry", "reason": reason},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+@app.middleware("http")
+async def count_queries(request: Request, call_next):
+    """Count statements and DB time per endpoint; exposed per response via Server-Timing."""
+    stats, token = query_stats.begin()
+    try:
+        response = await call_next(request)
+    finally:
+        route = request.scope.get("route")
+        query_stats.finish(f"{request.method} {route.path if route else 'unmatched'}", stats, token)
+    if stats is not None:
+        response.headers["Server-Timing"] = f'db;dur={stats.db_ms:.1f};desc="{stats.count} queries"'
+    return response
+
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Root span per request, renamed to the matched route once routing has happened."""
+    with tracer.trace(f"{request.method} {request.url.path}") as root:
+        response = await call_next(request)
+        route = request.scope.get("route")
+        if root is not None and route is not None:
+            root.name = f"{request.method} {route.path}"
+            root.attrs["status"] = response.status_code
+    return response
+
+
+# Compress big JSON bodies (board loads) with the best codec the client accepts
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_bytes, cache=compression_cache)
 
 # Allow the SvelteKit frontend to make cross-origin requests
 app.add_middleware(
@@ -26,5 +133,15 @@ app.add_middleware(
 
 @app.get("/api/health")
 def health_check():
-    """Simple endpoint to verify the API is running."""
-    return {"status": "ok"}
\ No newline at end of file
+    """Simple endpoint to verify the API is running (liveness — no DB access)."""
+    return {"status": "ok"}
+
+
+@app.get("/api/ready")
+def ready_check():
+    """Readiness: 200 once the database is reachable and at the migration head, 503 until then and while draining."""
+    if drainer.draining:
+        return JSONResponse(status_code=503, content={"status": "draining"})
+    if not readiness.ready:
+        return JSONResponse(status_code=503, content={"status": "starting", "detail": readiness.detail})
+    return {"status": "ready", "detail": readiness.detail}
\ No newline at end of file
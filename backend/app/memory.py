@@ -0,0 +1,141 @@
+import asyncio
+import sys
+import time
+import tracemalloc
+from fastapi import WebSocket
+
+from app.config import settings
+from app.ws.manager import manager
+from app.ws.heartbeat import heartbeats
+
+# Scope keys that belong to the connection itself; the rest point at app-wide objects
+CONNECTION_SCOPE_KEYS = ("headers", "query_string", "path", "raw_path", "client", "server", "path_params", "subprotocols")
+
+
+def deep_sizeof(obj, seen: set[int] | None = None) -> int:
+    """
+    Bytes held by `obj` and the plain containers/strings it owns. Anything else (sockets,
+    sessions, the app) is counted shallowly, so shared objects don't inflate one room's total.
+    Each object is counted once per `seen` set.
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def connection_sizeof(ws: WebSocket, seen: set[int]) -> int:
+    """One socket's own footprint: the object, its connection-specific scope, and heartbeat state."""
+    size = sys.getsizeof(ws) + sum(deep_sizeof(ws.scope.get(key), seen) for key in CONNECTION_SCOPE_KEYS)
+    # Three dict entries (room_of / pending / missed) at roughly one slot each
+    return size + 3 * sys.getsizeof(0) + deep_sizeof(heartbeats.missed.get(ws), seen)
+
+
+def rtt_sizeof(histogram, seen: set[int]) -> int:
+    return 0 if histogram is None else sys.getsizeof(histogram) + deep_sizeof(vars(histogram), seen)
+
+
+def room_memory(room_id: str, now: float) -> dict:
+    seen: set[int] = set()
+    conns = manager.rooms.get(room_id, [])
+    connections = sum(connection_sizeof(ws, seen) + deep_sizeof(user, seen) for ws, user in conns)
+    seen.update(id(ws) for ws, _ in conns)  # Counted just now; join buckets and subscriber sets hold them too
+    breakdown = {
+        "connections": connections + deep_sizeof(conns, seen),
+        # Leases reference their socket — it's already counted above
+        "focus": deep_sizeof({card_id: {k: v for k, v in lease.items() if k != "ws"}
+                              for card_id, lease in manager.focus[room_id].items()}, seen) if room_id in manager.focus else 0,
+        "pending_joins": deep_sizeof(manager._pending_joins[room_id], seen) if room_id in manager._pending_joins else 0,
+        "rtt": rtt_sizeof(heartbeats.rtt.get(room_id), seen),
+        "subscriptions": (deep_sizeof(manager.column_subscribers[room_id], seen)
+                          if room_id in manager.column_subscribers else 0)
+                         + sum(deep_sizeof(manager.subscribed[ws], seen) for ws, _ in conns if ws in manager.subscribed),
+    }
+    last = manager.last_active.get(room_id)
+    return {
+        "room_id": room_id,
+        "connections": len(conns),
+        "bytes": sum(breakdown.values()),
+        "breakdown": breakdown,
+        "bytes_per_connection": connections // len(conns) if conns else 0,
+        "idle_seconds": round(now - last, 1) if last is not None else None,
+    }
+
+
+def connection_memory(limit: int) -> dict:
+    """Per-room (and per-connection) footprint of the connection layer, largest rooms first."""
+    now = time.monotonic()
+    room_ids = set(manager.rooms) | set(manager.last_active) | set(manager.focus) | set(heartbeats.rtt)
+    rooms = sorted((room_memory(room_id, now) for room_id in room_ids), key=lambda r: r["bytes"], reverse=True)
+    connections = sum(r["connections"] for r in rooms)
+    total = sum(r["bytes"] for r in rooms)
+    return {
+        "rooms_tracked": len(rooms),
+        "connections": connections,
+        "bytes": total,
+        "bytes_per_connection": total // connections if connections else 0,
+        "rooms": rooms[:limit],
+    }
+
+
+class AllocationSampler:
+    """
+    tracemalloc on demand. Tracing every allocation costs real CPU and memory, so it is not
+    left on: a sample starts tracing, waits `seconds`, snapshots what was allocated in that
+    window and still alive, then stops. One sample at a time. If the process was started
+    with tracing already on (PYTHONTRACEMALLOC), the running trace is snapshotted instead.
+    """
+
+    def __init__(self, max_seconds: float, frames: int):
+        self.max_seconds = max_seconds
+        self.frames = frames
+        self.samples = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    async def sample(self, seconds: float, limit: int, group_by: str = "lineno") -> dict:
+        seconds = min(seconds, self.max_seconds)
+        async with self._lock:
+            owned = not tracemalloc.is_tracing()
+            if owned:
+                tracemalloc.start(self.frames)
+            try:
+                await asyncio.sleep(seconds)
+                snapshot = tracemalloc.take_snapshot()
+                traced, peak = tracemalloc.get_traced_memory()
+            finally:
+                if owned:
+                    tracemalloc.stop()
+            self.samples += 1
+        # Grouping walks every trace — keep it off the event loop
+        stats = await asyncio.to_thread(self._top, snapshot, limit, group_by)
+        return {"seconds": seconds, "traced_bytes": traced, "peak_bytes": peak, "top": stats}
+
+    @staticmethod
+    def _top(snapshot: tracemalloc.Snapshot, limit: int, group_by: str) -> list[dict]:
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+        return [
+            {
+                "where": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+                "bytes": stat.size,
+                "count": stat.count,
+            }
+            for stat in snapshot.statistics(group_by)[:limit]
+        ]
+
+
+# Shared instance, same pattern as the WebSocket `manager`
+allocations = AllocationSampler(max_seconds=settings.memory_trace_max_seconds, frames=settings.memory_trace_frames)
@@ -0,0 +1,46 @@
+"""
+One-shot migration command, run once per deploy instead of on every container boot:
+
+    python -m app.migrate            # upgrade to head
+    python -m app.migrate --check    # exit 1 if the database is behind
+"""
+import sys
+from pathlib import Path
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+def _config():
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    return config
+
+
+def upgrade(revision: str = "head"):
+    from alembic import command
+
+    command.upgrade(_config(), revision)
+
+
+def stamp(revision: str = "head"):
+    """Mark a schema built with metadata.create_all (e.g. a SQLite benchmark database) as current."""
+    from alembic import command
+
+    command.stamp(_config(), revision)
+
+
+def main(argv: list[str]) -> int:
+    if "--check" in argv:
+        from app.startup import current_revision, expected_head
+
+        current, expected = current_revision(), expected_head()
+        print(f"database: {current}  head: {expected}")
+        return 0 if current == expected else 1
+    upgrade()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,6 +1,9 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import String, Text, Integer, ForeignKey, UniqueConstraint, Index
+from typing import Optional
+from sqlalchemy import String, Text, Integer, ForeignKey, UniqueConstraint, Index, Computed, JSON, true
+from sqlalchemy.dialects.postgresql import TSVECTOR, JSONB
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 
@@ -9,6 +12,19 @@ def utcnow():
     return datetime.now(timezone.utc)
 
 
+# Expression behind the generated cards.search_vector column (see the card_search migration)
+CARD_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
+@compiles(TSVECTOR, "sqlite")
+def _tsvector_on_sqlite(type_, compiler, **kw):
+    # SQLite has no tsvector — the generated column just holds lowercased text there
+    return "TEXT"
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -31,10 +47,21 @@ class Room(Base):
     room_code: Mapped[str] = mapped_column(String(8), unique=True, nullable=False)
     created_by: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     created_at: Mapped[datetime] = mapped_column(default=utcnow)
+    # Set when the room is deleted; the rows are purged later in batches by app.rooms.purge
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
+    # Off for latency-sensitive rooms: WebSocket messages are then never deflated
+    ws_compression: Mapped[bool] = mapped_column(default=True, server_default=true())
 
     creator: Mapped["User"] = relationship(back_populates="created_rooms")
-    members: Mapped[list["RoomMember"]] = relationship(back_populates="room", cascade="all, delete-orphan")
-    columns: Mapped[list["Column"]] = relationship(back_populates="room", cascade="all, delete-orphan")
+    # passive_deletes: let the database's ON DELETE CASCADE remove children instead of
+    # SQLAlchemy loading every one of them into memory first
+    members: Mapped[list["RoomMember"]] = relationship(back_populates="room", cascade="all, delete-orphan", passive_deletes=True)
+    columns: Mapped[list["Column"]] = relationship(back_populates="room", cascade="all, delete-orphan", passive_deletes=True)
+    labels: Mapped[list["Label"]] = relationship(back_populates="room", passive_deletes=True, order_by="Label.name")
+
+    __table_args__ = (
+        Index("idx_rooms_deleted", "deleted_at"),
+    )
 
 
 class RoomMember(Base):
@@ -63,9 +90,14 @@ class Column(Base):
     room_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("rooms.id", ondelete="CASCADE"))
     title: Mapped[str] = mapped_column(String(100), nullable=False)
     position: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Denormalised number of cards in the column — also the position the next appended card gets.
+    # Maintained by app.cards.service in the same transaction as the card insert/delete/move.
+    card_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # Archive policy: cards untouched for this many days are moved to archived_cards. None = off.
+    auto_archive_days: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
     room: Mapped["Room"] = relationship(back_populates="columns")
-    cards: Mapped[list["Card"]] = relationship(back_populates="column", cascade="all, delete-orphan")
+    cards: Mapped[list["Card"]] = relationship(back_populates="column", cascade="all, delete-orphan", passive_deletes=True)
 
     __table_args__ = (
         Index("idx_columns_room", "room_id"),
@@ -83,9 +115,147 @@ class Card(Base):
     created_by: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=True)
     created_at: Mapped[datetime] = mapped_column(default=utcnow)
     updated_at: Mapped[datetime] = mapped_column(default=utcnow, onupdate=utcnow)
+    # Maintained by Postgres from title + description (title weighted higher) — never written by us.
+    # Deferred so normal card loads don't drag the tsvector over the wire.
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(CARD_SEARCH_VECTOR_SQL, persisted=True),
+        deferred=True,
+    )
 
     column: Mapped["Column"] = relationship(back_populates="cards")
+    # Read-only views of the link tables, for ORM callers; the app writes card_labels/card_assignees directly
+    labels: Mapped[list["Label"]] = relationship(secondary="card_labels", viewonly=True, order_by="Label.id")
+    assignees: Mapped[list["User"]] = relationship(secondary="card_assignees", viewonly=True, order_by="User.id")
+
+    @property
+    def label_ids(self) -> list[uuid.UUID]:
+        return [label.id for label in self.labels]
+
+    @property
+    def assignee_ids(self) -> list[uuid.UUID]:
+        return [user.id for user in self.assignees]
 
     __table_args__ = (
         Index("idx_cards_column", "column_id"),
-    )
\ No newline at end of file
+        Index("idx_cards_search", "search_vector", postgresql_using="gin"),
+        # Trigram index for prefix/typo fallback matching on titles (needs the pg_trgm extension)
+        Index("idx_cards_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+    )
+
+
+class Label(Base):
+    """A room's label (name + colour). Cards are tagged through card_labels."""
+    __tablename__ = "labels"
+
+    id: Mapped[uuid.UUID] = mapped_column(default=uuid.uuid4, primary_key=True)
+    room_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("rooms.id", ondelete="CASCADE"))
+    name: Mapped[str] = mapped_column(String(50), nullable=False)
+    color: Mapped[str] = mapped_column(String(7), nullable=False, default="#6b7280", server_default="#6b7280")
+
+    room: Mapped["Room"] = relationship(back_populates="labels")
+
+    __table_args__ = (
+        # One label per name per room; also serves "labels of this room"
+        UniqueConstraint("room_id", "name", name="uq_label_room_name"),
+    )
+
+
+class CardLabel(Base):
+    __tablename__ = "card_labels"
+
+    # PK (card_id, label_id) answers "labels of these cards"; the reverse index answers
+    # "cards with this label" — the filtered board view — as an index-only scan
+    card_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("cards.id", ondelete="CASCADE"), primary_key=True)
+    label_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("labels.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (
+        Index("idx_card_labels_label", "label_id", "card_id"),
+    )
+
+
+class CardAssignee(Base):
+    __tablename__ = "card_assignees"
+
+    # Same shape as card_labels: PK for a card's assignees, reverse index for "cards assigned to X"
+    card_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("cards.id", ondelete="CASCADE"), primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (
+        Index("idx_card_assignees_user", "user_id", "card_id"),
+    )
+
+
+class ArchivedCard(Base):
+    """
+    Cold storage for archived cards. Same shape as `cards` plus archive metadata, but kept
+    out of the hot table so board loads, search and position reindexing never see them.
+    Keyed by the original card id so a restore puts the card back under the same id.
+    """
+    __tablename__ = "archived_cards"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    room_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("rooms.id", ondelete="CASCADE"))
+    # Column it was archived from — used as the default restore target if it still exists
+    column_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("columns.id", ondelete="SET NULL"), nullable=True)
+    title: Mapped[str] = mapped_column(String(300), nullable=False)
+    description: Mapped[str] = mapped_column(Text, default="")
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_by: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(default=utcnow)
+    archived_by: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    # The card's tags when it was archived (link rows cascade away with the card); re-linked on restore
+    label_ids: Mapped[list] = mapped_column(JSON().with_variant(JSONB, "postgresql"), default=list, server_default="[]")
+    assignee_ids: Mapped[list] = mapped_column(JSON().with_variant(JSONB, "postgresql"), default=list, server_default="[]")
+
+    __table_args__ = (
+        Index("idx_archived_cards_room", "room_id", "archived_at", "id"),
+    )
+
+
+class Activity(Base):
+    """
+    Append-only card history (who created/moved/edited/deleted what).
+    Rows are written in batches by app.activity.writer, never inside request transactions.
+    The table is range-partitioned by month on created_at, so retention is a cheap
+    DROP of an old partition instead of a huge DELETE. No foreign keys on purpose —
+    history must outlive the cards and users it mentions.
+    """
+    __tablename__ = "activity_log"
+
+    # Postgres requires the partition key to be part of the primary key
+    id: Mapped[uuid.UUID] = mapped_column(default=uuid.uuid4, primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(default=utcnow, primary_key=True)
+    room_id: Mapped[uuid.UUID] = mapped_column(nullable=False)
+    card_id: Mapped[Optional[uuid.UUID]] = mapped_column(nullable=True)
+    user_id: Mapped[Optional[uuid.UUID]] = mapped_column(nullable=True)
+    action: Mapped[str] = mapped_column(String(32), nullable=False)
+    details: Mapped[dict] = mapped_column(JSON().with_variant(JSONB, "postgresql"), default=dict)
+
+    __table_args__ = (
+        Index("idx_activity_room_created", "room_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+
+class RecentOp(Base):
+    """
+    Idempotency keys of recent card mutations, so a client retrying after a dropped
+    socket or timed-out request gets the original result instead of a duplicate.
+    Written in the same transaction as the mutation; rows older than the TTL are
+    pruned in the background, which keeps the table small.
+    """
+    __tablename__ = "recent_ops"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    action: Mapped[str] = mapped_column(String(32), nullable=False)
+    # No FK — the card may be deleted or archived later and the key should still dedupe
+    card_id: Mapped[Optional[uuid.UUID]] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=utcnow)
+
+    __table_args__ = (
+        Index("idx_recent_ops_created", "created_at"),
+    )
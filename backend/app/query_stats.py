@@ -0,0 +1,118 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+logger = logging.getLogger("syncboard.queries")
+
+
+class QueryStats:
+    """Statements and DB time for one unit of work (an HTTP request or one WebSocket message)."""
+
+    __slots__ = ("count", "db_ms", "statements")
+
+    def __init__(self, keep_statements: bool):
+        self.count = 0
+        self.db_ms = 0.0
+        # SQL text → times executed; only kept in debug mode, for N+1 detection
+        self.statements: Counter | None = Counter() if keep_statements else None
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        if self.statements is None:
+            return []
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+# The unit of work the current thread/task is executing on behalf of. Sync routes run in
+# the threadpool with a copy of the request's context, so they see the same QueryStats.
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = conn.info.get("query_started")
+    if stats is None or not started:
+        return
+    stats.count += 1
+    stats.db_ms += (time.perf_counter() - started.pop()) * 1000
+    if stats.statements is not None:
+        stats.statements[statement] += 1
+
+
+class QueryRegistry:
+    """
+    Per-endpoint / per-message-type totals of statement counts and DB time.
+    Counting hooks into SQLAlchemy's cursor events for every engine (primary and replica),
+    so ORM changes that quietly add queries show up here — and in the test budgets.
+    In debug mode, identical statements repeated within one unit of work are logged as
+    suspected N+1s.
+    """
+
+    def __init__(self, enabled: bool, debug: bool, repeat_threshold: int):
+        self.enabled = enabled
+        self.debug = debug
+        self.repeat_threshold = repeat_threshold
+        self.by_label: dict[str, dict] = {}
+        # (label, sql, times) for every suspected N+1 seen since the last reset
+        self.suspects: list[tuple[str, str, int]] = []
+
+    def begin(self) -> tuple[QueryStats | None, object]:
+        if not self.enabled:
+            return None, None
+        stats = QueryStats(keep_statements=self.debug)
+        return stats, _current.set(stats)
+
+    def finish(self, label: str, stats: QueryStats | None, token):
+        if stats is None:
+            return
+        _current.reset(token)
+        agg = self.by_label.setdefault(label, {"calls": 0, "queries": 0, "max_queries": 0, "db_ms": 0.0})
+        agg["calls"] += 1
+        agg["queries"] += stats.count
+        agg["max_queries"] = max(agg["max_queries"], stats.count)
+        agg["db_ms"] += stats.db_ms
+        for sql, n in stats.repeated(self.repeat_threshold):
+            self.suspects.append((label, sql, n))
+            logger.warning("Suspected N+1 in %s: statement ran %d times: %s", label, n, " ".join(sql.split())[:300])
+
+    @contextmanager
+    def track(self, label: str):
+        stats, token = self.begin()
+        try:
+            yield stats
+        finally:
+            self.finish(label, stats, token)
+
+    def snapshot(self) -> dict:
+        return {
+            label: {
+                **agg,
+                "db_ms": round(agg["db_ms"], 2),
+                "mean_queries": round(agg["queries"] / agg["calls"], 2),
+            }
+            for label, agg in sorted(self.by_label.items())
+        }
+
+    def reset(self):
+        self.by_label.clear()
+        self.suspects.clear()
+
+
+# Shared instance, same pattern as the WebSocket `manager`
+query_stats = QueryRegistry(
+    enabled=settings.query_stats_enabled,
+    debug=settings.query_debug,
+    repeat_threshold=settings.query_repeat_threshold,
+)
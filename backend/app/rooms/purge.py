@@ -0,0 +1,128 @@
+import asyncio
+import time
+import uuid
+from collections import deque
+from sqlalchemy import select, delete
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Room, RoomMember, Column, Card, ArchivedCard, utcnow
+
+
+class RoomPurger:
+    """
+    Physically removes soft-deleted rooms in the background.
+    Live and archived cards (the only tables that can be huge) are deleted in bounded batches, each in its
+    own short transaction, so no single statement holds locks for long or blows up the
+    request that asked for the delete. Memberships go the same way, and the final
+    DELETE of the room row lets the database's ON DELETE CASCADE sweep the few
+    remaining columns. Progress per room is kept in memory for the status endpoint.
+    """
+
+    def __init__(self, batch_size: int, pause: float):
+        self.batch_size = batch_size
+        self.pause = pause
+        # Thread-safe enough for append/popleft — delete_room runs in FastAPI's threadpool
+        self.pending: deque[uuid.UUID] = deque()
+        self.progress: dict[uuid.UUID, dict] = {}
+        self._task: asyncio.Task | None = None
+
+    def enqueue(self, room_id: uuid.UUID, requested_by: uuid.UUID | None = None):
+        if room_id in self.progress and self.progress[room_id]["status"] in ("queued", "running"):
+            return
+        self.progress[room_id] = {
+            "room_id": room_id,
+            "requested_by": requested_by,
+            "status": "queued",
+            "cards_deleted": 0,
+            "members_deleted": 0,
+            "started_at": None,
+            "finished_at": None,
+        }
+        self.pending.append(room_id)
+
+    def _delete_batch(self, db: Session, stmt) -> int:
+        deleted = db.execute(stmt, execution_options={"synchronize_session": False}).rowcount
+        db.commit()
+        return deleted
+
+    def purge(self, room_id: uuid.UUID):
+        """Blocking — run it off the event loop."""
+        state = self.progress[room_id]
+        state["status"] = "running"
+        state["started_at"] = utcnow()
+        room_cards = (
+            select(Card.id)
+            .join(Column, Card.column_id == Column.id)
+            .where(Column.room_id == room_id)
+            .limit(self.batch_size)
+        )
+        room_archive = select(ArchivedCard.id).where(ArchivedCard.room_id == room_id).limit(self.batch_size)
+        room_members = select(RoomMember.id).where(RoomMember.room_id == room_id).limit(self.batch_size)
+        try:
+            with SessionLocal(info={"op_class": "bulk"}) as db:
+                while deleted := self._delete_batch(db, delete(Card).where(Card.id.in_(room_cards))):
+                    state["cards_deleted"] += deleted
+                    self._sleep()
+                while deleted := self._delete_batch(db, delete(ArchivedCard).where(ArchivedCard.id.in_(room_archive))):
+                    state["cards_deleted"] += deleted
+                    self._sleep()
+                while deleted := self._delete_batch(db, delete(RoomMember).where(RoomMember.id.in_(room_members))):
+                    state["members_deleted"] += deleted
+                    self._sleep()
+                # Only empty columns are left — one cascading DELETE finishes the job
+                self._delete_batch(db, delete(Room).where(Room.id == room_id))
+            state["status"] = "done"
+        except Exception:
+            state["status"] = "failed"
+            raise
+        finally:
+            state["finished_at"] = utcnow()
+
+    def _sleep(self):
+        # Give other transactions a turn at the locks between batches
+        if self.pause:
+            time.sleep(self.pause)
+
+    def resume_unfinished(self):
+        """Re-queue rooms soft-deleted before a restart whose purge never finished."""
+        with SessionLocal(info={"op_class": "bulk"}) as db:
+            for room_id, created_by in db.execute(
+                select(Room.id, Room.created_by).where(Room.deleted_at.is_not(None))
+            ):
+                self.enqueue(room_id, created_by)
+
+    async def run(self):
+        try:
+            await asyncio.to_thread(self.resume_unfinished)
+        except Exception:
+            pass  # DB not reachable yet — rooms are picked up again on the next restart
+        while True:
+            while self.pending:
+                room_id = self.pending.popleft()
+                try:
+                    await asyncio.to_thread(self.purge, room_id)
+                except Exception:
+                    pass  # Marked failed; the soft-deleted room is retried on next restart
+            await asyncio.sleep(1.0)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Shared instance, same pattern as the WebSocket `manager`
+room_purger = RoomPurger(
+    batch_size=settings.room_purge_batch_size,
+    pause=settings.room_purge_pause_seconds,
+)
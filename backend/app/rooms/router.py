@@ -1,17 +1,40 @@
 import uuid
 import string
 import random
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from sqlalchemy import select, and_, true
+from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.auth.dependencies import get_current_user
-from app.models import User, Room, RoomMember, Column
+from app.auth.dependencies import get_current_user, get_current_reader, get_read_db
+from app.models import User, Room, RoomMember, Column, Card, Label, utcnow
+from app.rooms.purge import room_purger
+from app.columns.service import COLUMN_POSITION_GAP
+from app.ws.manager import manager
+from app.ws.heartbeat import heartbeats
+from app.ws.dashboard import dashboard
+from app.ws.tickets import issue_ticket, deny_list
+from app.config import settings
+from app.rooms.summary import query_summaries
+from app.labels.service import card_filter, card_tags, room_card_ids
+from app.serialization import (
+    json_response,
+    room_serializer,
+    room_detail_serializer,
+    column_serializer,
+    card_serializer,
+    label_serializer,
+    board_payload,
+)
 from app.schemas import (
     CreateRoomRequest,
     JoinRoomRequest,
     RoomResponse,
     RoomDetailResponse,
+    RoomPurgeStatus,
+    RoomSettingsRequest,
+    RoomSummary,
+    WsTicketResponse,
 )
 
 router = APIRouter(prefix="/api/rooms", tags=["rooms"])
@@ -41,6 +64,7 @@ def generate_room_code(db: Session) -> str:
 @router.post("", response_model=RoomResponse, status_code=status.HTTP_201_CREATED)
 def create_room(
     body: CreateRoomRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -54,17 +78,19 @@ def create_room(
     db.add(room)
     db.flush()  # Flush to get room.id without committing — we need it for columns and membership
 
-    # Auto-create the 3 default columns
+    # Auto-create the 3 default columns, spaced out so later reorders only touch one row
     for i, title in enumerate(DEFAULT_COLUMNS):
-        col = Column(room_id=room.id, title=title, position=i)
+        col = Column(room_id=room.id, title=title, position=i * COLUMN_POSITION_GAP)
         db.add(col)
 
     # Add creator as a room member automatically
     membership = RoomMember(room_id=room.id, user_id=current_user.id)
     db.add(membership)
 
+    user_id = str(current_user.id)  # Read before commit expires it, or it costs a reload
     db.commit()
     db.refresh(room)
+    background_tasks.add_task(dashboard.watch, user_id, str(room.id))
     return room
 
 
@@ -72,18 +98,33 @@ def create_room(
 
 @router.get("", response_model=list[RoomResponse])
 def list_rooms(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader),
 ):
-    # Join through room_members to find all rooms this user belongs to
-    rooms = (
-        db.query(Room)
+    # Join through room_members to find all rooms this user belongs to.
+    # Selects only the response's columns and dumps the rows directly (see app.serialization).
+    rows = db.execute(
+        select(*room_serializer.columns)
         .join(RoomMember, Room.id == RoomMember.room_id)
-        .filter(RoomMember.user_id == current_user.id)
+        .where(RoomMember.user_id == current_user.id, Room.deleted_at.is_(None))
         .order_by(Room.created_at.desc())
-        .all()
     )
-    return rooms
+    return json_response([room_serializer.from_row(row) for row in rows])
+
+
+# ---------- Dashboard Summary ----------
+# Declared before /{room_id} so "summary" isn't parsed as a room id
+
+@router.get("/summary", response_model=list[RoomSummary])
+def rooms_summary(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader),
+):
+    """
+    Every room of the user with per-column card counts, last activity and online count,
+    from one aggregate query. Open /ws/user afterwards to receive changes as they happen.
+    """
+    return query_summaries(db, user_id=current_user.id)
 
 
 # ---------- Get Room Detail (Full Board State) ----------
@@ -91,8 +132,10 @@ def list_rooms(
 @router.get("/{room_id}", response_model=RoomDetailResponse)
 def get_room(
     room_id: uuid.UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    label: list[uuid.UUID] | None = Query(None, description="only cards with any of these labels"),
+    assignee: list[uuid.UUID] | None = Query(None, description="only cards assigned to any of these users"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader),
 ):
     # Verify membership first
     member = (
@@ -103,27 +146,27 @@ def get_room(
     if not member:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this room")
 
-    # Eager-load columns and their cards in one query to avoid N+1 problem.
-    # Without joinedload, accessing room.columns would trigger a separate query,
-    # and then each column.cards would trigger yet another — that's N+1.
-    room = (
-        db.query(Room)
-        .options(
-            joinedload(Room.columns).joinedload(Column.cards)
-        )
-        .filter(Room.id == room_id)
-        .first()
-    )
-    if not room:
+    # The whole board in one query (no N+1): room ⟕ columns ⟕ cards, already in board order.
+    # Only the response's columns are selected and the flat rows are nested straight into the
+    # RoomDetailResponse shape — no ORM identity map, no response_model validation pass.
+    # Filters go into the cards' join condition, so columns without matching cards still show.
+    filters = card_filter(label, assignee)
+    rows = db.execute(
+        select(*room_detail_serializer.columns, *column_serializer.columns, *card_serializer.columns)
+        .select_from(Room)
+        .outerjoin(Column, Column.room_id == Room.id)
+        .outerjoin(Card, (Card.column_id == Column.id) & and_(true(), *filters))
+        .where(Room.id == room_id, Room.deleted_at.is_(None))
+        .order_by(Column.position, Column.id, Card.position)
+    ).all()
+    if not rows:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room not found")
-
-    # Sort columns and cards by position before returning.
-    # SQLAlchemy loads them in arbitrary order, so we sort in Python.
-    room.columns.sort(key=lambda c: c.position)
-    for col in room.columns:
-        col.cards.sort(key=lambda card: card.position)
-
-    return room
+    # Labels and assignees of the listed cards (one UNION ALL query), and the room's label set
+    tags = card_tags(db, room_card_ids(room_id, *filters))
+    labels = [label_serializer.from_row(row) for row in db.execute(
+        select(*label_serializer.columns).where(Label.room_id == room_id).order_by(Label.name)
+    )]
+    return json_response(board_payload(rows, tags, labels))
 
 
 # ---------- Join Room ----------
@@ -131,10 +174,11 @@ def get_room(
 @router.post("/join", response_model=RoomResponse)
 def join_room(
     body: JoinRoomRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    room = db.query(Room).filter(Room.room_code == body.room_code).first()
+    room = db.query(Room).filter(Room.room_code == body.room_code, Room.deleted_at.is_(None)).first()
     if not room:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invalid room code")
 
@@ -149,8 +193,63 @@ def join_room(
 
     membership = RoomMember(room_id=room.id, user_id=current_user.id)
     db.add(membership)
+    # Build the response and read the ids before commit expires both objects (no reload SELECTs)
+    payload = room_serializer.from_object(room)
+    user_id = str(current_user.id)
     db.commit()
-    return room
+    background_tasks.add_task(dashboard.watch, user_id, str(payload["id"]))
+    return json_response(payload)
+
+
+# ---------- WebSocket Connect Ticket ----------
+
+@router.post("/{room_id}/ws-ticket", response_model=WsTicketResponse)
+def create_ws_ticket(
+    room_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Short-lived signed ticket for /ws/{room_id}?ticket=... Membership is checked here,
+    so the handshake itself needs no database queries, and the long-lived access token
+    never ends up in a WebSocket URL (or the access logs that record it).
+    """
+    ws_compression = db.query(Room.ws_compression).join(RoomMember, RoomMember.room_id == Room.id).filter(
+        Room.id == room_id,
+        Room.deleted_at.is_(None),
+        RoomMember.user_id == current_user.id,
+    ).scalar()
+    if ws_compression is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this room")
+
+    ticket = issue_ticket(str(current_user.id), current_user.display_name, str(room_id), ws_compression)
+    return WsTicketResponse(ticket=ticket, expires_in=settings.ws_ticket_ttl_seconds)
+
+
+# ---------- Room Settings ----------
+
+@router.patch("/{room_id}/settings", response_model=RoomSettingsRequest)
+def update_room_settings(
+    room_id: uuid.UUID,
+    body: RoomSettingsRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    room = db.query(Room).filter(Room.id == room_id, Room.deleted_at.is_(None)).first()
+    if not room:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room not found")
+
+    # Only the room creator can change room settings
+    if room.created_by != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only the room creator can change settings")
+
+    if body.ws_compression is not None:
+        room.ws_compression = body.ws_compression
+    ws_compression = room.ws_compression
+    db.commit()
+    # Takes effect for live sockets right away, not just on the next connect
+    manager.set_compression(str(room_id), ws_compression)
+    return RoomSettingsRequest(ws_compression=ws_compression)
 
 
 # ---------- Delete Room ----------
@@ -158,10 +257,11 @@ def join_room(
 @router.delete("/{room_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_room(
     room_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    room = db.query(Room).filter(Room.id == room_id).first()
+    room = db.query(Room).filter(Room.id == room_id, Room.deleted_at.is_(None)).first()
     if not room:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room not found")
 
@@ -169,6 +269,28 @@ def delete_room(
     if room.created_by != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only the room creator can delete this room")
 
-    db.delete(room)
+    # Soft-delete now so the room vanishes from every read immediately; the rows themselves
+    # are purged in small batches by the background job instead of one giant ORM cascade here.
+    room.deleted_at = utcnow()
     db.commit()
-    # No return body for 204
\ No newline at end of file
+    room_purger.enqueue(room.id, current_user.id)
+    # Tickets already issued for this room must not get anyone back in
+    deny_list.revoke(str(room.id))
+    # Kick everyone off the board once the response is out
+    background_tasks.add_task(manager.close_room, str(room.id))
+    heartbeats.forget_room(str(room.id))
+    # No return body for 204
+
+
+# ---------- Room Purge Progress ----------
+
+@router.get("/{room_id}/purge", response_model=RoomPurgeStatus)
+def get_purge_status(
+    room_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+):
+    """Progress of the background purge for a room the caller deleted."""
+    state = room_purger.progress.get(room_id)
+    if not state or state["requested_by"] != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No purge in progress for this room")
+    return state
\ No newline at end of file
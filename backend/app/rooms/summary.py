@@ -0,0 +1,70 @@
+import uuid
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from app.models import Room, RoomMember, Column, Card, Activity
+from app.ws.manager import manager
+
+
+def query_summaries(db: Session, user_id=None, room_ids=None) -> list[dict]:
+    """
+    Dashboard summaries — per-column card counts and last activity for many rooms in ONE query:
+    rooms ⟕ columns (card_count is denormalised, so no card scan). Last activity is the later of
+    two correlated MAXes: cards.updated_at, written in the same transaction as the change, and
+    activity_log (idx_activity_room_created), which also covers deletes and column changes but
+    is written behind by up to one flush interval.
+    Filter by a member (`user_id`) and/or a set of rooms. Online counts come from the
+    connection registry, not the database.
+    """
+    last_activity = (
+        select(func.max(Activity.created_at))
+        .where(Activity.room_id == Room.id)
+        .correlate(Room)
+        .scalar_subquery()
+    )
+    last_card_write = (
+        select(func.max(Card.updated_at))
+        .join(Column, Card.column_id == Column.id)
+        .where(Column.room_id == Room.id)
+        .correlate(Room)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(
+            Room.id, Room.name, Room.room_code, Room.created_by, Room.created_at,
+            last_activity.label("last_activity_at"), last_card_write.label("last_card_write_at"),
+            Column.id.label("column_id"), Column.title, Column.card_count,
+        )
+        .outerjoin(Column, Column.room_id == Room.id)
+        .where(Room.deleted_at.is_(None))
+        .order_by(Room.created_at.desc(), Room.id, Column.position)
+    )
+    if user_id is not None:
+        stmt = stmt.join(RoomMember, RoomMember.room_id == Room.id).where(RoomMember.user_id == user_id)
+    if room_ids is not None:
+        stmt = stmt.where(Room.id.in_([uuid.UUID(str(r)) for r in room_ids]))
+
+    summaries: dict[uuid.UUID, dict] = {}
+    for row in db.execute(stmt):
+        summary = summaries.get(row.id)
+        if summary is None:
+            summary = summaries[row.id] = {
+                "id": row.id,
+                "name": row.name,
+                "room_code": row.room_code,
+                "created_by": row.created_by,
+                "created_at": row.created_at,
+                "last_activity_at": max(t for t in (row.last_activity_at, row.last_card_write_at, row.created_at) if t),
+                "card_count": 0,
+                "online": online_count(str(row.id)),
+                "columns": [],
+            }
+        if row.column_id is not None:
+            summary["columns"].append({"id": row.column_id, "title": row.title, "card_count": row.card_count})
+            summary["card_count"] += row.card_count
+    return list(summaries.values())
+
+
+def online_count(room_id: str) -> int:
+    """Distinct users with a live socket in the room (a user with two tabs counts once)."""
+    return len({u["id"] for u in manager.get_users(room_id)})
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, EmailStr
+from typing import Any, Literal, Optional
+from pydantic import BaseModel, EmailStr, Field
 
 
 # ---------- Auth ----------
@@ -37,6 +37,8 @@ class UserResponse(BaseModel):
 # ---------- Cards ----------
 
 class CreateCardRequest(BaseModel):
+    # Optional client-generated id, so optimistic UIs can use the real id right away
+    id: Optional[uuid.UUID] = None
     column_id: uuid.UUID
     title: str
     description: str = ""
@@ -64,12 +66,106 @@ class CardResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class CardSearchHit(CardResponse):
+    # ts_rank_cd for full-text hits, trigram similarity (0-1) for fallback hits
+    rank: float
+
+
+class CardSearchResponse(BaseModel):
+    items: list[CardSearchHit]
+    # Opaque keyset cursor — pass it back as ?cursor= to get the next page. None means no more results.
+    next_cursor: Optional[str] = None
+
+
+class BoardCardResponse(CardResponse):
+    # Card as listed on a board (GET room) or restored from the archive, with its tags
+    label_ids: list[uuid.UUID] = []
+    assignee_ids: list[uuid.UUID] = []
+
+
+# ---------- Archive ----------
+
+class ArchiveCardsRequest(BaseModel):
+    # Either specific cards, or a whole column — optionally only cards untouched for N days
+    card_ids: Optional[list[uuid.UUID]] = None
+    column_id: Optional[uuid.UUID] = None
+    older_than_days: Optional[int] = Field(default=None, ge=1)
+
+
+class ArchiveResult(BaseModel):
+    archived: int
+    card_ids: list[uuid.UUID]
+
+
+class RestoreCardsRequest(BaseModel):
+    card_ids: list[uuid.UUID]
+    # Restore target; defaults to the column each card was archived from
+    column_id: Optional[uuid.UUID] = None
+
+
+class RestoreResult(BaseModel):
+    restored: list[BoardCardResponse]
+
+
+class ArchivedCardResponse(BaseModel):
+    id: uuid.UUID
+    column_id: Optional[uuid.UUID] = None
+    title: str
+    description: str
+    created_by: Optional[uuid.UUID] = None
+    created_at: datetime
+    updated_at: datetime
+    archived_at: datetime
+    archived_by: Optional[uuid.UUID] = None
+    # Tags as they were at archive time
+    label_ids: list[uuid.UUID] = []
+    assignee_ids: list[uuid.UUID] = []
+
+    model_config = {"from_attributes": True}
+
+
+class ArchivedCardPage(BaseModel):
+    items: list[ArchivedCardResponse]
+    next_cursor: Optional[str] = None
+
+
+class ArchivePolicyRequest(BaseModel):
+    auto_archive_days: Optional[int] = Field(default=None, ge=1)
+
+
 # ---------- Columns ----------
 
+class CreateColumnRequest(BaseModel):
+    title: str = Field(min_length=1, max_length=100)
+
+
+class UpdateColumnRequest(BaseModel):
+    # Same PATCH semantics as cards — send only what changed
+    title: Optional[str] = Field(default=None, min_length=1, max_length=100)
+    to_index: Optional[int] = Field(default=None, ge=0)  # 0-based slot among the room's columns
+
+
+class MoveColumnCardsRequest(BaseModel):
+    to_column_id: uuid.UUID
+
+
+class SortColumnRequest(BaseModel):
+    by: Literal["title", "created_at"]
+    descending: bool = False
+
+
+class ColumnCardsResult(BaseModel):
+    # How many cards the column-wide operation touched
+    count: int
+
+
 class ColumnResponse(BaseModel):
     id: uuid.UUID
     title: str
     position: int
+    # Lets the client show column sizes without counting (or even loading) the cards
+    card_count: int = 0
+    auto_archive_days: Optional[int] = None
     # Nested cards — when we return a column, we include its cards sorted by position.
     # This avoids the client needing a separate request per column.
     cards: list[CardResponse] = []
@@ -77,6 +173,47 @@ class ColumnResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+# ---------- Labels & Assignees ----------
+
+class CreateLabelRequest(BaseModel):
+    name: str = Field(min_length=1, max_length=50)
+    color: str = Field(default="#6b7280", pattern=r"^#[0-9a-fA-F]{6}$")
+
+
+class UpdateLabelRequest(BaseModel):
+    name: Optional[str] = Field(default=None, min_length=1, max_length=50)
+    color: Optional[str] = Field(default=None, pattern=r"^#[0-9a-fA-F]{6}$")
+
+
+class LabelResponse(BaseModel):
+    id: uuid.UUID
+    name: str
+    color: str
+
+    model_config = {"from_attributes": True}
+
+
+class SetCardLabelsRequest(BaseModel):
+    # Replaces the card's labels; [] clears them
+    label_ids: list[uuid.UUID]
+
+
+class SetCardAssigneesRequest(BaseModel):
+    # Replaces the card's assignees (room members only); [] clears them
+    user_ids: list[uuid.UUID]
+
+
+class CardTags(BaseModel):
+    card_id: uuid.UUID
+    label_ids: list[uuid.UUID]
+    assignee_ids: list[uuid.UUID]
+
+
+class BoardColumnResponse(ColumnResponse):
+    # With ?label= / ?assignee= filters only the matching cards are listed; card_count stays the column total
+    cards: list[BoardCardResponse] = []
+
+
 # ---------- Rooms ----------
 
 class CreateRoomRequest(BaseModel):
@@ -106,7 +243,68 @@ class RoomDetailResponse(BaseModel):
     room_code: str
     created_by: uuid.UUID
     created_at: datetime
-    columns: list[ColumnResponse] = []
+    ws_compression: bool = True
+    labels: list[LabelResponse] = []
+    columns: list[BoardColumnResponse] = []
 
     model_config = {"from_attributes": True}
 
+
+class ColumnSummary(BaseModel):
+    id: uuid.UUID
+    title: str
+    card_count: int
+
+
+class RoomSummary(BaseModel):
+    """Dashboard tile: room metadata plus live counts, without loading any cards."""
+    id: uuid.UUID
+    name: str
+    room_code: str
+    created_by: uuid.UUID
+    created_at: datetime
+    last_activity_at: datetime
+    card_count: int
+    online: int  # distinct users with the board open right now
+    columns: list[ColumnSummary] = []
+
+
+class WsTicketResponse(BaseModel):
+    # Pass as /ws/{room_id}?ticket=... — short-lived, so connect right away
+    ticket: str
+    expires_in: int
+
+
+class RoomSettingsRequest(BaseModel):
+    ws_compression: Optional[bool] = None
+
+
+class RoomPurgeStatus(BaseModel):
+    """Progress of the background purge that follows DELETE /api/rooms/{room_id}."""
+    room_id: uuid.UUID
+    status: str  # queued | running | done | failed
+    cards_deleted: int
+    members_deleted: int
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+
+# ---------- Activity ----------
+
+class ActivityResponse(BaseModel):
+    id: uuid.UUID
+    room_id: uuid.UUID
+    card_id: Optional[uuid.UUID] = None
+    user_id: Optional[uuid.UUID] = None
+    action: str
+    details: dict[str, Any] = {}
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class ActivityPage(BaseModel):
+    items: list[ActivityResponse]
+    # Pass back as ?cursor= for the next (older) page. None means you've reached the start.
+    next_cursor: Optional[str] = None
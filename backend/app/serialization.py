@@ -0,0 +1,92 @@
+import operator
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.models import Room, Column, Card, Label
+from app.schemas import CardResponse, ColumnResponse, RoomResponse, RoomDetailResponse, LabelResponse
+
+# orjson emits UUIDs and datetimes natively; UTC_Z matches pydantic's "...Z" for UTC timestamps
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONResponse(JSONResponse):
+    """App-wide default response class: orjson instead of the stdlib encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def json_response(content: Any, status_code: int = 200) -> FastJSONResponse:
+    """
+    Return this from a route to skip the response_model pass entirely — for payloads the
+    route already built from rows with a RowSerializer. Keep `response_model=` on the
+    route anyway: it still documents the contract in OpenAPI.
+    """
+    return FastJSONResponse(content, status_code=status_code)
+
+
+class RowSerializer:
+    """
+    Serializer compiled once from a response schema: the schema's scalar fields become a fixed
+    tuple of keys plus the matching model columns, so a Core row (or an ORM object) maps straight
+    to a dict orjson can dump — no per-request validation pass. Built at import, so a schema field
+    the model lacks fails at startup instead of drifting silently (bench.serialization checks
+    the output against the schema itself).
+    """
+
+    def __init__(self, schema: type[BaseModel], model, exclude: tuple[str, ...] = ()):
+        self.schema = schema
+        self.fields = tuple(name for name in schema.model_fields if name not in exclude)
+        self.columns = tuple(getattr(model, name) for name in self.fields)
+        self._get = operator.attrgetter(*self.fields)
+
+    def from_row(self, row) -> dict:
+        """`row` holds exactly `self.columns`, in order (e.g. a slice of a Core result row)."""
+        return dict(zip(self.fields, row))
+
+    def from_object(self, obj) -> dict:
+        return dict(zip(self.fields, self._get(obj)))
+
+
+card_serializer = RowSerializer(CardResponse, Card)
+column_serializer = RowSerializer(ColumnResponse, Column, exclude=("cards",))
+room_serializer = RowSerializer(RoomResponse, Room)
+room_detail_serializer = RowSerializer(RoomDetailResponse, Room, exclude=("columns", "labels"))
+label_serializer = RowSerializer(LabelResponse, Label)
+
+
+def board_payload(rows, tags: dict, labels: list[dict]) -> dict | None:
+    """
+    Nest one flat room ⟕ columns ⟕ cards result (see rooms.router.get_room) into the
+    RoomDetailResponse shape. Rows must be ordered by column position, then card position.
+    `tags` maps card id → {"label_ids", "assignee_ids"} (see labels.service.card_tags).
+    """
+    no_tags = {"label_ids": [], "assignee_ids": []}
+    rooms, columns, cards = (
+        len(room_detail_serializer.columns),
+        len(column_serializer.columns),
+        len(card_serializer.columns),
+    )
+    board = None
+    column = None
+    for row in rows:
+        if board is None:
+            board = room_detail_serializer.from_row(row[:rooms])
+            board["labels"] = labels
+            board["columns"] = []
+        column_row = row[rooms:rooms + columns]
+        if column_row[0] is None:
+            continue  # Room without columns
+        if column is None or column["id"] != column_row[0]:
+            column = column_serializer.from_row(column_row)
+            column["cards"] = []
+            board["columns"].append(column)
+        card_row = row[rooms + columns:rooms + columns + cards]
+        if card_row[0] is not None:
+            card = card_serializer.from_row(card_row)
+            card.update(tags.get(card["id"], no_tags))
+            column["cards"].append(card)
+    return board
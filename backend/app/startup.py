@@ -0,0 +1,99 @@
+import asyncio
+import re
+from pathlib import Path
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import engine
+
+# backend/alembic/versions — shipped in the image alongside the app
+VERSIONS_DIR = Path(__file__).resolve().parent.parent / "alembic" / "versions"
+_REVISION = re.compile(r"^revision(?::\s*str)?\s*=\s*['\"]([0-9a-f]+)['\"]", re.M)
+_DOWN_REVISION = re.compile(r"^down_revision(?::[^=]+)?=\s*['\"]([0-9a-f]+)['\"]", re.M)
+
+
+def expected_head() -> str | None:
+    """
+    The newest migration revision, found by reading the migration files as text —
+    no Alembic import and no executing migration modules, so it costs about a millisecond.
+    """
+    revisions, parents = set(), set()
+    for path in VERSIONS_DIR.glob("*.py"):
+        source = path.read_text()
+        if match := _REVISION.search(source):
+            revisions.add(match[1])
+        if match := _DOWN_REVISION.search(source):
+            parents.add(match[1])
+    heads = revisions - parents
+    return heads.pop() if len(heads) == 1 else None
+
+
+def current_revision() -> str | None:
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+class Readiness:
+    """
+    What /api/ready reports. Serving starts immediately; the schema check runs in the
+    background and the instance only reports ready once the database is reachable and
+    at the migration head. With SCHEMA_CHECK=migrate the check runs the migrations
+    itself (the old boot behaviour, handy locally); with SCHEMA_CHECK=skip it trusts
+    the database.
+    """
+
+    def __init__(self, mode: str, retry_seconds: float):
+        self.mode = mode
+        self.retry_seconds = retry_seconds
+        self.schema_ok = False
+        self.detail = "starting"
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.schema_ok
+
+    def check(self) -> bool:
+        """Blocking — run it off the event loop."""
+        if self.mode == "skip":
+            self.schema_ok, self.detail = True, "schema check skipped"
+            return True
+        if self.mode == "migrate":
+            from app.migrate import upgrade  # Alembic is only imported in this mode
+            upgrade()
+        expected = expected_head()
+        try:
+            current = current_revision()
+        except Exception as exc:
+            self.detail = f"database unavailable: {type(exc).__name__}"
+            return False
+        if expected is not None and current != expected:
+            self.detail = f"schema at {current}, expected {expected} — run `python -m app.migrate`"
+            return False
+        self.schema_ok, self.detail = True, f"schema at {current}"
+        return True
+
+    async def run(self):
+        while True:
+            try:
+                if await asyncio.to_thread(self.check):
+                    return
+            except Exception as exc:
+                self.detail = f"schema check failed: {exc}"
+            await asyncio.sleep(self.retry_seconds)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+readiness = Readiness(mode=settings.schema_check, retry_seconds=settings.schema_check_retry_seconds)
@@ -0,0 +1,98 @@
+import random
+import threading
+from collections import defaultdict
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeout
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal, ReadSessionLocal
+
+# Operation class → (statement_timeout, lock_timeout) in ms; 0 disables that limit (Postgres semantics)
+OP_TIMEOUTS = {
+    "read": (settings.db_read_statement_timeout_ms, settings.db_read_lock_timeout_ms),
+    "mutation": (settings.db_mutation_statement_timeout_ms, settings.db_mutation_lock_timeout_ms),
+    "bulk": (settings.db_bulk_statement_timeout_ms, settings.db_bulk_lock_timeout_ms),
+}
+
+# SQLSTATEs Postgres raises when a limit fires
+SQLSTATE_REASONS = {"57014": "statement_timeout", "55P03": "lock_timeout"}
+
+
+def _set_timeouts(connection, op_class: str):
+    """
+    SET LOCAL both limits for the current transaction — they reset at COMMIT/ROLLBACK, so a
+    pooled connection never carries them into someone else's request. Runs straight on the
+    DBAPI cursor: it's session plumbing, not application SQL, and stays out of query budgets.
+    """
+    if connection.dialect.name != "postgresql":
+        return  # SQLite has no per-statement timeouts
+    statement_ms, lock_ms = OP_TIMEOUTS[op_class]
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(
+            "SELECT set_config('statement_timeout', %s, true), set_config('lock_timeout', %s, true)",
+            (f"{int(statement_ms)}ms", f"{int(lock_ms)}ms"),
+        )
+    finally:
+        cursor.close()
+
+
+@event.listens_for(SessionLocal, "after_begin")
+@event.listens_for(ReadSessionLocal, "after_begin")
+def _apply_session_timeouts(session, transaction, connection):
+    _set_timeouts(connection, session.info.get("op_class", "mutation"))
+
+
+def use_timeouts(db: Session, op_class: str):
+    """
+    Switch the session's current transaction to another operation class, e.g. a column-wide
+    bulk operation on a session opened for card mutations. Later transactions on the same
+    session go back to the class it was opened with.
+    """
+    _set_timeouts(db.connection(), op_class)
+
+
+def timeout_reason(exc: BaseException) -> str | None:
+    """The limit behind a database error ("statement_timeout" / "lock_timeout" / "pool_timeout"), or None."""
+    if isinstance(exc, PoolTimeout):
+        return "pool_timeout"
+    if isinstance(exc, OperationalError):
+        return SQLSTATE_REASONS.get(getattr(exc.orig, "sqlstate", None))
+    return None
+
+
+class ShedCounters:
+    """
+    Requests and WebSocket messages turned away because a database limit fired, per
+    operation label (the same labels as the query stats) and reason. Exposed at
+    /api/admin/shed so the limits can be tuned against real load.
+    """
+
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        self.by_label: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    def record(self, label: str, reason: str) -> int:
+        """Count one shed operation and return a jittered retry_after (seconds) for the client."""
+        with self._lock:
+            self.by_label[label][reason] += 1
+        return max(1, round(random.uniform(self.retry_after, self.retry_after * 2)))
+
+    def stats(self) -> dict:
+        with self._lock:
+            by_label = {label: dict(reasons) for label, reasons in self.by_label.items()}
+        totals: dict[str, int] = defaultdict(int)
+        for reasons in by_label.values():
+            for reason, n in reasons.items():
+                totals[reason] += n
+        return {
+            "limits_ms": {op: {"statement": s, "lock": l} for op, (s, l) in OP_TIMEOUTS.items()},
+            "totals": dict(totals),
+            "by_label": by_label,
+        }
+
+
+# Shared instance, same pattern as the WebSocket `manager`
+shed = ShedCounters(retry_after=settings.db_timeout_retry_after_seconds)
@@ -0,0 +1,204 @@
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+logger = logging.getLogger("syncboard.slow")
+
+
+class Span:
+    __slots__ = ("name", "attrs", "start", "end", "children")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.start = time.perf_counter()
+        self.end: float | None = None
+        self.children: list[Span] = []
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end or time.perf_counter()) - self.start) * 1000
+
+    def to_dict(self, origin: float) -> dict:
+        node = {
+            "name": self.name,
+            "offset_ms": round((self.start - origin) * 1000, 3),
+            "duration_ms": round(self.duration_ms, 3),
+        }
+        if self.attrs:
+            node["attrs"] = self.attrs
+        if self.children:
+            node["children"] = [child.to_dict(origin) for child in self.children]
+        return node
+
+
+class JsonLinesExporter:
+    """Appends one JSON document per line. Safe to call from the event loop and the threadpool."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, record: dict):
+        line = json.dumps(record, default=str)
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+
+
+# Innermost open span for the current request / WebSocket message. Sync routes run in the
+# threadpool with a copy of the request's context, so their spans still nest under the root.
+_current: ContextVar[Span | None] = ContextVar("trace_span", default=None)
+
+
+class Tracer:
+    """
+    Minimal span tracing for REST requests and WebSocket messages.
+    `trace()` opens a root span; `span()` opens a child of whatever is current and is
+    a no-op outside a trace. When a root finishes it is exported with probability
+    `sample_rate`, and — sampled or not — written to the slow-op log with its whole
+    span tree if it took longer than `slow_ms`. The most recent slow ops are also
+    kept in memory for the admin endpoint.
+    """
+
+    def __init__(self, enabled: bool, sample_rate: float, slow_ms: float,
+                 export_path: str | None, slow_log_path: str | None):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.exporter = JsonLinesExporter(export_path) if export_path else None
+        self.slow_log = JsonLinesExporter(slow_log_path) if slow_log_path else None
+        self.recent_slow: deque[dict] = deque(maxlen=100)
+
+    @contextmanager
+    def trace(self, name: str, **attrs):
+        if not self.enabled:
+            yield None
+            return
+        root = Span(name, attrs)
+        token = _current.set(root)
+        try:
+            yield root
+        finally:
+            root.end = time.perf_counter()
+            _current.reset(token)
+            self._finish(root)
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        parent = _current.get()
+        if parent is None:
+            yield None
+            return
+        child = Span(name, attrs)
+        parent.children.append(child)
+        token = _current.set(child)
+        try:
+            yield child
+        finally:
+            child.end = time.perf_counter()
+            _current.reset(token)
+
+    def start_span(self, name: str, **attrs) -> Span | None:
+        """For callers that can't use a `with` block (SQLAlchemy event pairs). Close with end_span."""
+        parent = _current.get()
+        if parent is None:
+            return None
+        child = Span(name, attrs)
+        parent.children.append(child)
+        return child
+
+    @staticmethod
+    def end_span(span: Span | None):
+        if span is not None:
+            span.end = time.perf_counter()
+
+    def _finish(self, root: Span):
+        sampled = self.exporter is not None and random.random() < self.sample_rate
+        slow = root.duration_ms >= self.slow_ms
+        if not sampled and not slow:
+            return
+        record = {
+            "trace_id": uuid.uuid4().hex[:16],
+            "at": time.time(),
+            "slow": slow,
+            **root.to_dict(root.start),
+        }
+        try:
+            if sampled:
+                self.exporter.export(record)
+            if slow:
+                self.recent_slow.append(record)
+                if self.slow_log:
+                    self.slow_log.export(record)
+                else:
+                    logger.warning("Slow operation %s took %.1f ms: %s", root.name, root.duration_ms, json.dumps(record, default=str))
+        except OSError:
+            pass  # Tracing must never take a request down with it
+
+
+# Shared instance, same pattern as the WebSocket `manager`
+tracer = Tracer(
+    enabled=settings.tracing_enabled,
+    sample_rate=settings.trace_sample_rate,
+    slow_ms=settings.slow_op_threshold_ms,
+    export_path=settings.trace_export_path,
+    slow_log_path=settings.slow_op_log_path,
+)
+
+
+# SQL child spans — one per statement, holding the (truncated) SQL text
+@event.listens_for(Engine, "before_cursor_execute")
+def _sql_span_start(conn, cursor, statement, parameters, context, executemany):
+    span = tracer.start_span("sql", statement=" ".join(statement.split())[:200])
+    if span is not None:
+        conn.info.setdefault("trace_spans", []).append(span)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _sql_span_end(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("trace_spans")
+    if spans:
+        tracer.end_span(spans.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _sql_span_error(context):
+    spans = context.connection.info.get("trace_spans") if context.connection is not None else None
+    if spans:
+        span = spans.pop()
+        span.attrs["error"] = type(context.original_exception).__name__
+        tracer.end_span(span)
+
+
+# Commit spans — flush + COMMIT, with the flush's statements nested underneath
+@event.listens_for(Session, "before_commit")
+def _commit_span_start(session):
+    span = tracer.start_span("db.commit")
+    if span is not None:
+        session.info["commit_span"] = (span, _current.set(span))
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _commit_span_end(session):
+    entry = session.info.pop("commit_span", None)
+    if entry is None:
+        return
+    span, token = entry
+    tracer.end_span(span)
+    try:
+        _current.reset(token)
+    except ValueError:
+        pass  # Commit finished in a different context than it started — nothing to restore
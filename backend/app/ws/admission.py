@@ -0,0 +1,104 @@
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from app.config import settings
+
+
+# Application-defined close code (4000-4999 range) telling the client to back off and retry.
+# The close reason carries the suggested delay, e.g. "retry_after=7".
+CLOSE_RETRY_LATER = 4429
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__(f"retry_after={retry_after}")
+        self.retry_after = retry_after
+
+
+class HandshakeAdmission:
+    """
+    Caps how many WebSocket handshakes (JWT decode + user/membership SELECTs + presence fan-out)
+    run at once. Extra handshakes wait in a bounded queue; once the queue is full, or a
+    handshake has waited too long, the client is told to retry later with a jittered delay
+    so the herd spreads itself out instead of hammering us in lockstep.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float,
+                 retry_after: float, storm_joins_per_second: int):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.storm_joins_per_second = storm_joins_per_second
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+        # Fixed one-second window counting recent admissions — cheap storm detector
+        self._window_start = 0.0
+        self._window_count = 0
+
+    @property
+    def storming(self) -> bool:
+        """True while handshakes are queueing up or arriving faster than the storm threshold."""
+        if self.waiting > 0:
+            return True
+        if time.monotonic() - self._window_start >= 1.0:
+            return False
+        return self._window_count >= self.storm_joins_per_second
+
+    def _suggest_retry_after(self) -> int:
+        # Scale the delay with the backlog, then jitter it so retries don't arrive together
+        backlog = (self.waiting + self.in_flight) / max(self.max_concurrent, 1)
+        base = self.retry_after * max(1.0, backlog / 4)
+        return max(1, round(random.uniform(base, base * 2)))
+
+    def _count_admission(self):
+        now = time.monotonic()
+        if now - self._window_start >= 1.0:
+            self._window_start = now
+            self._window_count = 0
+        self._window_count += 1
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one handshake slot for the duration of the block, or raise AdmissionRejected."""
+        if self._slots.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise AdmissionRejected(self._suggest_retry_after())
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise AdmissionRejected(self._suggest_retry_after())
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        self._count_admission()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "storming": self.storming,
+        }
+
+
+# Shared instance, same pattern as `manager`
+admission = HandshakeAdmission(
+    max_concurrent=settings.ws_handshake_max_concurrent,
+    max_queue=settings.ws_handshake_max_queue,
+    queue_timeout=settings.ws_handshake_queue_timeout_seconds,
+    retry_after=settings.ws_retry_after_seconds,
+    storm_joins_per_second=settings.ws_storm_joins_per_second,
+)
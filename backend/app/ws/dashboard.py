@@ -0,0 +1,136 @@
+import asyncio
+import json
+from collections import defaultdict
+from datetime import datetime
+from fastapi import WebSocket
+
+from app.config import settings
+from app.models import utcnow
+from app.database import SessionLocal
+from app.ws.manager import manager
+from app.rooms.summary import query_summaries, online_count
+from app.schemas import RoomSummary
+
+# Room broadcasts that only change who's online — pushed without touching the database
+ONLINE_EVENTS = {"user_joined", "users_joined", "user_left"}
+# Relayed UI state that changes nothing on the dashboard
+IGNORED_EVENTS = {"card_focused", "card_blurred", "focus_expired", "presence"}
+
+
+def summary_payload(summary: dict) -> dict:
+    return RoomSummary.model_validate(summary).model_dump(mode="json")
+
+
+class DashboardFeed:
+    """
+    Per-user WebSocket channel (/ws/user) that keeps open dashboards current without polling.
+    Watches every room broadcast through `manager.observers`; rooms that changed are marked
+    dirty and, once per debounce window, each gets one aggregate summary query shared by all
+    of its watchers. Presence-only changes skip the database and send just the online count.
+    """
+
+    def __init__(self, debounce_ms: int):
+        self.debounce = debounce_ms / 1000
+        # user_id → that user's open dashboard sockets
+        self.sockets: dict[str, set[WebSocket]] = defaultdict(set)
+        # room_id → user_ids with an open dashboard that shows the room
+        self.watchers: dict[str, set[str]] = defaultdict(set)
+        self._dirty: set[str] = set()
+        self._online_dirty: set[str] = set()
+        # room_id → when its latest dirtying event happened; the database may not show it yet
+        self._changed_at: dict[str, datetime] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self.pushes = 0
+
+    def subscribe(self, websocket: WebSocket, user_id: str, room_ids):
+        self.sockets[user_id].add(websocket)
+        for room_id in room_ids:
+            self.watchers[str(room_id)].add(user_id)
+
+    def unsubscribe(self, websocket: WebSocket, user_id: str):
+        self.sockets[user_id].discard(websocket)
+        if self.sockets[user_id]:
+            return
+        del self.sockets[user_id]
+        for room_id in [r for r, users in self.watchers.items() if user_id in users]:
+            self.watchers[room_id].discard(user_id)
+            if not self.watchers[room_id]:
+                del self.watchers[room_id]
+
+    async def watch(self, user_id: str, room_id: str):
+        """A user created or joined a room — add it to their open dashboards. Async so it runs on the event loop."""
+        if user_id in self.sockets:
+            self.watchers[room_id].add(user_id)
+            self._mark(room_id, self._dirty)
+
+    def room_event(self, room_id: str, message: dict):
+        """manager observer — called synchronously for every room broadcast."""
+        if room_id not in self.watchers:
+            return
+        kind = message.get("type")
+        if kind == "room_closed":
+            asyncio.ensure_future(self._push(self.watchers.pop(room_id), {"type": "room_removed", "room_id": room_id}))
+            self._dirty.discard(room_id)
+            self._online_dirty.discard(room_id)
+            self._changed_at.pop(room_id, None)
+        elif kind in ONLINE_EVENTS:
+            self._mark(room_id, self._online_dirty)
+        elif kind not in IGNORED_EVENTS:
+            self._changed_at[room_id] = utcnow()
+            self._mark(room_id, self._dirty)
+
+    def _mark(self, room_id: str, dirty: set[str]):
+        dirty.add(room_id)
+        if self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self.debounce, lambda: asyncio.ensure_future(self.flush()))
+
+    async def flush(self):
+        self._flush_handle = None
+        dirty, self._dirty = self._dirty, set()
+        online_only, self._online_dirty = self._online_dirty - dirty, set()
+        changed_at = {room_id: self._changed_at.pop(room_id) for room_id in dirty if room_id in self._changed_at}
+
+        if dirty:
+            summaries = await asyncio.to_thread(self._load, dirty)
+            for summary in summaries:
+                room_id = str(summary["id"])
+                # A delete or column change reaches activity_log only on the next writer flush
+                if room_id in changed_at:
+                    last = summary["last_activity_at"]
+                    # Stored timestamps are UTC, naive or not depending on the driver
+                    summary["last_activity_at"] = max(last, changed_at[room_id].replace(tzinfo=last.tzinfo))
+                await self._push(self.watchers.get(room_id, ()), {"type": "room_summary", "room": summary_payload(summary)})
+        for room_id in online_only:
+            await self._push(self.watchers.get(room_id, ()), {
+                "type": "room_online",
+                "room_id": room_id,
+                "online": online_count(room_id),
+            })
+
+    def _load(self, room_ids) -> list[dict]:
+        with SessionLocal(info={"op_class": "read"}) as db:
+            return query_summaries(db, room_ids=room_ids)
+
+    async def _push(self, user_ids, message: dict):
+        text = json.dumps(message)
+        for user_id in list(user_ids):
+            for ws in list(self.sockets.get(user_id, ())):
+                try:
+                    await ws.send_text(text)
+                    self.pushes += 1
+                except Exception:
+                    pass  # The socket's own receive loop cleans it up
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self.sockets),
+            "sockets": sum(len(s) for s in self.sockets.values()),
+            "watched_rooms": len(self.watchers),
+            "pushes": self.pushes,
+        }
+
+
+# Shared instance, same pattern as the WebSocket `manager`
+dashboard = DashboardFeed(debounce_ms=settings.dashboard_push_debounce_ms)
+manager.observers.append(dashboard.room_event)
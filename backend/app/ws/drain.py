@@ -0,0 +1,128 @@
+import asyncio
+import random
+import signal
+import threading
+from fastapi import WebSocket
+from app.config import settings
+from app.ws.manager import manager
+from app.ws.dashboard import dashboard
+
+
+# Application-defined counterpart of 1012 (service restart). The close reason carries a
+# randomized reconnect delay, same format as CLOSE_RETRY_LATER: "retry_after=7".
+CLOSE_SERVER_RESTART = 4012
+
+
+class Drainer:
+    """
+    Graceful shutdown for WebSockets. Without it, a restart drops every socket at once and
+    every client reconnects (get_room + handshake) in the same second.
+    On SIGTERM: stop accepting sockets (new ones are closed straight away with a retry hint),
+    flush presence joins and dashboard pushes still waiting on their debounce timers, then
+    close the open sockets in random order spread evenly over `window` seconds, each with its
+    own random `retry_after` — only after that is the server's own shutdown allowed to run.
+    """
+
+    def __init__(self, window: float, reconnect_min: float, reconnect_max: float):
+        self.window = window
+        self.reconnect_min = reconnect_min
+        self.reconnect_max = reconnect_max
+        self.draining = False
+        self.closed = 0
+        self.refused = 0
+        self._task: asyncio.Task | None = None
+
+    def retry_after(self) -> int:
+        return max(1, round(random.uniform(self.reconnect_min, self.reconnect_max)))
+
+    async def refuse(self, websocket: WebSocket):
+        """Turn away a socket that arrived mid-drain. Accept first so the client sees the code."""
+        self.refused += 1
+        await websocket.accept()
+        await websocket.close(code=CLOSE_SERVER_RESTART, reason=f"retry_after={self.retry_after()}")
+
+    async def _flush_pending(self):
+        for room_id, handle in list(manager._presence_flush.items()):
+            handle.cancel()
+            await manager._flush_joins(room_id)
+        if dashboard._flush_handle is not None:
+            dashboard._flush_handle.cancel()
+            await dashboard.flush()
+
+    def _connections(self) -> list[tuple[str | None, WebSocket]]:
+        sockets = [(room_id, ws) for room_id, conns in manager.rooms.items() for ws, _ in conns]
+        sockets += [(None, ws) for conns in dashboard.sockets.values() for ws in conns]
+        random.shuffle(sockets)
+        return sockets
+
+    async def _close(self, room_id: str | None, websocket: WebSocket):
+        if room_id is not None:
+            # Deregister quietly: the rest of the room is about to go too, so no user_left /
+            # focus_expired fan-out, and the receive loop's leave() becomes a no-op
+            manager.release_focus(websocket, room_id)
+            manager.disconnect(websocket, room_id)
+        try:
+            await websocket.close(code=CLOSE_SERVER_RESTART, reason=f"retry_after={self.retry_after()}")
+            self.closed += 1
+        except Exception:
+            pass  # Already gone
+
+    async def drain(self):
+        """Run the drain once; later calls wait for (or skip) the one already done."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._drain())
+        await self._task
+
+    async def _drain(self):
+        self.draining = True
+        await self._flush_pending()
+        connections = self._connections()
+        gap = self.window / len(connections) if connections else 0
+        for room_id, websocket in connections:
+            await self._close(room_id, websocket)
+            if gap:
+                await asyncio.sleep(gap)
+
+    def install_signal_handler(self, sig: int = signal.SIGTERM):
+        """
+        Run the drain before the server's own SIGTERM handling (which closes every socket with
+        1012 at once): the previous handler is chained and called when the drain finishes.
+        Only possible on the main thread — elsewhere (e.g. TestClient) this does nothing.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+        loop = asyncio.get_running_loop()
+        previous = signal.getsignal(sig)
+
+        def chain(signum, frame):
+            if callable(previous):
+                previous(signum, frame)
+
+        def handler(signum, frame):
+            if self.draining or self.window <= 0:
+                chain(signum, frame)  # A second signal skips the rest of the drain
+                return
+            def start():
+                task = loop.create_task(self.drain())
+                task.add_done_callback(lambda _: chain(signum, frame))
+
+            # Signal handlers run between bytecodes — threadsafe scheduling also wakes the loop
+            loop.call_soon_threadsafe(start)
+
+        signal.signal(sig, handler)
+
+    def stats(self) -> dict:
+        return {
+            "draining": self.draining,
+            "window_seconds": self.window,
+            "closed": self.closed,
+            "refused": self.refused,
+        }
+
+
+# Shared instance, same pattern as the WebSocket `manager`
+drainer = Drainer(
+    window=settings.ws_drain_window_seconds,
+    reconnect_min=settings.ws_drain_reconnect_min_seconds,
+    reconnect_max=settings.ws_drain_reconnect_max_seconds,
+)
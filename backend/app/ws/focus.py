@@ -0,0 +1,46 @@
+import asyncio
+from app.config import settings
+from app.ws.manager import manager
+
+
+class FocusSweeper:
+    """
+    Expires card focus leases that weren't renewed — e.g. a tab that crashed mid-edit
+    without sending card_blur. One pass over all leases per interval, and one
+    `focus_expired` broadcast per affected room, rather than a timer per socket.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.expired = 0
+        self._task: asyncio.Task | None = None
+
+    async def sweep(self):
+        for room_id, card_ids in manager.expire_focus().items():
+            self.expired += len(card_ids)
+            await manager.broadcast(room_id, {"type": "focus_expired", "card_ids": card_ids})
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep()
+            except Exception:
+                pass  # Try again next interval
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Shared instance, same pattern as the WebSocket `manager`
+focus_sweeper = FocusSweeper(interval=settings.ws_focus_sweep_interval_seconds)
@@ -1,7 +1,19 @@
 from fastapi import WebSocket
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from app.models import Card, Column
 from app.ws.manager import manager
+from app.ws.heartbeat import heartbeats
+from app.activity.writer import activity
+from app.cards.service import claim_position, adjust_card_count, insert_card, id_archived, open_slot, renumber_columns
+from app.cards.idempotency import claim_op
+from app.labels.service import tags_of
+from app.tracing import tracer
+from app.timeouts import use_timeouts
+from app.columns.service import (
+    create_column, get_column, move_column, delete_column, column_payload,
+    move_all_cards, clear_column, sort_column, SORT_KEYS,
+)
 import uuid
 
 
@@ -16,20 +28,71 @@ async def handle_message(ws: WebSocket, room_id: str, user: dict, data: dict, db
         await handle_card_update(ws, room_id, user, data, db)
     elif t == "card_delete":
         await handle_card_delete(ws, room_id, user, data, db)
+    elif t == "column_create":
+        await handle_column_create(ws, room_id, user, data, db)
+    elif t == "column_rename":
+        await handle_column_rename(ws, room_id, user, data, db)
+    elif t == "column_move":
+        await handle_column_move(ws, room_id, user, data, db)
+    elif t == "column_delete":
+        await handle_column_delete(ws, room_id, user, data, db)
+    elif t == "column_move_cards":
+        await handle_column_move_cards(ws, room_id, user, data, db)
+    elif t == "column_clear":
+        await handle_column_clear(ws, room_id, user, data, db)
+    elif t == "column_sort":
+        await handle_column_sort(ws, room_id, user, data, db)
     elif t == "card_focus":
         await handle_card_focus(ws, room_id, user, data)
     elif t == "card_blur":
         await handle_card_blur(ws, room_id, user, data)
+    elif t == "subscribe":
+        await handle_subscribe(ws, room_id, data)
+    elif t == "unsubscribe":
+        await handle_unsubscribe(ws, room_id, data)
     elif t == "ping":
         await manager.send_personal(ws, {"type": "pong", "sentAt": data.get("sentAt", 0)})
+    elif t == "heartbeat_ack":
+        heartbeats.ack(ws, data.get("sentAt"))
 
 
 def reindex_column(db: Session, column_id: str):
-    """Re-assign sequential positions (0,1,2...) to all cards in a column."""
-    cards = db.query(Card).filter(Card.column_id == column_id).order_by(Card.position).all()
-    for i, card in enumerate(cards):
-        card.position = i
-    db.flush()
+    """
+    Re-assign sequential positions (0,1,2...) to all cards in a column — set-based, and
+    without touching updated_at, which the archive policy reads as "last edited".
+    """
+    with tracer.span("reindex_column", column_id=str(column_id)):
+        renumber_columns(db, [column_id])
+
+
+def card_payload(card: Card) -> dict:
+    return {
+        "id": str(card.id),
+        "column_id": str(card.column_id),
+        "title": card.title,
+        "description": card.description,
+        "position": card.position,
+        "created_by": str(card.created_by)
+    }
+
+
+def _parse_uuid(value) -> uuid.UUID | None:
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+async def replay_card_created(ws: WebSocket, room_id: str, user: dict, card_id: uuid.UUID, db: Session):
+    """The create already happened (the client is retrying) — resend the result to this socket only."""
+    card = (
+        db.query(Card)
+        .join(Column, Card.column_id == Column.id)
+        .filter(Card.id == card_id, Column.room_id == room_id, Card.created_by == user["id"])
+        .first()
+    )
+    if card:
+        await manager.send_personal(ws, {"type": "card_created", "card": card_payload(card), "by": user["id"]})
 
 
 async def handle_card_create(ws: WebSocket, room_id: str, user: dict, data: dict, db: Session):
@@ -38,31 +101,50 @@ async def handle_card_create(ws: WebSocket, room_id: str, user: dict, data: dict
     if not column_id or not title:
         return
 
-    count = db.query(Card).filter(Card.column_id == column_id).count()
-    card = Card(
-        id=uuid.uuid4(),
-        column_id=column_id,
+    # Clients may pick the card id (for optimistic UI) and tag the op with an idempotency key
+    card_id = _parse_uuid(data["id"]) if data.get("id") else uuid.uuid4()
+    key = data.get("idempotency_key")
+    if card_id is None or (key is not None and not isinstance(key, str)):
+        return
+    if data.get("id") and id_archived(db, card_id):
+        return  # Taken by an archived card — same as any other id clash with someone else's card
+    if key:
+        prior = claim_op(db, user["id"], key[:64], "card_create", card_id)
+        if prior is not None:
+            db.rollback()
+            await replay_card_created(ws, room_id, user, prior, db)
+            return
+
+    # Atomically reserve the bottom slot; None means the column isn't in this room
+    position = claim_position(db, column_id, room_id)
+    if position is None:
+        db.rollback()
+        return
+    card = insert_card(
+        db,
+        id=card_id,
+        column_id=uuid.UUID(str(column_id)),
         title=title,
         description=data.get("description", ""),
-        position=count,
-        created_by=user["id"]
+        position=position,
+        created_by=uuid.UUID(user["id"])
     )
-    db.add(card)
+    if card is None:
+        # Same client id sent again without a key — treat it as the retry it almost certainly is
+        db.rollback()
+        await replay_card_created(ws, room_id, user, card_id, db)
+        return
+    # Build the broadcast from the RETURNING row before commit expires it — no refresh needed
+    payload = {**card_payload(card), "label_ids": [], "assignee_ids": []}
     db.commit()
-    db.refresh(card)
+    activity.record(room_id, "card_created", user_id=user["id"], card_id=card_id,
+                    column_id=payload["column_id"], title=payload["title"])
 
-    await manager.broadcast(room_id, {
+    await manager.broadcast_card(room_id, {
         "type": "card_created",
-        "card": {
-            "id": str(card.id),
-            "column_id": str(card.column_id),
-            "title": card.title,
-            "description": card.description,
-            "position": card.position,
-            "created_by": str(card.created_by)
-        },
+        "card": payload,
         "by": user["id"]
-    })
+    }, {payload["column_id"]: 1})
 
 
 async def handle_card_move(ws: WebSocket, room_id: str, user: dict, data: dict, db: Session):
@@ -71,11 +153,32 @@ async def handle_card_move(ws: WebSocket, room_id: str, user: dict, data: dict,
     to_position = data.get("to_position", 0)
 
     card = db.query(Card).filter(Card.id == card_id).first()
-    if not card:
+    if not card or not to_column_id:
+        return
+
+    key = data.get("idempotency_key")
+    if isinstance(key, str) and key and claim_op(db, user["id"], key[:64], "card_move", card.id) is not None:
+        # Already applied — tell this client where the card ended up instead of moving it again
+        db.rollback()
+        await manager.send_personal(ws, {
+            "type": "card_moved",
+            "card_id": card_id,
+            "to_column_id": str(card.column_id),
+            "to_position": card.position,
+            "by": user["id"]
+        })
         return
 
     old_column_id = str(card.column_id)
 
+    if old_column_id != to_column_id:
+        # Keep both columns' card_count in step; also rejects target columns from other rooms
+        if claim_position(db, to_column_id, room_id) is None:
+            # Undo the idempotency claim too, so a corrected retry with the same key still applies
+            db.rollback()
+            return
+        adjust_card_count(db, old_column_id, -1)
+
     card.column_id = to_column_id
     card.position = -1
     db.flush()
@@ -83,29 +186,34 @@ async def handle_card_move(ws: WebSocket, room_id: str, user: dict, data: dict,
     if old_column_id != to_column_id:
         reindex_column(db, old_column_id)
 
-    target_cards = (
-        db.query(Card)
-        .filter(Card.column_id == to_column_id, Card.id != card.id)
-        .order_by(Card.position)
-        .all()
-    )
-    for i, c in enumerate(target_cards):
-        if i >= to_position:
-            c.position = i + 1
-        else:
-            c.position = i
-    db.flush()
+    others = db.execute(
+        select(func.count()).select_from(Card).where(Card.column_id == card.column_id, Card.id != card.id)
+    ).scalar_one()
+    # Keep the target's positions gap-free (0..n-1) — bulk column moves append after card_count
+    to_position = max(0, min(to_position, others))
+    # Shift the neighbours set-based, so they keep their updated_at (the archive policy's clock)
+    open_slot(db, card.column_id, card.id, to_position)
 
     card.position = to_position
+    # Card events carry the card's tags so clients on a filtered board can ignore non-matching ones
+    tags = tags_of(db, card.id)
+    # The whole card too: a client subscribed only to the target column has never seen it
+    payload = {**card_payload(card), **tags}
     db.commit()
+    activity.record(room_id, "card_moved", user_id=user["id"], card_id=card_id,
+                    from_column_id=old_column_id, to_column_id=to_column_id, to_position=to_position)
 
-    await manager.broadcast(room_id, {
+    deltas = {old_column_id: -1, to_column_id: 1} if old_column_id != to_column_id else {to_column_id: 0}
+    await manager.broadcast_card(room_id, {
         "type": "card_moved",
         "card_id": card_id,
+        "from_column_id": old_column_id,
         "to_column_id": to_column_id,
         "to_position": to_position,
+        "card": payload,
+        **tags,
         "by": user["id"]
-    })
+    }, deltas)
 
 
 async def handle_card_update(ws: WebSocket, room_id: str, user: dict, data: dict, db: Session):
@@ -119,15 +227,20 @@ async def handle_card_update(ws: WebSocket, room_id: str, user: dict, data: dict
     if "description" in data:
         card.description = data["description"]
 
+    tags = tags_of(db, card.id)
     db.commit()
+    activity.record(room_id, "card_updated", user_id=user["id"], card_id=card_id,
+                    fields=[f for f in ("title", "description") if f in data])
 
-    await manager.broadcast(room_id, {
+    await manager.broadcast_card(room_id, {
         "type": "card_updated",
         "card_id": card_id,
+        "column_id": str(card.column_id),
         "title": card.title,
         "description": card.description,
+        **tags,
         "by": user["id"]
-    })
+    }, {str(card.column_id): 0})
 
 
 async def handle_card_delete(ws: WebSocket, room_id: str, user: dict, data: dict, db: Session):
@@ -137,34 +250,233 @@ async def handle_card_delete(ws: WebSocket, room_id: str, user: dict, data: dict
         return
 
     column_id = str(card.column_id)
+    title = card.title
+    tags = tags_of(db, card.id)  # Read before the link rows cascade away
     db.delete(card)
+    adjust_card_count(db, column_id, -1)
     db.flush()
     reindex_column(db, column_id)
     db.commit()
+    activity.record(room_id, "card_deleted", user_id=user["id"], card_id=card_id,
+                    column_id=column_id, title=title)
 
-    await manager.broadcast(room_id, {
+    await manager.broadcast_card(room_id, {
         "type": "card_deleted",
         "card_id": card_id,
+        "column_id": column_id,
+        **tags,
+        "by": user["id"]
+    }, {column_id: -1})
+
+
+# ---------- Columns (same service + broadcasts as the REST routes) ----------
+
+def _room_column(db: Session, room_id: str, column_id) -> Column | None:
+    try:
+        return get_column(db, uuid.UUID(room_id), uuid.UUID(str(column_id)))
+    except ValueError:
+        return None
+
+
+async def handle_column_create(ws: WebSocket, room_id: str, user: dict, data: dict, db: Session):
+    title = data.get("title", "").strip()
+    if not title:
+        return
+
+    column = create_column(db, uuid.UUID(room_id), title[:100])
+    db.commit()
+
+    await manager.broadcast(room_id, {
+        "type": "column_created",
+        "column": column_payload(column),
         "by": user["id"]
     })
 
 
-# ---------- Focus/Blur (no DB, just relay to other clients) ----------
+async def handle_column_rename(ws: WebSocket, room_id: str, user: dict, data: dict, db: Session):
+    title = data.get("title", "").strip()
+    column = _room_column(db, room_id, data.get("column_id"))
+    if not column or not title:
+        return
 
-async def handle_card_focus(ws: WebSocket, room_id: str, user: dict, data: dict):
-    """User opened edit modal on a card — tell everyone else."""
-    await manager.broadcast_except(room_id, ws, {
-        "type": "card_focused",
-        "card_id": data.get("card_id"),
-        "user_id": user["id"],
-        "display_name": user["display_name"]
+    column.title = title[:100]
+    db.commit()
+
+    await manager.broadcast(room_id, {
+        "type": "column_renamed",
+        "column_id": str(column.id),
+        "title": column.title,
+        "by": user["id"]
+    })
+
+
+async def handle_column_move(ws: WebSocket, room_id: str, user: dict, data: dict, db: Session):
+    column = _room_column(db, room_id, data.get("column_id"))
+    to_index = data.get("to_index")
+    if not column or not isinstance(to_index, int):
+        return
+
+    position = move_column(db, column, to_index)
+    db.commit()
+
+    await manager.broadcast(room_id, {
+        "type": "column_moved",
+        "column_id": str(column.id),
+        "position": position,
+        "to_index": to_index,
+        "by": user["id"]
     })
 
 
+async def handle_column_delete(ws: WebSocket, room_id: str, user: dict, data: dict, db: Session):
+    column = _room_column(db, room_id, data.get("column_id"))
+    if not column:
+        return
+
+    target = None
+    if data.get("move_cards_to"):
+        target = _room_column(db, room_id, data["move_cards_to"])
+        if not target or target.id == column.id:
+            return
+
+    use_timeouts(db, "bulk")
+    column_id = str(column.id)
+    delete_column(db, column, target)
+    db.commit()
+
+    await manager.broadcast(room_id, {
+        "type": "column_deleted",
+        "column_id": column_id,
+        "moved_cards_to": str(target.id) if target else None,
+        "by": user["id"]
+    })
+
+
+async def handle_column_move_cards(ws: WebSocket, room_id: str, user: dict, data: dict, db: Session):
+    column = _room_column(db, room_id, data.get("column_id"))
+    target = _room_column(db, room_id, data.get("to_column_id"))
+    if not column or not target or target.id == column.id:
+        return
+
+    # Read before commit expires them
+    from_column_id, to_column_id = str(column.id), str(target.id)
+    use_timeouts(db, "bulk")
+    moved = move_all_cards(db, column, target)
+    db.commit()
+    if not moved:
+        return
+
+    activity.record(room_id, "column_cards_moved", user_id=user["id"],
+                    from_column_id=from_column_id, to_column_id=to_column_id, count=moved)
+    await manager.broadcast(room_id, {
+        "type": "column_cards_moved",
+        "from_column_id": from_column_id,
+        "to_column_id": to_column_id,
+        "count": moved,
+        "by": user["id"]
+    })
+
+
+async def handle_column_clear(ws: WebSocket, room_id: str, user: dict, data: dict, db: Session):
+    column = _room_column(db, room_id, data.get("column_id"))
+    if not column:
+        return
+
+    column_id = str(column.id)
+    use_timeouts(db, "bulk")
+    deleted = clear_column(db, column)
+    db.commit()
+    if not deleted:
+        return
+
+    activity.record(room_id, "column_cleared", user_id=user["id"], column_id=column_id, count=deleted)
+    await manager.broadcast(room_id, {
+        "type": "column_cleared",
+        "column_id": column_id,
+        "count": deleted,
+        "by": user["id"]
+    })
+
+
+async def handle_column_sort(ws: WebSocket, room_id: str, user: dict, data: dict, db: Session):
+    column = _room_column(db, room_id, data.get("column_id"))
+    sort_by = data.get("by")
+    if not column or sort_by not in SORT_KEYS:
+        return
+
+    column_id = str(column.id)
+    descending = bool(data.get("descending"))
+    use_timeouts(db, "bulk")
+    positions = sort_column(db, column, sort_by, descending)
+    db.commit()
+    if not positions:
+        return
+
+    activity.record(room_id, "column_sorted", user_id=user["id"], column_id=column_id,
+                    sort_by=sort_by, descending=descending)
+    await manager.broadcast(room_id, {
+        "type": "column_sorted",
+        "column_id": column_id,
+        "positions": positions,
+        "by": user["id"]
+    })
+
+
+# ---------- Focus/Blur (no DB — leases held in the connection registry) ----------
+
+async def handle_card_focus(ws: WebSocket, room_id: str, user: dict, data: dict):
+    """
+    User opened (or is still in) the edit modal on a card. The client re-sends this to
+    renew the lease; only a new or changed lease is broadcast.
+    """
+    card_id = data.get("card_id")
+    if not isinstance(card_id, str) or not card_id:
+        return
+    if manager.focus_card(ws, room_id, user, card_id):
+        await manager.broadcast_except(room_id, ws, {
+            "type": "card_focused",
+            "card_id": card_id,
+            "user_id": user["id"],
+            "display_name": user["display_name"]
+        })
+
+
 async def handle_card_blur(ws: WebSocket, room_id: str, user: dict, data: dict):
-    """User closed edit modal — tell everyone else to clear the indicator."""
-    await manager.broadcast_except(room_id, ws, {
-        "type": "card_blurred",
-        "card_id": data.get("card_id"),
-        "user_id": user["id"]
-    })
\ No newline at end of file
+    """User closed edit modal — release the lease and tell everyone else to clear the indicator."""
+    card_id = data.get("card_id")
+    if manager.blur_card(ws, room_id, card_id):
+        await manager.broadcast_except(room_id, ws, {
+            "type": "card_blurred",
+            "card_id": card_id,
+            "user_id": user["id"]
+        })
+
+
+# ---------- Column subscriptions (in-memory only, no database) ----------
+
+def _column_ids(data: dict) -> list[str] | None:
+    column_ids = data.get("column_ids")
+    if not isinstance(column_ids, list):
+        return None
+    return [str(c) for c in column_ids if _parse_uuid(c) is not None]
+
+
+async def handle_subscribe(ws: WebSocket, room_id: str, data: dict):
+    """Scope card events to these columns; `"all": true` goes back to receiving every card event."""
+    if data.get("all"):
+        manager.subscribe_all(ws, room_id)
+        await manager.send_personal(ws, {"type": "subscriptions", "all": True, "column_ids": []})
+        return
+    column_ids = _column_ids(data)
+    if column_ids is None:
+        return
+    subscribed = manager.subscribe(ws, room_id, column_ids)
+    await manager.send_personal(ws, {"type": "subscriptions", "all": False, "column_ids": subscribed})
+
+
+async def handle_unsubscribe(ws: WebSocket, room_id: str, data: dict):
+    column_ids = _column_ids(data)
+    if column_ids is None:
+        return
+    subscribed = manager.unsubscribe(ws, room_id, column_ids)
+    await manager.send_personal(ws, {"type": "subscriptions", "all": False, "column_ids": subscribed})
@@ -0,0 +1,217 @@
+import asyncio
+import time
+from fastapi import WebSocket
+from app.config import settings
+from app.ws.manager import manager
+
+
+# RTT histogram bucket upper bounds, in milliseconds. Anything slower lands in the overflow bucket.
+RTT_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class RttHistogram:
+    """Fixed-bucket latency histogram — constant memory no matter how many samples we record."""
+
+    def __init__(self):
+        self.counts = [0] * (len(RTT_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def observe(self, rtt_ms: float):
+        for i, bound in enumerate(RTT_BUCKETS_MS):
+            if rtt_ms <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.total_ms += rtt_ms
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate a quantile as the upper bound of the bucket it falls in."""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return float(RTT_BUCKETS_MS[i]) if i < len(RTT_BUCKETS_MS) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        labels = [str(b) for b in RTT_BUCKETS_MS] + ["+Inf"]
+        return {
+            "buckets_ms": dict(zip(labels, self.counts)),
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else None,
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+        }
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel with one slot per tick.
+    Each socket lives in exactly one slot, and every tick only visits the next slot —
+    so a tick touches ~1/slots of the connections instead of all of them, and
+    adding/removing a socket is O(1).
+    """
+
+    def __init__(self, slots: int):
+        self.slots: list[set[WebSocket]] = [set() for _ in range(slots)]
+        self.cursor = 0
+        self.slot_of: dict[WebSocket, int] = {}
+
+    def add(self, ws: WebSocket):
+        # Put it in the slot we just visited, so its first turn comes one full revolution later
+        self.remove(ws)
+        self.slots[self.cursor].add(ws)
+        self.slot_of[ws] = self.cursor
+
+    def remove(self, ws: WebSocket):
+        slot = self.slot_of.pop(ws, None)
+        if slot is not None:
+            self.slots[slot].discard(ws)
+
+    def advance(self) -> list[WebSocket]:
+        """Move to the next slot and return the sockets that are due."""
+        self.cursor = (self.cursor + 1) % len(self.slots)
+        return list(self.slots[self.cursor])
+
+    def __len__(self):
+        return len(self.slot_of)
+
+
+class HeartbeatMonitor:
+    """
+    Server-initiated heartbeats. Every socket gets a `heartbeat` message once per interval
+    and is expected to answer with `heartbeat_ack`. Sockets that miss `max_missed`
+    heartbeats in a row are treated as half-open and evicted from the room.
+    """
+
+    def __init__(self, interval: float, slots: int, max_missed: int, send_timeout: float | None = None):
+        self.tick_seconds = interval / slots
+        # A heartbeat that can't be written in half a tick means a stalled socket (full send buffer)
+        self.send_timeout = send_timeout if send_timeout is not None else self.tick_seconds / 2
+        self.max_missed = max_missed
+        self.wheel = TimerWheel(slots)
+        # Per-socket state: which room it's in, when the outstanding heartbeat was sent, misses so far
+        self.room_of: dict[WebSocket, str] = {}
+        self.pending: dict[WebSocket, float] = {}
+        self.missed: dict[WebSocket, int] = {}
+        # room_id → RTT distribution, kept across reconnects for capacity planning (dropped when the room hibernates)
+        self.rtt: dict[str, RttHistogram] = {}
+        # Heartbeat sends still in flight — at most one per socket, never awaited by the tick
+        self._sending: dict[WebSocket, asyncio.Task] = {}
+        self._task: asyncio.Task | None = None
+
+    def track(self, ws: WebSocket, room_id: str):
+        self.room_of[ws] = room_id
+        self.missed[ws] = 0
+        self.wheel.add(ws)
+
+    def untrack(self, ws: WebSocket):
+        self.wheel.remove(ws)
+        self.room_of.pop(ws, None)
+        self.pending.pop(ws, None)
+        self.missed.pop(ws, None)
+
+    def touch(self, ws: WebSocket):
+        """Any inbound traffic proves the socket is alive."""
+        if ws in self.missed:
+            self.missed[ws] = 0
+            self.pending.pop(ws, None)
+
+    def ack(self, ws: WebSocket, sent_at: float | None):
+        """Client answered a heartbeat — record the round trip for its room."""
+        started = self.pending.pop(ws, None)
+        room_id = self.room_of.get(ws)
+        if started is None or room_id is None:
+            return
+        # Prefer our own send timestamp; the echoed sentAt is only used to match up the reply
+        rtt_ms = (time.monotonic() - started) * 1000
+        self.rtt.setdefault(room_id, RttHistogram()).observe(rtt_ms)
+        self.missed[ws] = 0
+        # Someone still has the board open — not a candidate for hibernation
+        manager.mark_active(room_id)
+
+    def rtt_snapshot(self) -> dict:
+        return {room_id: hist.snapshot() for room_id, hist in self.rtt.items()}
+
+    def forget_room(self, room_id: str):
+        self.rtt.pop(room_id, None)
+
+    async def tick(self):
+        """
+        Visit one slot of the wheel: count misses, evict the dead, ping the rest. Pings are
+        fire-and-forget tasks, so one stalled socket can't hold up the wheel for everyone else.
+        """
+        due = self.wheel.advance()
+        for ws in due:
+            room_id = self.room_of.get(ws)
+            if room_id is None:
+                continue
+            if ws in self.pending:
+                self.missed[ws] += 1
+                if self.missed[ws] >= self.max_missed:
+                    await self.evict(ws, room_id)
+                    continue
+            if ws in self._sending:
+                continue  # Last heartbeat is still being written; its timeout will evict the socket
+            self.pending[ws] = time.monotonic()
+            task = asyncio.create_task(self._send(ws, room_id))
+            self._sending[ws] = task
+            task.add_done_callback(lambda _, ws=ws: self._sending.pop(ws, None))
+
+    async def _send(self, ws: WebSocket, room_id: str):
+        try:
+            await asyncio.wait_for(
+                manager.send_personal(ws, {"type": "heartbeat", "sentAt": int(time.time() * 1000)}),
+                timeout=self.send_timeout,
+            )
+        except Exception:
+            # Send failed or stalled past the send timeout — treat the socket as dead
+            await self.evict(ws, room_id)
+
+    async def evict(self, ws: WebSocket, room_id: str):
+        self.untrack(ws)
+        try:
+            await ws.close(code=4000)
+        except Exception:
+            pass  # Half-open sockets often can't even be closed cleanly
+        await manager.leave(ws, room_id)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.tick_seconds)
+            try:
+                await self.tick()
+            except Exception:
+                pass  # Never let one bad socket kill the heartbeat loop
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._sending.values()):
+            task.cancel()
+        self._sending.clear()
+
+
+# Shared instance, same pattern as `manager`
+heartbeats = HeartbeatMonitor(
+    interval=settings.ws_heartbeat_interval_seconds,
+    slots=settings.ws_heartbeat_slots,
+    max_missed=settings.ws_heartbeat_max_missed,
+)
+manager.room_releasers.append(heartbeats.forget_room)
@@ -0,0 +1,53 @@
+import asyncio
+from app.config import settings
+from app.ws.manager import manager
+
+
+class RoomHibernator:
+    """
+    Releases per-room state of rooms that have been quiet for `idle_seconds` (no connects,
+    no broadcasts). Without it, nothing per-room was ever reclaimed except on disconnect or
+    room deletion. Caches added later register a release hook in `manager.room_releasers`
+    and get the same treatment for free.
+    """
+
+    def __init__(self, idle_seconds: float, interval: float):
+        self.idle_seconds = idle_seconds
+        self.interval = interval
+        self.hibernated = 0
+        self._task: asyncio.Task | None = None
+
+    def sweep(self) -> int:
+        rooms = manager.idle_rooms(self.idle_seconds)
+        for room_id in rooms:
+            manager.hibernate(room_id)
+        self.hibernated += len(rooms)
+        return len(rooms)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.sweep()
+            except Exception:
+                pass  # Try again next interval
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Shared instance, same pattern as the WebSocket `manager`
+room_hibernator = RoomHibernator(
+    idle_seconds=settings.room_idle_hibernate_seconds,
+    interval=settings.room_hibernate_sweep_interval_seconds,
+)
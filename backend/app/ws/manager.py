@@ -1,5 +1,11 @@
+import asyncio
+import time
 from collections import defaultdict
+from typing import Callable
 from fastapi import WebSocket
+from app.config import settings
+from app.tracing import tracer
+from app.compression import deflate_frame
 import json
 
 
@@ -8,24 +14,51 @@ class ConnectionManager:
         # Maps room_id → list of (websocket, user_dict) tuples
         # defaultdict means we don't need to check if a room key exists before appending
         self.rooms: dict[str, list[tuple[WebSocket, dict]]] = defaultdict(list)
+        # Joins waiting to be announced in one batch, and the flush timer per room (see announce_join)
+        self._pending_joins: dict[str, list[tuple[WebSocket, dict]]] = defaultdict(list)
+        self._presence_flush: dict[str, asyncio.TimerHandle] = {}
+        # Sockets whose client can inflate binary deflate frames, and rooms that opted out of compression
+        self.deflate_sockets: set[WebSocket] = set()
+        self.uncompressed_rooms: set[str] = set()
+        # Card edit leases: room_id → card_id → {user_id, display_name, ws, expires (monotonic)}
+        self.focus: dict[str, dict[str, dict]] = defaultdict(dict)
+        # Told about every room broadcast as (room_id, message) — e.g. the dashboard feed. Must not block.
+        self.observers: list[Callable[[str, dict], None]] = []
+        # room_id → monotonic time of its last event; rooms idle past ROOM_IDLE_HIBERNATE_SECONDS hibernate
+        self.last_active: dict[str, float] = {}
+        # Per-room caches kept outside the manager register a release hook here (see hibernate)
+        self.room_releasers: list[Callable[[str], None]] = []
+        # Column-scoped subscriptions: room_id → column_id → sockets, and each scoped socket's columns.
+        # Sockets absent from `subscribed` never asked for scoping and get every card event.
+        self.column_subscribers: dict[str, dict[str, set[WebSocket]]] = defaultdict(lambda: defaultdict(set))
+        self.subscribed: dict[WebSocket, set[str]] = {}
 
-    async def connect(self, websocket: WebSocket, room_id: str, user: dict):
+    async def connect(self, websocket: WebSocket, room_id: str, user: dict, deflate: bool = False):
         """Accept the connection and register it under the given room."""
         await websocket.accept()
-        # Close and evict any stale connection for this user before registering new one
-        for ws, u in self.rooms[room_id]:
-            if u["id"] == user["id"]:
-                try:
-                    await ws.close(code=1000)
-                except Exception:
-                    pass  # Already closed, ignore
-        self.rooms[room_id] = [
-            (ws, u) for ws, u in self.rooms[room_id] if u["id"] != user["id"]
-        ]
+        self.last_active[room_id] = time.monotonic()
+        if deflate:
+            self.deflate_sockets.add(websocket)
+        # Close and evict any stale connection for this user before registering new one.
+        # Same cleanup as a disconnect — its later leave() is a no-op, so nothing else would
+        # drop its subscriptions, deflate flag or edit leases.
+        stale = [ws for ws, u in self.rooms[room_id] if u["id"] == user["id"]]
+        released = []
+        for ws in stale:
+            self.disconnect(ws, room_id)
+            released += self.release_focus(ws, room_id)
+            try:
+                await ws.close(code=1000)
+            except Exception:
+                pass  # Already closed, ignore
         self.rooms[room_id].append((websocket, user))
+        if released:
+            await self.broadcast(room_id, {"type": "focus_expired", "card_ids": released})
 
     def disconnect(self, websocket: WebSocket, room_id: str):
         """Remove this connection from the room registry. Called on disconnect."""
+        self.deflate_sockets.discard(websocket)
+        self.subscribe_all(websocket, room_id)
         self.rooms[room_id] = [
             (ws, u) for ws, u in self.rooms[room_id] if ws != websocket
         ]
@@ -33,26 +66,345 @@ class ConnectionManager:
         if not self.rooms[room_id]:
             del self.rooms[room_id]
 
+    def is_connected(self, websocket: WebSocket, room_id: str) -> bool:
+        return any(ws == websocket for ws, _ in self.rooms.get(room_id, []))
+
+    async def leave(self, websocket: WebSocket, room_id: str):
+        """
+        Deregister a connection and tell the room the user left.
+        Safe to call more than once for the same socket (e.g. heartbeat eviction
+        followed by the receive loop noticing the disconnect) — only the first call does anything.
+        """
+        if not self.is_connected(websocket, room_id):
+            return
+        user_id = next(u["id"] for ws, u in self.rooms[room_id] if ws == websocket)
+        self.disconnect(websocket, room_id)
+        # Whatever this socket was editing is free again — no ghost "is editing" indicators
+        released = self.release_focus(websocket, room_id)
+        if released:
+            await self.broadcast(room_id, {"type": "focus_expired", "card_ids": released})
+        # Only broadcast user_left if this user has no other active connection in the room
+        still_connected = any(u["id"] == user_id for _, u in self.rooms.get(room_id, []))
+        if not still_connected:
+            await self.broadcast(room_id, {
+                "type": "user_left",
+                "user_id": user_id
+            })
+
+    async def announce_join(self, websocket: WebSocket, room_id: str, user: dict, coalesce: bool = False):
+        """
+        Tell the room a user joined and give the newcomer the presence snapshot.
+        Normally that's one `user_joined` to everyone else plus one `presence` to the newcomer.
+        During a reconnect storm (`coalesce=True`) that is O(n²) messages, so joins are parked
+        and flushed once per window instead: newcomers get a single `presence` snapshot and
+        everyone already in the room gets a single `users_joined` listing the whole batch.
+        """
+        if not coalesce:
+            await self.broadcast_except(room_id, websocket, {
+                "type": "user_joined",
+                "user": user
+            })
+            await self.send_personal(websocket, {
+                "type": "presence",
+                "users": self.get_users(room_id),
+                "focus": self.focus_snapshot(room_id)
+            }, room_id)
+            return
+
+        self._pending_joins[room_id].append((websocket, user))
+        if room_id not in self._presence_flush:
+            loop = asyncio.get_running_loop()
+            self._presence_flush[room_id] = loop.call_later(
+                settings.ws_presence_coalesce_ms / 1000,
+                lambda: asyncio.ensure_future(self._flush_joins(room_id)),
+            )
+
+    async def _flush_joins(self, room_id: str):
+        self._presence_flush.pop(room_id, None)
+        batch = self._pending_joins.pop(room_id, [])
+        newcomers = {ws for ws, _ in batch}
+        joined = [u for ws, u in batch if self.is_connected(ws, room_id)]
+        if not joined:
+            return
+
+        snapshot = self._encode(room_id, {
+            "type": "presence",
+            "users": self.get_users(room_id),
+            "focus": self.focus_snapshot(room_id),
+        })
+        delta_message = {"type": "users_joined", "users": joined}
+        self._notify(room_id, delta_message)
+        delta = self._encode(room_id, delta_message)
+        for ws, _ in self.rooms.get(room_id, []):
+            try:
+                await self._send(ws, snapshot if ws in newcomers else delta)
+            except Exception:
+                pass
+
+    async def close_room(self, room_id: str, code: int = 4004):
+        """Disconnect everyone in a room (e.g. it was deleted). Clients see the code and stop reconnecting."""
+        connections = self.rooms.pop(room_id, [])
+        self._notify(room_id, {"type": "room_closed"})
+        self.uncompressed_rooms.discard(room_id)
+        self.focus.pop(room_id, None)
+        self._pending_joins.pop(room_id, None)
+        handle = self._presence_flush.pop(room_id, None)
+        if handle:
+            handle.cancel()
+        self.last_active.pop(room_id, None)
+        self.column_subscribers.pop(room_id, None)
+        for ws, _ in connections:
+            self.deflate_sockets.discard(ws)
+            self.subscribed.pop(ws, None)
+            try:
+                await ws.close(code=code)
+            except Exception:
+                pass
+
+    # ---------- Card focus leases ----------
+
+    def focus_card(self, websocket: WebSocket, room_id: str, user: dict, card_id: str) -> bool:
+        """
+        Take or renew the edit lease on a card for this socket.
+        Returns True when the room needs telling (new lease, or it changed hands), False for a renewal.
+        """
+        lease = self.focus[room_id].get(card_id)
+        renewal = lease is not None and lease["ws"] is websocket
+        self.focus[room_id][card_id] = {
+            "user_id": user["id"],
+            "display_name": user["display_name"],
+            "ws": websocket,
+            "expires": time.monotonic() + settings.ws_focus_lease_seconds,
+        }
+        return not renewal
+
+    def blur_card(self, websocket: WebSocket, room_id: str, card_id: str) -> bool:
+        """Drop the lease if this socket holds it. Returns True if there was one."""
+        leases = self.focus.get(room_id)
+        if not leases or card_id not in leases or leases[card_id]["ws"] is not websocket:
+            return False
+        del leases[card_id]
+        if not leases:
+            del self.focus[room_id]
+        return True
+
+    def release_focus(self, websocket: WebSocket, room_id: str) -> list[str]:
+        """Drop every lease held by a socket (it disconnected). Returns the freed card ids."""
+        leases = self.focus.get(room_id)
+        if not leases:
+            return []
+        released = [card_id for card_id, lease in leases.items() if lease["ws"] is websocket]
+        for card_id in released:
+            del leases[card_id]
+        if not leases:
+            del self.focus[room_id]
+        return released
+
+    def expire_focus(self, now: float | None = None) -> dict[str, list[str]]:
+        """Remove every lease past its expiry, in one pass over all rooms. Returns room_id → freed card ids."""
+        now = time.monotonic() if now is None else now
+        expired: dict[str, list[str]] = {}
+        for room_id, leases in list(self.focus.items()):
+            stale = [card_id for card_id, lease in leases.items() if lease["expires"] <= now]
+            for card_id in stale:
+                del leases[card_id]
+            if stale:
+                expired[room_id] = stale
+            if not leases:
+                del self.focus[room_id]
+        return expired
+
+    def focus_snapshot(self, room_id: str) -> list[dict]:
+        """Current leases for the presence snapshot, so newcomers see who is editing what."""
+        return [
+            {"card_id": card_id, "user_id": lease["user_id"], "display_name": lease["display_name"]}
+            for card_id, lease in self.focus.get(room_id, {}).items()
+        ]
+
+    # ---------- Column-scoped subscriptions ----------
+
+    def subscribe(self, websocket: WebSocket, room_id: str, column_ids: list[str]) -> list[str]:
+        """
+        Scope this socket to card events of the given columns (added to any it already has).
+        Returns the socket's full subscription list.
+        """
+        columns = self.subscribed.setdefault(websocket, set())
+        index = self.column_subscribers[room_id]
+        for column_id in column_ids:
+            if len(columns) >= settings.ws_max_column_subscriptions:
+                break
+            columns.add(column_id)
+            index[column_id].add(websocket)
+        return sorted(columns)
+
+    def unsubscribe(self, websocket: WebSocket, room_id: str, column_ids: list[str]) -> list[str]:
+        """
+        Stop card events for these columns; the socket only gets count-only `column_counts` for them.
+        Unsubscribing from everything still leaves the socket scoped (counts only) — see subscribe_all.
+        """
+        columns = self.subscribed.setdefault(websocket, set())
+        index = self.column_subscribers.get(room_id)
+        for column_id in column_ids:
+            columns.discard(column_id)
+            if index is not None and column_id in index:
+                index[column_id].discard(websocket)
+                if not index[column_id]:
+                    del index[column_id]
+        if index is not None and not index:
+            del self.column_subscribers[room_id]
+        return sorted(columns)
+
+    def subscribe_all(self, websocket: WebSocket, room_id: str):
+        """Drop the socket's scoping: it gets every card event again (the default)."""
+        columns = self.subscribed.get(websocket)
+        if columns is None:
+            return
+        self.unsubscribe(websocket, room_id, list(columns))
+        del self.subscribed[websocket]
+
+    def _wants(self, websocket: WebSocket, interested: set[WebSocket]) -> bool:
+        return websocket not in self.subscribed or websocket in interested
+
+    def set_compression(self, room_id: str, enabled: bool):
+        """Per-room switch — latency-sensitive rooms can skip compression entirely."""
+        if enabled:
+            self.uncompressed_rooms.discard(room_id)
+        else:
+            self.uncompressed_rooms.add(room_id)
+
+    # ---------- Idle-room hibernation ----------
+
+    def idle_rooms(self, idle_seconds: float, now: float | None = None) -> list[str]:
+        """Rooms with no connect, broadcast or heartbeat ack for at least `idle_seconds`."""
+        cutoff = (time.monotonic() if now is None else now) - idle_seconds
+        return [room_id for room_id, last in self.last_active.items() if last <= cutoff]
+
+    def hibernate(self, room_id: str):
+        """
+        Release a quiet room's per-room state. Sockets that are still connected stay; only what
+        is rebuilt on demand goes — empty lease and join buckets, and, once nobody is connected,
+        the compression opt-out (the next handshake sets it again) and every registered cache.
+        A room people are quietly viewing keeps its caches (e.g. heartbeat RTT histograms).
+        The room wakes up by itself on its next event.
+        """
+        self.last_active.pop(room_id, None)
+        if not self.focus.get(room_id):
+            self.focus.pop(room_id, None)
+        if not self._pending_joins.get(room_id):
+            self._pending_joins.pop(room_id, None)
+        if room_id not in self.rooms:
+            self.uncompressed_rooms.discard(room_id)
+        if not self.column_subscribers.get(room_id):
+            self.column_subscribers.pop(room_id, None)
+        if room_id in self.rooms:
+            return
+        for release in self.room_releasers:
+            try:
+                release(room_id)
+            except Exception:
+                pass  # One cache failing to let go mustn't keep the others
+
+    def mark_active(self, room_id: str):
+        """Stamp activity that isn't a room event — e.g. a heartbeat ack from someone viewing the board."""
+        self.last_active[room_id] = time.monotonic()
+
+    async def notify(self, room_id: str, message: dict):
+        """
+        Tell the observers (e.g. the dashboard) about a change no socket is sent — REST card
+        writes, which clients pick up on their next load. Async so BackgroundTasks runs it on the loop.
+        """
+        self._notify(room_id, message)
+
+    def _notify(self, room_id: str, message: dict):
+        # Every room event passes through here, so this is also where activity is stamped
+        self.last_active[room_id] = time.monotonic()
+        for observer in self.observers:
+            try:
+                observer(room_id, message)
+            except Exception:
+                pass  # An observer bug must never break a room broadcast
+
+    def _encode(self, room_id: str, message: dict) -> tuple[str, bytes | None]:
+        """
+        Serialise once per message, and — if it's big enough and the room allows it — deflate
+        once too, so a broadcast costs one compression no matter how many sockets receive it.
+        """
+        text = json.dumps(message)
+        if len(text) < settings.ws_compress_min_bytes or room_id in self.uncompressed_rooms:
+            return text, None
+        return text, deflate_frame(text)
+
+    async def _send(self, ws: WebSocket, frame: tuple[str, bytes | None]):
+        text, compressed = frame
+        if compressed is not None and ws in self.deflate_sockets:
+            await ws.send_bytes(compressed)
+        else:
+            await ws.send_text(text)
+
     def get_users(self, room_id: str) -> list[dict]:
         """Return the list of user dicts currently connected to a room."""
         return [user for _, user in self.rooms.get(room_id, [])]
 
     async def broadcast(self, room_id: str, message: dict):
         """Send a message to ALL connections in a room."""
-        payload = json.dumps(message)
-        for ws, _ in self.rooms.get(room_id, []):
-            await ws.send_text(payload)
+        conns = self.rooms.get(room_id, [])
+        self._notify(room_id, message)
+        with tracer.span("ws.broadcast", type=message.get("type"), recipients=len(conns)):
+            frame = self._encode(room_id, message)
+            for ws, _ in conns:
+                try:
+                    await self._send(ws, frame)
+                except Exception:
+                    pass  # Dead socket — the heartbeat monitor will evict it, don't starve the rest of the room
+
+    async def broadcast_card(self, room_id: str, message: dict, deltas: dict[str, int]):
+        """
+        Send a card event to the connections that want it: unscoped sockets and those subscribed
+        to any column it touches. `deltas` maps each touched column to its card-count change (0 for
+        edits and re-tags); a cross-column move lists both columns, so each side sees it. Everyone
+        else gets one count-only `column_counts` with the non-zero changes, or nothing at all.
+        """
+        conns = self.rooms.get(room_id, [])
+        self._notify(room_id, message)
+        index = self.column_subscribers.get(room_id, {})
+        interested: set[WebSocket] = set()
+        for column_id in deltas:
+            interested |= index.get(column_id, set())
+        counts = {column_id: delta for column_id, delta in deltas.items() if delta}
+        with tracer.span("ws.broadcast", type=message.get("type"), recipients=len(conns)):
+            frame = self._encode(room_id, message)
+            count_frame = self._encode(room_id, {"type": "column_counts", "deltas": counts}) if counts else None
+            for ws, _ in conns:
+                chosen = frame if self._wants(ws, interested) else count_frame
+                if chosen is None:
+                    continue
+                try:
+                    await self._send(ws, chosen)
+                except Exception:
+                    pass
 
     async def broadcast_except(self, room_id: str, exclude: WebSocket, message: dict):
         """Send a message to all connections in a room EXCEPT the sender."""
-        payload = json.dumps(message)
-        for ws, _ in self.rooms.get(room_id, []):
-            if ws != exclude:
-                await ws.send_text(payload)
+        conns = self.rooms.get(room_id, [])
+        self._notify(room_id, message)
+        with tracer.span("ws.broadcast", type=message.get("type"), recipients=len(conns) - 1):
+            frame = self._encode(room_id, message)
+            for ws, _ in conns:
+                if ws != exclude:
+                    try:
+                        await self._send(ws, frame)
+                    except Exception:
+                        pass
 
-    async def send_personal(self, websocket: WebSocket, message: dict):
-        """Send a message to a single connection (e.g. pong, presence snapshot)."""
-        await websocket.send_text(json.dumps(message))
+    async def send_personal(self, websocket: WebSocket, message: dict, room_id: str | None = None):
+        """
+        Send a message to a single connection (e.g. pong, presence snapshot).
+        Pass room_id for messages that can be large, so the room's compression setting applies.
+        """
+        if room_id is None:
+            await websocket.send_text(json.dumps(message))
+        else:
+            await self._send(websocket, self._encode(room_id, message))
 
 
 # Single shared instance — imported by the router and handlers
@@ -1,81 +1,181 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeout
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.auth.utils import verify_access_token
-from app.models import User, RoomMember
+from app.models import User, Room, RoomMember
 from app.ws.manager import manager
+from app.ws.heartbeat import heartbeats
+from app.ws.admission import admission, AdmissionRejected, CLOSE_RETRY_LATER
 from app.ws.handlers import handle_message
+from app.ws.tickets import read_ticket
+from app.ws.drain import drainer
+from app.timeouts import shed, timeout_reason
+from app.ws.dashboard import dashboard, summary_payload
+from app.rooms.summary import query_summaries
+from app.query_stats import query_stats
+from app.tracing import tracer
 
 router = APIRouter()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        return db
-    finally:
-        pass  # We'll close manually below to keep session alive for async scope
+async def authenticate_user(websocket: WebSocket, db: Session) -> User | None:
+    """Validate the JWT from the query param. On failure closes the socket (4001) and returns None."""
+    token = websocket.query_params.get("token")
+    if not token:
+        await websocket.close(code=4001)
+        return None
 
+    with tracer.span("auth.jwt"):
+        user_id = verify_access_token(token)
+    if not user_id:
+        await websocket.close(code=4001)
+        return None
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        await websocket.close(code=4001)
+        return None
+    return user
 
-@router.websocket("/ws/{room_id}")
-async def websocket_endpoint(websocket: WebSocket, room_id: str):
-    db: Session = SessionLocal()
-    user = None
-    try:
-        # --- Auth: validate JWT from query param ---
-        token = websocket.query_params.get("token")
-        if not token:
-            await websocket.close(code=4001)
-            return
 
-        user_id = verify_access_token(token)
-        if not user_id:
-            await websocket.close(code=4001)
-            return
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
+async def authenticate(websocket: WebSocket, room_id: str, db: Session) -> dict | None:
+    """
+    Identify the user and verify room membership.
+    Preferred: `?ticket=` from POST /api/rooms/{room_id}/ws-ticket, checked with no DB queries.
+    Fallback for older clients: `?token=` (the access JWT) plus a user and a membership lookup.
+    Returns the user dict on success; on failure closes the socket and returns None.
+    """
+    ticket = websocket.query_params.get("ticket")
+    if ticket:
+        with tracer.span("auth.ticket"):
+            claims = read_ticket(ticket, room_id)
+        if not claims:
             await websocket.close(code=4001)
-            return
+            return None
+        manager.set_compression(room_id, claims.get("wsc", True))
+        return {"id": claims["sub"], "display_name": claims["name"]}
+
+    user = await authenticate_user(websocket, db)
+    if not user:
+        return None
+    user_id = user.id
 
-        # --- Authorization: verify room membership ---
-        member = db.query(RoomMember).filter(
+    # --- Authorization: verify room membership ---
+    with tracer.span("auth.membership"):
+        member = db.query(RoomMember.id, Room.ws_compression).join(Room, Room.id == RoomMember.room_id).filter(
             RoomMember.room_id == room_id,
-            RoomMember.user_id == user_id
+            RoomMember.user_id == user_id,
+            Room.deleted_at.is_(None)
         ).first()
-        if not member:
-            await websocket.close(code=4003)
-            return
+    if not member:
+        await websocket.close(code=4003)
+        return None
+    # Piggybacks on the membership query so the manager knows the room's compression setting
+    manager.set_compression(room_id, member.ws_compression)
 
-        # --- Connect and broadcast presence ---
-        user_dict = {"id": str(user.id), "display_name": user.display_name}
-        await manager.connect(websocket, room_id, user_dict)
+    return {"id": str(user.id), "display_name": user.display_name}
 
-        # Tell everyone else this user joined
-        await manager.broadcast_except(room_id, websocket, {
-            "type": "user_joined",
-            "user": user_dict
-        })
 
-        # Send current presence snapshot to the newly connected client
-        await manager.send_personal(websocket, {
-            "type": "presence",
-            "users": manager.get_users(room_id)
-        })
+# Declared before /ws/{room_id} so "user" isn't taken for a room id
+@router.websocket("/ws/user")
+async def user_channel(websocket: WebSocket):
+    """
+    Per-user dashboard channel: a `summary` snapshot of all the user's rooms on connect,
+    then `room_summary` / `room_online` / `room_removed` deltas as boards change.
+    """
+    if drainer.draining:
+        await drainer.refuse(websocket)
+        return
+    with SessionLocal() as db:
+        with query_stats.track("WS user connect"):
+            user = await authenticate_user(websocket, db)
+            if not user:
+                return
+            user_id = str(user.id)
+            summaries = query_summaries(db, user_id=user.id)
+
+    await websocket.accept()
+    dashboard.subscribe(websocket, user_id, [s["id"] for s in summaries])
+    try:
+        await websocket.send_json({"type": "summary", "rooms": [summary_payload(s) for s in summaries]})
+        while True:
+            data = await websocket.receive_json()
+            if data.get("type") == "ping":
+                await websocket.send_json({"type": "pong"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        dashboard.unsubscribe(websocket, user_id)
+
+
+@router.websocket("/ws/{room_id}")
+async def websocket_endpoint(websocket: WebSocket, room_id: str):
+    if drainer.draining:
+        # Shutting down — send the client elsewhere before it costs a handshake
+        await drainer.refuse(websocket)
+        return
+    db: Session = SessionLocal()
+    user_dict = None
+    try:
+        # --- Handshake: auth + connect + presence, behind the admission cap ---
+        try:
+            with tracer.trace("WS connect", room_id=room_id) as root:
+                async with admission.slot():
+                    if root is not None:
+                        # Time spent queued behind other handshakes
+                        root.attrs["admission_wait_ms"] = round(root.duration_ms, 3)
+                    label = "WS connect" if "ticket" in websocket.query_params else "WS connect (token)"
+                    with query_stats.track(label), tracer.span("ws.authenticate"):
+                        user_dict = await authenticate(websocket, room_id, db)
+                    if not user_dict:
+                        return
+                    db.info["user_id"] = user_dict["id"]
+                    await manager.connect(websocket, room_id, user_dict,
+                                          deflate=websocket.query_params.get("compress") == "deflate")
+                    heartbeats.track(websocket, room_id)
+                    # During a reconnect storm, joins are folded into one batched presence update
+                    with tracer.span("ws.announce_join"):
+                        await manager.announce_join(websocket, room_id, user_dict, coalesce=admission.storming)
+        except AdmissionRejected as exc:
+            # Accept first so the client actually sees the close code and retry hint
+            await websocket.accept()
+            await websocket.close(code=CLOSE_RETRY_LATER, reason=f"retry_after={exc.retry_after}")
+            return
+        except (OperationalError, PoolTimeout) as exc:
+            # The token handshake's lookups hit a database limit — same back-off as admission
+            reason = timeout_reason(exc)
+            if reason is None:
+                raise
+            await websocket.accept()
+            await websocket.close(code=CLOSE_RETRY_LATER, reason=f"retry_after={shed.record('WS connect (token)', reason)}")
+            return
 
         # --- Main receive loop ---
         while True:
             data = await websocket.receive_json()
-            await handle_message(websocket, room_id, user_dict, data, db)
+            heartbeats.touch(websocket)
+            label = f"WS {data.get('type')}"
+            with tracer.trace(label, room_id=room_id, user_id=user_dict["id"]), query_stats.track(label):
+                try:
+                    await handle_message(websocket, room_id, user_dict, data, db)
+                except (OperationalError, PoolTimeout) as exc:
+                    # A database limit fired: nothing was applied, so tell the sender to retry
+                    # rather than dropping the socket (and the whole room's view of it)
+                    reason = timeout_reason(exc)
+                    if reason is None:
+                        raise
+                    db.rollback()
+                    await manager.send_personal(websocket, {
+                        "type": "busy",
+                        "op": data.get("type"),
+                        "reason": reason,
+                        "retry_after": shed.record(label, reason),
+                    })
 
     except WebSocketDisconnect:
-        if user:
-            manager.disconnect(websocket, room_id)
-            # Only broadcast user_left if this user has no other active connection in the room
-            still_connected = any(u["id"] == str(user.id) for _, u in manager.rooms.get(room_id, []))
-            if not still_connected:
-                await manager.broadcast(room_id, {
-                    "type": "user_left",
-                    "user_id": str(user.id)
-                })
+        if user_dict:
+            # No-op if the heartbeat monitor already evicted this socket
+            await manager.leave(websocket, room_id)
     finally:
-        db.close()
\ No newline at end of file
+        heartbeats.untrack(websocket)
+        db.close()
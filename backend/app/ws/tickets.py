@@ -0,0 +1,71 @@
+import time
+from jose import jwt, JWTError
+from app.config import settings
+
+# Audience claim that marks a JWT as a connect ticket. Access tokens don't carry it, and
+# python-jose rejects a token with an audience when none is expected, so neither kind can stand in for the other.
+TICKET_AUDIENCE = "ws-ticket"
+
+
+def issue_ticket(user_id: str, display_name: str, room_id: str, ws_compression: bool) -> str:
+    """
+    Sign a connect ticket for one room. Everything the handshake needs — who, their name,
+    that membership was checked, the room's compression setting — rides in the ticket,
+    so /ws/{room_id} can accept the socket without touching the database.
+    """
+    now = time.time()
+    payload = {
+        "sub": user_id,
+        "name": display_name,
+        "room": room_id,
+        "wsc": ws_compression,
+        "aud": TICKET_AUDIENCE,
+        # Float issue time (iat is whole seconds) so a revocation in the same second still wins
+        "its": now,
+        "exp": int(now + settings.ws_ticket_ttl_seconds),
+    }
+    return jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+
+
+def read_ticket(ticket: str, room_id: str) -> dict | None:
+    """Validate a ticket for this room: signature, expiry, audience, room and deny-list. Returns the claims or None."""
+    try:
+        claims = jwt.decode(ticket, settings.jwt_secret, algorithms=[settings.jwt_algorithm], audience=TICKET_AUDIENCE)
+    except JWTError:
+        return None
+    if claims.get("room") != room_id or not claims.get("sub"):
+        return None
+    if deny_list.denied(room_id, claims.get("its", 0)):
+        return None
+    return claims
+
+
+class TicketDenyList:
+    """
+    Room-wide revocations that must beat tickets already handed out (the room was deleted).
+    A ticket issued before the revocation is refused. Entries only need to outlive the
+    ticket TTL — after that every older ticket has expired anyway — so the list stays tiny.
+    Members can't be removed from a room yet, so there is no per-member revocation.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        # room_id → revocation time
+        self.revoked: dict[str, float] = {}
+
+    def revoke(self, room_id: str):
+        self.prune()
+        self.revoked[room_id] = time.time()
+
+    def denied(self, room_id: str, issued_at: float) -> bool:
+        revoked_at = self.revoked.get(room_id)
+        return revoked_at is not None and issued_at <= revoked_at
+
+    def prune(self):
+        cutoff = time.time() - self.ttl
+        for key in [k for k, at in self.revoked.items() if at < cutoff]:
+            del self.revoked[key]
+
+
+# Shared instance, same pattern as the WebSocket `manager`
+deny_list = TicketDenyList(ttl=settings.ws_ticket_ttl_seconds)
@@ -0,0 +1,99 @@
+"""
+Board operation latencies against a generated dataset (see bench.generate): full board
+load (GET /api/rooms/{id}), a cross-column card move and back (PATCH .../cards/{id}),
+and ranked search — in-process through the real app, middleware included.
+
+    cd backend
+    DATABASE_URL=sqlite:///./bench.db python -m bench.generate --create-schema --cards 100000
+    DATABASE_URL=sqlite:///./bench.db python -m bench.board_ops --repeat 20
+
+Defaults to the room with the most cards, acting as its creator.
+"""
+import argparse
+import logging
+import statistics
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select, func
+
+from app.auth.utils import create_access_token
+from app.database import SessionLocal
+from app.main import app
+from app.models import Room, Column
+
+
+def pick_room(room_id: str | None):
+    with SessionLocal() as db:
+        query = (
+            select(Room.id, Room.created_by, func.sum(Column.card_count).label("cards"))
+            .join(Column, Column.room_id == Room.id)
+            .where(Room.deleted_at.is_(None))
+            .group_by(Room.id, Room.created_by)
+        )
+        if room_id:
+            query = query.where(Room.id == room_id)
+        return db.execute(query.order_by(func.sum(Column.card_count).desc()).limit(1)).one()
+
+
+def timed(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name: str, samples: list[float]):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"{name:<26}p50 {statistics.median(samples):>9.1f} ms   p95 {p95:>9.1f} ms   n={len(samples)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--room", help="room id (default: the largest room)")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--query", default="deploy review")
+    args = parser.parse_args()
+
+    # Everything here is "slow" at scale — the per-op slow log would drown the results
+    logging.getLogger("syncboard.slow").setLevel(logging.ERROR)
+    room_id, owner_id, cards = pick_room(args.room)
+    headers = {"Authorization": f"Bearer {create_access_token(str(owner_id))}"}
+    base = f"/api/rooms/{room_id}"
+    print(f"room {room_id}: {cards:,} cards")
+
+    with TestClient(app) as client:
+        def load():
+            resp = client.get(base, headers=headers)
+            resp.raise_for_status()
+            return resp
+
+        first = load()
+        board = first.json()
+        print(f"board payload: {len(first.content) / 1024:,.0f} KiB")
+        report("GET room", timed(load, args.repeat))
+
+        columns = [c for c in board["columns"] if c["cards"]]
+        source = max(columns, key=lambda c: c["card_count"])
+        target = next(c for c in board["columns"] if c["id"] != source["id"])
+        card_id = source["cards"][0]["id"]
+        toggle = [source["id"], target["id"]]
+
+        def move():
+            toggle.reverse()
+            client.patch(f"{base}/cards/{card_id}", headers=headers,
+                         json={"column_id": toggle[0], "position": 0}).raise_for_status()
+
+        report("PATCH card (move)", timed(move, args.repeat * 2))
+
+        def search():
+            client.get(f"{base}/cards/search", headers=headers, params={"q": args.query}).raise_for_status()
+
+        report(f"search {args.query!r}", timed(search, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Cold-start budget check: how long a fresh backend process takes to accept connections
+(/api/health) and to report ready (/api/ready), plus the bare `import app.main` cost.
+Exits non-zero when the time to ready exceeds --budget-ms, so CI or a deploy script
+can enforce the budget.
+
+    cd backend
+    python -m bench.cold_start --budget-ms 3000
+    DATABASE_URL=sqlite:///./bench.db SCHEMA_CHECK=skip python -m bench.cold_start
+
+Uses whatever DATABASE_URL the environment points at; the database must already be
+migrated (or pass SCHEMA_CHECK=skip), otherwise /api/ready never turns 200.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(url: str, deadline: float) -> float | None:
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=0.5) as resp:
+                if resp.status == 200:
+                    return time.perf_counter()
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.01)
+    return None
+
+
+def import_ms() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import app.main"], check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def boot_once(timeout: float) -> tuple[float | None, float | None]:
+    port = free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=os.environ.copy(),
+    )
+    try:
+        deadline = start + timeout
+        live = wait_for(f"http://127.0.0.1:{port}/api/health", deadline)
+        ready = wait_for(f"http://127.0.0.1:{port}/api/ready", deadline) if live else None
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    to_ms = lambda t: None if t is None else (t - start) * 1000
+    return to_ms(live), to_ms(ready)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, default=3000.0, help="max median time from spawn to /api/ready")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    imports = [import_ms() for _ in range(args.runs)]
+    boots = [boot_once(args.timeout) for _ in range(args.runs)]
+    print(f"import app.main (fresh interpreter): median {statistics.median(imports):.0f} ms")
+    for i, (live, ready) in enumerate(boots, 1):
+        if live is None:
+            print(f"run {i}: TIMEOUT — never accepted connections within {args.timeout:.0f} s")
+            continue
+        print(f"run {i}: accepting connections after {live:.0f} ms, ready after "
+              + (f"{ready:.0f} ms" if ready is not None else "TIMEOUT"))
+
+    readies = [ready for _, ready in boots]
+    if any(r is None for r in readies):
+        print("FAIL: /api/ready never returned 200 — is the database migrated? (python -m app.migrate)")
+        return 1
+    median = statistics.median(readies)
+    verdict = "OK" if median <= args.budget_ms else "FAIL"
+    print(f"{verdict}: median time to ready {median:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    return 0 if verdict == "OK" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
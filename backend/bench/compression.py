@@ -0,0 +1,124 @@
+"""
+Compression benchmark: CPU time vs bytes saved for a large board payload.
+Builds a synthetic GET /api/rooms/{id} response in-process (no database needed) and
+compresses it with every available codec at a few levels, then compares per-socket
+WebSocket deflate (what permessage-deflate does) with deflating once per broadcast.
+
+    cd backend
+    python -m bench.compression --cards 20000 --sockets 200
+"""
+import argparse
+import gzip
+import json
+import random
+import statistics
+import time
+import uuid
+import zlib
+from datetime import datetime, timezone
+
+from app.compression import CompressionCache, brotli, zstandard
+
+WORDS = (
+    "fix update login page api bug refactor deploy review test card board column drag drop "
+    "socket presence cache index query migrate docs release sprint backlog design mobile"
+).split()
+
+
+def make_board(cards: int, columns: int) -> bytes:
+    now = datetime.now(timezone.utc).isoformat()
+    owner = str(uuid.uuid4())
+    cols = []
+    for c in range(columns):
+        cols.append({
+            "id": str(uuid.uuid4()),
+            "title": f"Column {c}",
+            "position": c * 1024,
+            "card_count": cards // columns,
+            "auto_archive_days": None,
+            "cards": [
+                {
+                    "id": str(uuid.uuid4()),
+                    "column_id": "",
+                    "title": " ".join(random.choices(WORDS, k=random.randint(2, 7))),
+                    "description": " ".join(random.choices(WORDS, k=random.randint(0, 30))),
+                    "position": i,
+                    "created_by": owner,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(cards // columns)
+            ],
+        })
+    board = {"id": str(uuid.uuid4()), "name": "Bench", "room_code": "BENCH123",
+             "created_by": owner, "created_at": now, "ws_compression": True, "columns": cols}
+    return json.dumps(board).encode()
+
+
+def timed(fn, reps: int) -> tuple[float, object]:
+    samples, result = [], None
+    for _ in range(reps):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def codecs():
+    yield "gzip-1", lambda d: gzip.compress(d, 1, mtime=0), gzip.decompress
+    yield "gzip-6", lambda d: gzip.compress(d, 6, mtime=0), gzip.decompress
+    yield "gzip-9", lambda d: gzip.compress(d, 9, mtime=0), gzip.decompress
+    if brotli is not None:
+        for q in (1, 5, 11):
+            yield f"br-{q}", (lambda q: lambda d: brotli.compress(d, quality=q))(q), brotli.decompress
+    if zstandard is not None:
+        for lvl in (1, 3, 10):
+            yield (f"zstd-{lvl}", (lambda lvl: lambda d: zstandard.ZstdCompressor(level=lvl).compress(d))(lvl),
+                   zstandard.ZstdDecompressor().decompress)
+
+
+def deflate_raw(data: bytes, level: int) -> bytes:
+    c = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return c.compress(data) + c.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cards", type=int, default=20000)
+    parser.add_argument("--columns", type=int, default=4)
+    parser.add_argument("--sockets", type=int, default=200, help="room size for the WebSocket fan-out comparison")
+    parser.add_argument("--reps", type=int, default=5)
+    args = parser.parse_args()
+
+    body = make_board(args.cards, args.columns)
+    print(f"Board: {args.cards} cards, {len(body) / 1024:.0f} KiB uncompressed JSON")
+    if brotli is None or zstandard is None:
+        print("(brotli/zstandard not installed — those codecs are skipped)")
+    print(f"{'codec':<9} {'KiB':>8} {'ratio':>6} {'compress ms':>12} {'decompress ms':>14} {'MB/s':>7}")
+    for name, compress, decompress in codecs():
+        ms, packed = timed(lambda: compress(body), args.reps)
+        dms, _ = timed(lambda: decompress(packed), args.reps)
+        print(f"{name:<9} {len(packed) / 1024:>8.0f} {len(body) / len(packed):>6.1f} {ms:>12.2f} {dms:>14.2f} "
+              f"{len(body) / 1e6 / (ms / 1000):>7.0f}")
+
+    cache = CompressionCache(64 * 1024 * 1024)
+    digest = "bench"
+    miss_ms, _ = timed(lambda: CompressionCache(64 * 1024 * 1024).get_or_compress(digest, "gzip", body), args.reps)
+    cache.get_or_compress(digest, "gzip", body)
+    hit_ms, _ = timed(lambda: cache.get_or_compress(digest, "gzip", body), args.reps)
+    print(f"\nRepeat board load, gzip: {miss_ms:.2f} ms compressing vs {hit_ms:.4f} ms from the compression cache")
+
+    # A presence snapshot / bulk message of a few KiB, fanned out to every socket in the room
+    message = json.dumps({"type": "presence", "users": [
+        {"id": str(uuid.uuid4()), "display_name": f"user-{i}"} for i in range(args.sockets)
+    ]}).encode()
+    per_socket_ms, _ = timed(lambda: [deflate_raw(message, 6) for _ in range(args.sockets)], args.reps)
+    once_ms, packed = timed(lambda: deflate_raw(message, 6), args.reps)
+    print(f"\nWS fan-out of a {len(message) / 1024:.1f} KiB message to {args.sockets} sockets "
+          f"({len(packed) / 1024:.1f} KiB deflated):")
+    print(f"  per-socket deflate (permessage-deflate): {per_socket_ms:.2f} ms CPU")
+    print(f"  deflate once per broadcast:              {once_ms:.2f} ms CPU")
+
+
+if __name__ == "__main__":
+    main()
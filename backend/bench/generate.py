@@ -0,0 +1,200 @@
+"""
+Synthetic large-board generator: bulk-creates users, rooms, members, columns and cards
+with realistic skew, so get_room, card moves and search can be measured at 10k–1M-card
+scale. Card counts per room and per column are heavy-tailed (a few huge boards, a
+"Done" column that dwarfs the rest), descriptions are mostly short with a long tail,
+and membership sizes are log-normal.
+
+Rows go in with batched multi-row Core INSERTs, never ORM object loops, and every
+column's card_count/positions are written consistently with what the app maintains.
+
+    cd backend
+    # Hermetic, no Docker: builds the schema in a SQLite file and stamps it at head
+    DATABASE_URL=sqlite:///./bench.db python -m bench.generate --create-schema --cards 100000
+    # Against the dev Postgres (already migrated)
+    python -m bench.generate --users 5000 --rooms 200 --cards 1000000
+
+Every generated user's password is --password (default "benchpass"), emails are
+bench-<run>-<n>@example.com. The largest room is printed at the end for bench.board_ops.
+"""
+import argparse
+import random
+import string
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+
+from app.auth.utils import hash_password
+from app.database import Base, engine
+from app.models import User, Room, RoomMember, Column, Card
+
+COLUMN_TITLES = ["Backlog", "To Do", "In Progress", "Review", "QA", "Blocked", "Done", "Archive"]
+WORDS = (
+    "fix update login page api bug refactor deploy review test card board column drag drop "
+    "socket presence cache index query migrate docs release sprint backlog design mobile "
+    "onboarding billing invoice export import search filter permission role audit latency "
+    "timeout retry queue worker cron email notification dashboard chart report metric alert"
+).split()
+CODE_CHARS = string.ascii_uppercase.replace("O", "").replace("I", "").replace("L", "") + "23456789"
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=words))
+
+
+def description(rng: random.Random) -> str:
+    """A third of cards have no description; the rest are log-normal, median ~40 words, tail in the thousands."""
+    if rng.random() < 0.33:
+        return ""
+    return sentence(rng, min(int(rng.lognormvariate(3.7, 1.0)) + 1, 5000))
+
+
+def split_skewed(rng: random.Random, total: int, parts: int, alpha: float) -> list[int]:
+    """Split `total` into `parts` Pareto-weighted shares — a few parts get most of it."""
+    weights = [rng.paretovariate(alpha) for _ in range(parts)]
+    scale = total / sum(weights)
+    counts = [int(w * scale) for w in weights]
+    for i in rng.sample(range(parts), total - sum(counts)):
+        counts[i] += 1
+    return counts
+
+
+class BatchWriter:
+    """Buffers rows per table and flushes them as one executemany INSERT per batch."""
+
+    def __init__(self, conn, batch_size: int):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.buffers: dict = {}
+        self.written: dict[str, int] = {}
+
+    def add(self, model, row: dict):
+        rows = self.buffers.setdefault(model, [])
+        rows.append(row)
+        if len(rows) >= self.batch_size:
+            self.flush(model)
+
+    def flush(self, model=None):
+        for m in [model] if model is not None else list(self.buffers):
+            rows = self.buffers.get(m)
+            if rows:
+                self.conn.execute(insert(m), rows)
+                self.written[m.__tablename__] = self.written.get(m.__tablename__, 0) + len(rows)
+                self.buffers[m] = []
+
+
+def generate(args) -> dict:
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc)
+    # bcrypt is deliberately slow — hash once and share it
+    password_hash = hash_password(args.password)
+    run = uuid.uuid4().hex[:6]
+
+    user_ids = [uuid.uuid4() for _ in range(args.users)]
+    cards_per_room = split_skewed(rng, args.cards, args.rooms, alpha=1.2)
+    largest = {"cards": -1}
+
+    with engine.begin() as conn:
+        out = BatchWriter(conn, args.batch_size)
+        for n, user_id in enumerate(user_ids):
+            out.add(User, {
+                "id": user_id,
+                "email": f"bench-{run}-{n}@example.com",
+                "display_name": f"Bench User {n}",
+                "password_hash": password_hash,
+                "created_at": now - timedelta(days=rng.uniform(0, 730)),
+            })
+        out.flush(User)
+
+        codes = set()
+        for r, room_cards in enumerate(cards_per_room):
+            room_id = uuid.uuid4()
+            while (code := "".join(rng.choices(CODE_CHARS, k=8))) in codes:
+                pass
+            codes.add(code)
+            size = max(1, min(args.users, int(rng.lognormvariate(0, 0.8) * args.members)))
+            members = rng.sample(user_ids, size)
+            out.add(Room, {
+                "id": room_id,
+                "name": f"Bench board {r}: {sentence(rng, 2)}",
+                "room_code": code,
+                "created_by": members[0],
+                "created_at": now - timedelta(days=rng.uniform(0, 365)),
+            })
+            for user_id in members:
+                out.add(RoomMember, {"id": uuid.uuid4(), "room_id": room_id, "user_id": user_id})
+
+            n_columns = rng.randint(args.min_columns, args.max_columns)
+            column_cards = split_skewed(rng, room_cards, n_columns, alpha=1.5)
+            # The biggest pile usually sits at the end of the board ("Done")
+            if rng.random() < 0.7:
+                column_cards.append(column_cards.pop(column_cards.index(max(column_cards))))
+            column_ids = [uuid.uuid4() for _ in column_cards]
+            for c, (column_id, count) in enumerate(zip(column_ids, column_cards)):
+                out.add(Column, {
+                    "id": column_id,
+                    "room_id": room_id,
+                    "title": COLUMN_TITLES[c % len(COLUMN_TITLES)],
+                    "position": c * 1024,
+                    "card_count": count,
+                })
+            # Parents must exist before cards reference them
+            out.flush(Room)
+            out.flush(Column)
+            for column_id, count in zip(column_ids, column_cards):
+                for pos in range(count):
+                    created = now - timedelta(days=rng.uniform(0, 365))
+                    out.add(Card, {
+                        "id": uuid.uuid4(),
+                        "column_id": column_id,
+                        "title": sentence(rng, rng.randint(2, 9)),
+                        "description": description(rng),
+                        "position": pos,
+                        "created_by": rng.choice(members),
+                        "created_at": created,
+                        "updated_at": created + timedelta(days=rng.uniform(0, (now - created).days + 1)),
+                    })
+            out.flush(RoomMember)
+            if room_cards > largest["cards"]:
+                largest = {"room_id": str(room_id), "cards": room_cards, "member_email": f"bench-{run}-{user_ids.index(members[0])}@example.com"}
+        out.flush()
+    return {"written": out.written, "largest_room": largest}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--rooms", type=int, default=50)
+    parser.add_argument("--cards", type=int, default=100_000)
+    parser.add_argument("--members", type=int, default=25, help="median members per room")
+    parser.add_argument("--min-columns", type=int, default=3)
+    parser.add_argument("--max-columns", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--password", default="benchpass")
+    parser.add_argument("--create-schema", action="store_true",
+                        help="create all tables from the models and stamp alembic at head (for SQLite)")
+    args = parser.parse_args()
+
+    if args.create_schema:
+        from app.migrate import stamp
+
+        Base.metadata.create_all(engine)
+        stamp()
+
+    start = time.perf_counter()
+    result = generate(args)
+    elapsed = time.perf_counter() - start
+    total = sum(result["written"].values())
+    print(f"backend: {engine.dialect.name}")
+    for table, rows in result["written"].items():
+        print(f"  {table:<14}{rows:>10,}")
+    print(f"{total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+    largest = result["largest_room"]
+    print(f"largest room: {largest['room_id']} ({largest['cards']:,} cards), member {largest['member_email']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Reconnect-storm benchmark: N clients reconnect to the same room at the same instant,
+the way they do after a deploy. Runs in-process against the real ConnectionManager and
+HandshakeAdmission with fake sockets, so no database or network is needed.
+
+    cd backend
+    python -m bench.reconnect_storm --clients 5000
+
+Compares the old handshake path (no cap, user_joined + presence per join) with
+admission control + coalesced presence, and reports time-to-fully-reconnected
+plus how many messages/bytes the server had to push.
+"""
+import argparse
+import asyncio
+import time
+
+from app.ws.manager import ConnectionManager
+from app.ws.admission import HandshakeAdmission, AdmissionRejected
+
+
+class CountingSocket:
+    """Stands in for a WebSocket — just counts what the server sends it."""
+
+    def __init__(self):
+        self.messages = 0
+        self.bytes = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload: str):
+        self.messages += 1
+        self.bytes += len(payload)
+
+    async def close(self, code: int = 1000, reason: str | None = None):
+        pass
+
+
+async def run_baseline(clients: int, handshake_ms: float) -> dict:
+    manager = ConnectionManager()
+    sockets = [CountingSocket() for _ in range(clients)]
+
+    async def handshake(i: int, ws: CountingSocket):
+        await asyncio.sleep(handshake_ms / 1000)  # JWT decode + user/member SELECTs
+        user = {"id": str(i), "display_name": f"user-{i}"}
+        await manager.connect(ws, "room", user)
+        await manager.announce_join(ws, "room", user, coalesce=False)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(handshake(i, ws) for i, ws in enumerate(sockets)))
+    elapsed = time.perf_counter() - start
+    return _report("baseline", elapsed, sockets, rejected=0)
+
+
+async def run_admission(clients: int, handshake_ms: float, max_concurrent: int,
+                        max_queue: int, time_scale: float) -> dict:
+    manager = ConnectionManager()
+    admission = HandshakeAdmission(
+        max_concurrent=max_concurrent,
+        max_queue=max_queue,
+        queue_timeout=5.0,
+        retry_after=2.0,
+        storm_joins_per_second=50,
+    )
+    sockets = [CountingSocket() for _ in range(clients)]
+    rejected = 0
+
+    async def handshake(i: int, ws: CountingSocket):
+        nonlocal rejected
+        user = {"id": str(i), "display_name": f"user-{i}"}
+        while True:
+            try:
+                async with admission.slot():
+                    await asyncio.sleep(handshake_ms / 1000)
+                    await manager.connect(ws, "room", user)
+                    await manager.announce_join(ws, "room", user, coalesce=admission.storming)
+                return
+            except AdmissionRejected as exc:
+                # Real clients wait retry_after seconds; compress that so the bench stays quick
+                rejected += 1
+                await asyncio.sleep(exc.retry_after * time_scale)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(handshake(i, ws) for i, ws in enumerate(sockets)))
+    # Wait for the last batched presence update to go out — until then clients aren't fully synced
+    while manager._presence_flush:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    return _report("admission+coalesce", elapsed, sockets, rejected)
+
+
+def _report(mode: str, elapsed: float, sockets: list[CountingSocket], rejected: int) -> dict:
+    return {
+        "mode": mode,
+        "seconds": round(elapsed, 3),
+        "messages": sum(ws.messages for ws in sockets),
+        "megabytes": round(sum(ws.bytes for ws in sockets) / 1e6, 2),
+        "rejected": rejected,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--handshake-ms", type=float, default=5.0, help="simulated JWT + DB cost per handshake")
+    parser.add_argument("--max-concurrent", type=int, default=64)
+    parser.add_argument("--max-queue", type=int, default=1024)
+    parser.add_argument("--time-scale", type=float, default=0.05, help="multiplier applied to retry_after waits")
+    parser.add_argument("--skip-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = []
+    if not args.skip_baseline:
+        results.append(asyncio.run(run_baseline(args.clients, args.handshake_ms)))
+    results.append(asyncio.run(run_admission(
+        args.clients, args.handshake_ms, args.max_concurrent, args.max_queue, args.time_scale,
+    )))
+
+    print(f"{'mode':<20} {'seconds':>9} {'messages':>12} {'MB':>9} {'rejected':>9}")
+    for r in results:
+        print(f"{r['mode']:<20} {r['seconds']:>9} {r['messages']:>12} {r['megabytes']:>9} {r['rejected']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Fast serialization path vs the response_model path it replaced, on a generated dataset
+(see bench.generate).
+
+    cd backend
+    DATABASE_URL=sqlite:///./bench.db python -m bench.generate --create-schema --cards 100000
+    DATABASE_URL=sqlite:///./bench.db python -m bench.serialization --seconds 5
+
+Reads (GET room, GET rooms) are compared end to end in requests/sec: the old implementation
+(ORM load → response_model validation → stdlib json) is mounted next to the real routes
+under /bench/reference. For card create/patch the write itself is identical on both paths,
+so only the response building is compared (ops/sec on a loaded card).
+
+Parity between the two paths is enforced by tests/test_serialization.py, not here.
+"""
+import argparse
+import logging
+import time
+import uuid
+
+import orjson
+from fastapi import Depends
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.auth.dependencies import get_current_reader, get_read_db
+from app.auth.utils import create_access_token
+from app.database import SessionLocal
+from app.main import app
+from app.models import Room, RoomMember, Column, Card, User
+from app.schemas import CardResponse, RoomResponse, RoomDetailResponse
+from app.serialization import card_serializer, ORJSON_OPTIONS
+from bench.board_ops import pick_room
+
+
+# ---------- Reference implementations (the pre-serializer code path) ----------
+
+@app.get("/bench/reference/rooms", response_model=list[RoomResponse], response_class=JSONResponse)
+def reference_list_rooms(db: Session = Depends(get_read_db), current_user: User = Depends(get_current_reader)):
+    return (
+        db.query(Room)
+        .join(RoomMember, Room.id == RoomMember.room_id)
+        .filter(RoomMember.user_id == current_user.id, Room.deleted_at.is_(None))
+        .order_by(Room.created_at.desc())
+        .all()
+    )
+
+
+@app.get("/bench/reference/rooms/{room_id}", response_model=RoomDetailResponse, response_class=JSONResponse)
+def reference_get_room(room_id: uuid.UUID, db: Session = Depends(get_read_db), current_user: User = Depends(get_current_reader)):
+    room = (
+        db.query(Room)
+        .options(
+            joinedload(Room.columns).joinedload(Column.cards).selectinload(Card.labels),
+            joinedload(Room.columns).joinedload(Column.cards).selectinload(Card.assignees),
+            selectinload(Room.labels),
+        )
+        .filter(Room.id == room_id, Room.deleted_at.is_(None))
+        .first()
+    )
+    room.columns.sort(key=lambda c: c.position)
+    for col in room.columns:
+        col.cards.sort(key=lambda card: card.position)
+    return room
+
+
+def throughput(fn, seconds: float) -> float:
+    fn()  # warm-up
+    done = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < seconds:
+        fn()
+        done += 1
+    return done / elapsed
+
+
+def compare(name: str, fast: float, reference: float, unit: str):
+    print(f"{name:<22}{reference:>10,.1f} {unit} → {fast:>10,.1f} {unit}   ({fast / reference:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--room", help="room id (default: the largest room)")
+    parser.add_argument("--seconds", type=float, default=3.0, help="time per measurement")
+    args = parser.parse_args()
+
+    logging.getLogger("syncboard.slow").setLevel(logging.ERROR)
+    room_id, owner_id, cards = pick_room(args.room)
+    headers = {"Authorization": f"Bearer {create_access_token(str(owner_id))}"}
+    print(f"room {room_id}: {cards:,} cards")
+
+    with TestClient(app) as client:
+        for name, fast_url, reference_url in (
+            ("GET /api/rooms/{id}", f"/api/rooms/{room_id}", f"/bench/reference/rooms/{room_id}"),
+            ("GET /api/rooms", "/api/rooms", "/bench/reference/rooms"),
+        ):
+            def get(url):
+                resp = client.get(url, headers=headers)
+                resp.raise_for_status()
+                return resp
+
+            compare(name, throughput(lambda: get(fast_url), args.seconds),
+                    throughput(lambda: get(reference_url), args.seconds), "req/s")
+
+        with SessionLocal() as db:
+            card = db.scalars(
+                select(Card).join(Column, Card.column_id == Column.id).where(Column.room_id == room_id).limit(1)
+            ).one()
+
+            def fast():
+                return orjson.dumps(card_serializer.from_object(card), option=ORJSON_OPTIONS)
+
+            def reference():
+                # What FastAPI does with response_model=CardResponse and the stdlib JSONResponse
+                return JSONResponse(CardResponse.model_validate(card).model_dump(mode="json")).body
+
+            compare("card response", throughput(fast, args.seconds), throughput(reference, args.seconds), "ops/s")
+
+
+if __name__ == "__main__":
+    main()
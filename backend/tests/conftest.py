@@ -0,0 +1,137 @@
+import os
+
+# Point the app at a throwaway database *before* anything imports app.config:
+# a local SQLite file by default, or a disposable Postgres via TEST_DATABASE_URL.
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL", "sqlite:///./test.db")
+os.environ.pop("DATABASE_READ_URL", None)
+# Keep per-statement text so repeated identical queries get reported as suspected N+1s
+os.environ.setdefault("QUERY_DEBUG", "true")
+# One admin account so the /api/admin endpoints can be exercised too
+os.environ.setdefault("ADMIN_EMAILS", '["admin@example.com"]')
+
+import pytest
+import app.models  # noqa: F401 — registers every table on Base.metadata
+from app.database import Base, engine
+from app.migrate import stamp
+from app.query_stats import query_stats
+
+
+# Maximum statements per request / per WebSocket message, keyed the way app.query_stats
+# labels them ("METHOD route-template" or "WS message-type"). Adding a query to an
+# endpoint means bumping its number here on purpose, in review.
+QUERY_BUDGETS = {
+    "GET /api/health": 0,
+    # Auth
+    "POST /api/auth/register": 3,
+    "POST /api/auth/login": 1,
+    "GET /api/auth/me": 1,
+    # Rooms
+    "POST /api/rooms": 6,
+    "POST /api/rooms/join": 5,
+    "POST /api/rooms/{room_id}/ws-ticket": 2,
+    "GET /api/rooms": 2,
+    "GET /api/rooms/summary": 2,
+    "GET /api/rooms/{room_id}": 5,
+    "PATCH /api/rooms/{room_id}/settings": 3,
+    "DELETE /api/rooms/{room_id}": 5,
+    "GET /api/rooms/{room_id}/purge": 1,
+    # Cards
+    "POST /api/rooms/{room_id}/cards": 5,
+    "GET /api/rooms/{room_id}/cards/search": 4,
+    "PATCH /api/rooms/{room_id}/cards/{card_id}": 14,
+    "DELETE /api/rooms/{room_id}/cards/{card_id}": 9,
+    "PUT /api/rooms/{room_id}/cards/{card_id}/labels": 9,
+    "PUT /api/rooms/{room_id}/cards/{card_id}/assignees": 9,
+    # Labels
+    "GET /api/rooms/{room_id}/labels": 3,
+    "POST /api/rooms/{room_id}/labels": 5,
+    "PATCH /api/rooms/{room_id}/labels/{label_id}": 6,
+    "DELETE /api/rooms/{room_id}/labels/{label_id}": 5,
+    # Columns
+    "POST /api/rooms/{room_id}/columns": 6,
+    "PATCH /api/rooms/{room_id}/columns/{column_id}": 7,
+    "DELETE /api/rooms/{room_id}/columns/{column_id}": 9,  # + row locks on both columns before moving cards
+    "POST /api/rooms/{room_id}/columns/{column_id}/cards/move": 8,
+    "DELETE /api/rooms/{room_id}/columns/{column_id}/cards": 6,
+    "POST /api/rooms/{room_id}/columns/{column_id}/sort": 5,
+    # Archive / activity
+    "GET /api/rooms/{room_id}/archive": 3,
+    "POST /api/rooms/{room_id}/archive": 8,
+    "POST /api/rooms/{room_id}/archive/restore": 12,
+    "PUT /api/rooms/{room_id}/archive/policies/{column_id}": 4,
+    "GET /api/rooms/{room_id}/activity": 3,
+    # Admin
+    "GET /api/admin/ws/rtt": 1,
+    "GET /api/admin/ws/admission": 1,
+    "GET /api/admin/ws/dashboard": 1,
+    "GET /api/admin/ws/drain": 1,
+    "GET /api/admin/memory": 1,
+    "GET /api/admin/memory/allocations": 1,
+    "GET /api/admin/shed": 1,
+    "GET /api/admin/activity": 1,
+    "GET /api/admin/queries": 1,
+    # WebSocket
+    "WS connect": 0,  # ?ticket= handshake — no queries at all
+    "WS connect (token)": 2,
+    "WS user connect": 2,
+    "WS card_create": 5,
+    "WS card_move": 10,
+    "WS card_update": 4,
+    "WS card_delete": 6,
+    "WS column_create": 3,
+    "WS column_rename": 3,
+    "WS column_move": 4,
+    "WS column_delete": 6,
+    "WS column_move_cards": 5,
+    "WS column_clear": 3,
+    "WS column_sort": 2,
+    "WS card_focus": 0,
+    "WS card_blur": 0,
+    "WS subscribe": 0,
+    "WS unsubscribe": 0,
+    "WS ping": 0,
+    "WS heartbeat_ack": 0,
+}
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Fresh schema for the test session, straight from the models."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    # Built from the models rather than migrated: mark it current so /api/ready's schema check passes
+    stamp()
+    yield engine
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def client(database):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Fails the test if any endpoint or WebSocket message it exercised ran more statements
+    than its entry in QUERY_BUDGETS (or has no entry at all), or repeated one identical
+    statement often enough to look like an N+1. Yields the registry, so a test can also
+    look at counts directly: query_budget.by_label["GET /api/rooms"]["max_queries"].
+    """
+    query_stats.reset()
+    yield query_stats
+
+    problems = []
+    for label, agg in sorted(query_stats.by_label.items()):
+        budget = QUERY_BUDGETS.get(label)
+        if budget is None:
+            problems.append(f"{label}: no query budget declared")
+        elif agg["max_queries"] > budget:
+            problems.append(f"{label}: {agg['max_queries']} queries, budget is {budget}")
+    for label, sql, n in query_stats.suspects:
+        problems.append(f"{label}: suspected N+1, ran {n}x: {' '.join(sql.split())[:160]}")
+    assert not problems, "Query budget violations:\n  " + "\n  ".join(problems)
@@ -0,0 +1,37 @@
+"""The write-behind activity writer: a batch that keeps failing can't wedge the queue."""
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from app.activity.writer import ActivityWriter
+from app.database import SessionLocal
+from app.models import Activity
+
+
+def count_rows(room_id: uuid.UUID) -> int:
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).select_from(Activity).where(Activity.room_id == room_id))
+
+
+def test_poison_row_is_dropped_after_max_retries(database):
+    writer = ActivityWriter(batch_size=10, flush_interval=1.0, max_queue=100, retention_months=12, max_retries=3)
+    room_id = uuid.uuid4()
+    writer.record(room_id, "card_created", title="ok 1")
+    writer.record(room_id, "card_updated", fields=object())  # details that can never be stored
+    writer.record(room_id, "card_deleted", title="ok 2")
+
+    for _ in range(2):
+        with pytest.raises(Exception):
+            writer.flush()
+        assert len(writer.queue) == 3  # Requeued in order, nothing lost yet
+
+    # Third failure: the batch is written row by row and only the bad row goes
+    assert writer.flush() == 2
+    assert writer.stats() == {"queued": 0, "written": 2, "dropped": 0, "failed": 1}
+    assert count_rows(room_id) == 2
+
+    # The retry count starts over for the next batch
+    writer.record(room_id, "card_created", title="ok 3")
+    assert writer.flush() == 1
+    assert count_rows(room_id) == 3
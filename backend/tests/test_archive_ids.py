@@ -0,0 +1,55 @@
+"""Client-chosen card ids vs archived cards: no reuse on create, no crash on restore."""
+import uuid
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.database import SessionLocal
+from app.models import ArchivedCard, Card
+from tests.test_query_budgets import auth, register, sync
+
+
+@pytest.fixture
+def archived(client):
+    """A room with one archived card."""
+    owner = register(client, "archiver")
+    rid = client.post("/api/rooms", json={"name": "Archive ids"}, headers=auth(owner)).json()["id"]
+    todo = client.get(f"/api/rooms/{rid}", headers=auth(owner)).json()["columns"][0]["id"]
+    card = client.post(f"/api/rooms/{rid}/cards", json={"column_id": todo, "title": "Old"}, headers=auth(owner)).json()
+    assert client.post(f"/api/rooms/{rid}/archive", json={"card_ids": [card["id"]]}, headers=auth(owner)).json()["archived"] == 1
+    return {"owner": owner, "room_id": rid, "column_id": todo, "card_id": card["id"]}
+
+
+def on_board(card_id: str) -> bool:
+    with SessionLocal() as db:
+        return db.get(Card, uuid.UUID(card_id)) is not None
+
+
+def test_rest_create_rejects_an_archived_id(client, archived):
+    resp = client.post(f"/api/rooms/{archived['room_id']}/cards", headers=auth(archived["owner"]),
+                       json={"id": archived["card_id"], "column_id": archived["column_id"], "title": "Reused"})
+    assert resp.status_code == 409
+    assert not on_board(archived["card_id"])
+
+
+def test_ws_create_ignores_an_archived_id(client, archived):
+    with client.websocket_connect(f"/ws/{archived['room_id']}?token={archived['owner']['token']}") as ws:
+        ws.send_json({"type": "card_create", "id": archived["card_id"], "column_id": archived["column_id"], "title": "Reused"})
+        sync(ws)
+    assert not on_board(archived["card_id"])
+
+
+def test_restore_leaves_a_clashing_card_archived(client, archived):
+    # A row with the archived id already on the board (e.g. written before ids were checked)
+    with SessionLocal() as db:
+        row = db.execute(select(ArchivedCard).where(ArchivedCard.id == uuid.UUID(archived["card_id"]))).scalar_one()
+        db.execute(insert(Card).values(id=row.id, column_id=row.column_id, title="Clash", description="",
+                                       position=1, created_by=row.created_by))
+        db.commit()
+
+    resp = client.post(f"/api/rooms/{archived['room_id']}/archive/restore", headers=auth(archived["owner"]),
+                       json={"card_ids": [archived["card_id"]]})
+    assert resp.status_code == 200
+    assert resp.json()["restored"] == []
+    with SessionLocal() as db:
+        assert db.get(ArchivedCard, uuid.UUID(archived["card_id"])) is not None
@@ -0,0 +1,52 @@
+"""The auto-archive policy: which cards count as untouched, and which rooms it sweeps."""
+import uuid
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app.archive.service import run_auto_archive
+from app.database import SessionLocal
+from app.models import Card, utcnow
+
+
+@pytest.fixture
+def stale_column(client):
+    """A room whose first column has an auto-archive policy and three cards last edited 60 days ago."""
+    email = f"policy-{uuid.uuid4().hex[:8]}@example.com"
+    token = client.post("/api/auth/register", json={"email": email, "display_name": "p", "password": "pw"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    rid = client.post("/api/rooms", json={"name": "Policy"}, headers=headers).json()["id"]
+    columns = [c["id"] for c in client.get(f"/api/rooms/{rid}", headers=headers).json()["columns"]]
+    cards = [
+        client.post(f"/api/rooms/{rid}/cards", json={"column_id": columns[0], "title": f"card {i}"}, headers=headers).json()["id"]
+        for i in range(3)
+    ]
+    with SessionLocal() as db:
+        db.execute(update(Card).where(Card.id.in_([uuid.UUID(c) for c in cards]))
+                   .values(updated_at=utcnow() - timedelta(days=60)))
+        db.commit()
+    resp = client.put(f"/api/rooms/{rid}/archive/policies/{columns[0]}", json={"auto_archive_days": 30}, headers=headers)
+    assert resp.status_code == 204
+    return {"headers": headers, "room_id": rid, "columns": columns, "cards": cards}
+
+
+def test_shifting_neighbours_does_not_count_as_an_edit(client, stale_column):
+    rid, headers, (first, second, third) = stale_column["room_id"], stale_column["headers"], stale_column["cards"]
+    # Moving the last card to the top shifts the other two down; deleting it shifts them back
+    moved = client.patch(f"/api/rooms/{rid}/cards/{third}", json={"position": 0}, headers=headers).json()
+    assert moved["position"] == 0
+    with SessionLocal() as db:
+        order = db.scalars(select(Card.id).where(Card.column_id == uuid.UUID(stale_column["columns"][0]))
+                           .order_by(Card.position)).all()
+    assert [str(c) for c in order] == [third, first, second]
+    assert client.delete(f"/api/rooms/{rid}/cards/{third}", headers=headers).status_code == 204
+
+    archived = run_auto_archive(batch_size=100)
+    assert sorted(archived.get(rid, [])) == sorted([first, second])
+
+
+def test_deleted_rooms_are_skipped(client, stale_column):
+    rid, headers = stale_column["room_id"], stale_column["headers"]
+    assert client.delete(f"/api/rooms/{rid}", headers=headers).status_code == 204
+    assert rid not in run_auto_archive(batch_size=100)
@@ -0,0 +1,20 @@
+"""
+The cold-start budget from bench.cold_start, enforced in the suite: a fresh uvicorn process
+on the test database must report /api/ready within COLD_START_BUDGET_MS (default 3000).
+"""
+import os
+import statistics
+
+from bench.cold_start import boot_once
+
+BUDGET_MS = float(os.environ.get("COLD_START_BUDGET_MS", "3000"))
+RUNS = 3
+
+
+def test_time_to_ready_within_budget(database):
+    # `database` built and stamped the schema, so the child's schema check can pass
+    boots = [boot_once(timeout=30.0) for _ in range(RUNS)]
+    assert all(live is not None for live, _ in boots), f"server never accepted connections: {boots}"
+    assert all(ready is not None for _, ready in boots), f"/api/ready never returned 200: {boots}"
+    median = statistics.median(ready for _, ready in boots)
+    assert median <= BUDGET_MS, f"median time to ready {median:.0f} ms, budget {BUDGET_MS:.0f} ms"
@@ -0,0 +1,45 @@
+"""CompressionMiddleware: one strong ETag per encoding, and 304s that honour it."""
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.compression import CompressionCache, CompressionMiddleware
+
+BODY = {"cards": ["x" * 40] * 50}
+
+
+@pytest.fixture
+def client():
+    inner = FastAPI()
+
+    @inner.get("/board")
+    def board():
+        return JSONResponse(BODY)
+
+    app = CompressionMiddleware(inner, minimum_size=100, cache=CompressionCache(1024 * 1024))
+    return TestClient(app)
+
+
+def test_each_encoding_has_its_own_etag(client):
+    identity = client.get("/board", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/board", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in identity.headers
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert identity.headers["etag"] != gzipped.headers["etag"]
+    assert gzipped.headers["etag"].endswith('-gzip"')
+    for resp in (identity, gzipped):
+        assert resp.headers["vary"] == "Accept-Encoding"
+        assert resp.json() == BODY
+
+
+def test_if_none_match_is_per_encoding(client):
+    gzip_etag = client.get("/board", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    same = client.get("/board", headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag})
+    assert same.status_code == 304
+    # A gzip validator doesn't vouch for the identity bytes
+    other = client.get("/board", headers={"Accept-Encoding": "identity", "If-None-Match": gzip_etag})
+    assert other.status_code == 200
+    # Lists and weak forms are compared weakly, as If-None-Match requires
+    listed = client.get("/board", headers={"Accept-Encoding": "gzip", "If-None-Match": f'"nope", W/{gzip_etag}'})
+    assert listed.status_code == 304
@@ -0,0 +1,49 @@
+"""The dashboard feed: REST writes reach open dashboards, and last activity doesn't wait for the activity log."""
+import time
+from datetime import datetime
+
+from app.config import settings
+from tests.test_query_budgets import auth, receive, register
+
+
+def parse(timestamp: str) -> datetime:
+    return datetime.fromisoformat(timestamp).replace(tzinfo=None)
+
+
+def pushed_summary(dashboard) -> dict:
+    """Wait out the debounce, then collect what was pushed (the pong marks the end) — never blocks forever."""
+    time.sleep(settings.dashboard_push_debounce_ms / 1000 * 2 + 0.2)
+    dashboard.send_json({"type": "ping"})
+    pushed = []
+    while (message := dashboard.receive_json())["type"] != "pong":
+        pushed.append(message)
+    summaries = [m["room"] for m in pushed if m["type"] == "room_summary"]
+    assert summaries, f"no room_summary pushed, got {pushed}"
+    return summaries[-1]
+
+
+def test_rest_card_writes_reach_the_dashboard(client):
+    owner = register(client, "dash")
+    rid = client.post("/api/rooms", json={"name": "Dash"}, headers=auth(owner)).json()["id"]
+    todo = client.get(f"/api/rooms/{rid}", headers=auth(owner)).json()["columns"][0]["id"]
+
+    with client.websocket_connect(f"/ws/user?token={owner['token']}") as dashboard:
+        receive(dashboard, "summary")
+        card = client.post(f"/api/rooms/{rid}/cards", json={"column_id": todo, "title": "REST"}, headers=auth(owner)).json()
+        room = pushed_summary(dashboard)
+        assert room["card_count"] == 1
+        assert parse(room["last_activity_at"]) >= parse(card["created_at"])
+
+        assert client.delete(f"/api/rooms/{rid}/cards/{card['id']}", headers=auth(owner)).status_code == 204
+        assert pushed_summary(dashboard)["card_count"] == 0
+
+
+def test_last_activity_follows_card_writes(client):
+    owner = register(client, "recent")
+    rid = client.post("/api/rooms", json={"name": "Recent"}, headers=auth(owner)).json()["id"]
+    todo = client.get(f"/api/rooms/{rid}", headers=auth(owner)).json()["columns"][0]["id"]
+    card = client.post(f"/api/rooms/{rid}/cards", json={"column_id": todo, "title": "t"}, headers=auth(owner)).json()
+    patched = client.patch(f"/api/rooms/{rid}/cards/{card['id']}", json={"title": "edited"}, headers=auth(owner)).json()
+
+    summary = next(r for r in client.get("/api/rooms/summary", headers=auth(owner)).json() if r["id"] == rid)
+    assert parse(summary["last_activity_at"]) >= parse(patched["updated_at"])
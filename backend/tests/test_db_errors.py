@@ -0,0 +1,38 @@
+"""How REST requests answer when the database raises: 503 for a fired limit, 500 for anything else."""
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.auth.dependencies import get_read_db
+from app.main import app
+
+
+class Orig(Exception):
+    def __init__(self, sqlstate):
+        super().__init__(sqlstate)
+        self.sqlstate = sqlstate
+
+
+@pytest.fixture
+def failing_reads(client):
+    def fail_with(sqlstate):
+        def broken_session():
+            raise OperationalError("SELECT 1", {}, Orig(sqlstate))
+        app.dependency_overrides[get_read_db] = broken_session
+    yield fail_with
+    app.dependency_overrides.pop(get_read_db, None)
+
+
+def test_statement_timeout_is_shed(client, failing_reads):
+    failing_reads("57014")
+    resp = client.get("/api/rooms", headers={"Authorization": "Bearer x"})
+    assert resp.status_code == 503
+    assert resp.json()["reason"] == "statement_timeout"
+    assert int(resp.headers["Retry-After"]) >= 1
+
+
+def test_other_operational_errors_are_a_plain_500(client, failing_reads):
+    failing_reads("08006")
+    resp = client.get("/api/rooms", headers={"Authorization": "Bearer x"})
+    assert resp.status_code == 500
+    assert resp.json() == {"detail": "Internal Server Error"}
+    assert "Retry-After" not in resp.headers
@@ -0,0 +1,233 @@
+"""
+Every REST route and WebSocket message type in QUERY_BUDGETS, exercised once under the
+`query_budget` fixture — which fails the test if any of them runs more statements than
+its budget. Each test declares the labels it covers with @covers, so a budget nobody
+exercises is caught by test_every_budget_is_exercised, whatever order the tests run in.
+"""
+import uuid
+
+import pytest
+
+from tests.conftest import QUERY_BUDGETS
+
+
+def covers(*labels: str):
+    """
+    Declare the budget labels a test exercises. Recorded on the function at import time, so
+    the coverage check below works whatever order (or subset) the tests run in.
+    """
+    def declare(test):
+        test.budget_labels = labels
+        return test
+    return declare
+
+
+@pytest.fixture(autouse=True)
+def declared_labels_ran(request, query_budget):
+    """After each test, its declared labels must actually have run (and so been held to their budgets)."""
+    yield
+    labels = getattr(request.function, "budget_labels", ())
+    missing = [label for label in labels if label not in query_budget.by_label]
+    assert not missing, f"never ran: {missing}"
+
+
+def register(client, name: str) -> dict:
+    email = f"{name}-{uuid.uuid4().hex[:8]}@example.com"
+    resp = client.post("/api/auth/register", json={"email": email, "display_name": name, "password": "pw"})
+    assert resp.status_code == 201, resp.text
+    return {"Authorization": f"Bearer {resp.json()['access_token']}", "email": email, "token": resp.json()["access_token"]}
+
+
+def auth(user: dict) -> dict:
+    return {"Authorization": user["Authorization"]}
+
+
+@pytest.fixture
+def board(client):
+    """A room with its three default columns, owned by a fresh user."""
+    owner = register(client, "owner")
+    room = client.post("/api/rooms", json={"name": "Budget room"}, headers=auth(owner)).json()
+    columns = [c["id"] for c in client.get(f"/api/rooms/{room['id']}", headers=auth(owner)).json()["columns"]]
+    return {"owner": owner, "room": room, "columns": columns}
+
+
+def sync(ws):
+    """Messages are handled in order per socket: once the pong is back, everything before it ran."""
+    ws.send_json({"type": "ping"})
+    while ws.receive_json()["type"] != "pong":
+        pass
+
+
+def receive(ws, message_type: str) -> dict:
+    while True:
+        message = ws.receive_json()
+        if message["type"] == message_type:
+            return message
+
+
+@covers("GET /api/health", "POST /api/auth/register", "POST /api/auth/login", "GET /api/auth/me")
+def test_auth_and_health(client, query_budget):
+    assert client.get("/api/health").status_code == 200
+    user = register(client, "auth")
+    assert client.post("/api/auth/login", json={"email": user["email"], "password": "pw"}).status_code == 200
+    assert client.get("/api/auth/me", headers=auth(user)).status_code == 200
+
+
+@covers(
+    "POST /api/rooms", "POST /api/rooms/join", "POST /api/rooms/{room_id}/ws-ticket", "GET /api/rooms",
+    "GET /api/rooms/summary", "GET /api/rooms/{room_id}", "PATCH /api/rooms/{room_id}/settings",
+    "DELETE /api/rooms/{room_id}", "GET /api/rooms/{room_id}/purge",
+)
+def test_rooms(client, query_budget, board):
+    owner, room = board["owner"], board["room"]
+    rid = room["id"]
+    member = register(client, "member")
+    assert client.post("/api/rooms/join", json={"room_code": room["room_code"]}, headers=auth(member)).status_code == 200
+    assert client.post(f"/api/rooms/{rid}/ws-ticket", headers=auth(owner)).status_code == 200
+    assert client.get("/api/rooms", headers=auth(owner)).status_code == 200
+    assert client.get("/api/rooms/summary", headers=auth(owner)).status_code == 200
+    assert client.get(f"/api/rooms/{rid}", headers=auth(owner)).status_code == 200
+    assert client.patch(f"/api/rooms/{rid}/settings", json={"ws_compression": False}, headers=auth(owner)).status_code == 200
+    assert client.delete(f"/api/rooms/{rid}", headers=auth(owner)).status_code == 204
+    assert client.get(f"/api/rooms/{rid}/purge", headers=auth(owner)).status_code == 200
+
+
+@covers(
+    "POST /api/rooms/{room_id}/cards", "GET /api/rooms/{room_id}/cards/search",
+    "PATCH /api/rooms/{room_id}/cards/{card_id}", "DELETE /api/rooms/{room_id}/cards/{card_id}",
+    "PUT /api/rooms/{room_id}/cards/{card_id}/labels", "PUT /api/rooms/{room_id}/cards/{card_id}/assignees",
+    "GET /api/rooms/{room_id}/labels", "POST /api/rooms/{room_id}/labels",
+    "PATCH /api/rooms/{room_id}/labels/{label_id}", "DELETE /api/rooms/{room_id}/labels/{label_id}",
+)
+def test_cards_and_labels(client, query_budget, board):
+    headers, rid, (todo, doing, _) = auth(board["owner"]), board["room"]["id"], board["columns"]
+    cards = f"/api/rooms/{rid}/cards"
+    card = client.post(cards, json={"column_id": todo, "title": "Budget card"}, headers=headers).json()
+    client.post(cards, json={"column_id": todo, "title": "Another card"}, headers=headers)
+    assert client.get(f"{cards}/search", params={"q": "budget"}, headers=headers).status_code == 200
+    assert client.patch(f"{cards}/{card['id']}", json={"column_id": doing}, headers=headers).status_code == 200
+
+    labels = f"/api/rooms/{rid}/labels"
+    label = client.post(labels, json={"name": "bug", "color": "#ff0000"}, headers=headers).json()
+    assert client.get(labels, headers=headers).status_code == 200
+    assert client.patch(f"{labels}/{label['id']}", json={"name": "defect"}, headers=headers).status_code == 200
+    assert client.put(f"{cards}/{card['id']}/labels", json={"label_ids": [label["id"]]}, headers=headers).status_code == 200
+    me = client.get("/api/auth/me", headers=headers).json()["id"]
+    assert client.put(f"{cards}/{card['id']}/assignees", json={"user_ids": [me]}, headers=headers).status_code == 200
+    # Filtered board views stay within the same budget as the plain one
+    assert client.get(f"/api/rooms/{rid}", params={"label": label["id"], "assignee": me}, headers=headers).status_code == 200
+    assert client.delete(f"{labels}/{label['id']}", headers=headers).status_code == 204
+    assert client.delete(f"{cards}/{card['id']}", headers=headers).status_code == 204
+
+
+@covers(
+    "POST /api/rooms/{room_id}/columns", "PATCH /api/rooms/{room_id}/columns/{column_id}",
+    "DELETE /api/rooms/{room_id}/columns/{column_id}", "POST /api/rooms/{room_id}/columns/{column_id}/cards/move",
+    "DELETE /api/rooms/{room_id}/columns/{column_id}/cards", "POST /api/rooms/{room_id}/columns/{column_id}/sort",
+)
+def test_columns(client, query_budget, board):
+    headers, rid, (todo, doing, done) = auth(board["owner"]), board["room"]["id"], board["columns"]
+    columns = f"/api/rooms/{rid}/columns"
+    for title in ("b", "a", "c"):
+        client.post(f"/api/rooms/{rid}/cards", json={"column_id": todo, "title": title}, headers=headers)
+    extra = client.post(columns, json={"title": "Review"}, headers=headers).json()
+    assert client.patch(f"{columns}/{extra['id']}", json={"title": "QA", "to_index": 0}, headers=headers).status_code == 200
+    assert client.post(f"{columns}/{todo}/sort", json={"by": "title"}, headers=headers).status_code == 200
+    assert client.post(f"{columns}/{todo}/cards/move", json={"to_column_id": doing}, headers=headers).status_code == 200
+    assert client.delete(f"{columns}/{doing}", params={"move_cards_to": done}, headers=headers).status_code == 204
+    assert client.delete(f"{columns}/{done}/cards", headers=headers).status_code == 200
+
+
+@covers(
+    "GET /api/rooms/{room_id}/archive", "POST /api/rooms/{room_id}/archive",
+    "POST /api/rooms/{room_id}/archive/restore", "PUT /api/rooms/{room_id}/archive/policies/{column_id}",
+    "GET /api/rooms/{room_id}/activity",
+)
+def test_archive_and_activity(client, query_budget, board):
+    headers, rid, (todo, *_) = auth(board["owner"]), board["room"]["id"], board["columns"]
+    card = client.post(f"/api/rooms/{rid}/cards", json={"column_id": todo, "title": "Old"}, headers=headers).json()
+    archive = f"/api/rooms/{rid}/archive"
+    assert client.post(archive, json={"card_ids": [card["id"]]}, headers=headers).json()["archived"] == 1
+    assert client.get(archive, headers=headers).status_code == 200
+    assert client.post(f"{archive}/restore", json={"card_ids": [card["id"]]}, headers=headers).status_code == 200
+    assert client.put(f"{archive}/policies/{todo}", json={"auto_archive_days": 30}, headers=headers).status_code == 204
+    assert client.get(f"/api/rooms/{rid}/activity", headers=headers).status_code == 200
+
+
+@covers(
+    "GET /api/admin/ws/rtt", "GET /api/admin/ws/admission", "GET /api/admin/ws/dashboard",
+    "GET /api/admin/ws/drain", "GET /api/admin/memory", "GET /api/admin/memory/allocations",
+    "GET /api/admin/shed", "GET /api/admin/activity", "GET /api/admin/queries",
+)
+def test_admin(client, query_budget):
+    admin = register(client, "admin")
+    # register() makes a unique address; the admin list is keyed on admin@example.com
+    resp = client.post("/api/auth/register", json={"email": "admin@example.com", "display_name": "admin", "password": "pw"})
+    if resp.status_code == 409:
+        resp = client.post("/api/auth/login", json={"email": "admin@example.com", "password": "pw"})
+    headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+    assert client.get("/api/admin/ws/rtt", headers=auth(admin)).status_code == 403
+    for path in ("ws/rtt", "ws/admission", "ws/dashboard", "ws/drain", "memory", "shed", "activity", "queries"):
+        assert client.get(f"/api/admin/{path}", headers=headers).status_code == 200, path
+    assert client.get("/api/admin/memory/allocations", params={"seconds": 0.05}, headers=headers).status_code == 200
+
+
+@covers(
+    "WS connect", "WS connect (token)", "WS user connect",
+    "WS card_create", "WS card_move", "WS card_update", "WS card_delete",
+    "WS column_create", "WS column_rename", "WS column_move", "WS column_delete",
+    "WS column_move_cards", "WS column_clear", "WS column_sort",
+    "WS card_focus", "WS card_blur", "WS subscribe", "WS unsubscribe", "WS ping", "WS heartbeat_ack",
+)
+def test_websocket_messages(client, query_budget, board):
+    owner, rid, (todo, doing, done) = board["owner"], board["room"]["id"], board["columns"]
+    other = register(client, "other")
+    client.post("/api/rooms/join", json={"room_code": board["room"]["room_code"]}, headers=auth(other))
+    ticket = client.post(f"/api/rooms/{rid}/ws-ticket", headers=auth(owner)).json()["ticket"]
+
+    with client.websocket_connect(f"/ws/{rid}?ticket={ticket}") as ws, \
+            client.websocket_connect(f"/ws/{rid}?token={other['token']}") as watcher, \
+            client.websocket_connect(f"/ws/user?token={owner['token']}") as dashboard:
+        receive(dashboard, "summary")
+        ws.send_json({"type": "card_create", "column_id": todo, "title": "Live"})
+        card = receive(ws, "card_created")["card"]
+        ws.send_json({"type": "card_move", "card_id": card["id"], "to_column_id": doing, "to_position": 0})
+        receive(ws, "card_moved")
+        ws.send_json({"type": "card_update", "card_id": card["id"], "title": "Live!"})
+        receive(ws, "card_updated")
+        ws.send_json({"type": "card_focus", "card_id": card["id"]})
+        receive(watcher, "card_focused")
+        ws.send_json({"type": "card_blur", "card_id": card["id"]})
+        receive(watcher, "card_blurred")
+        watcher.send_json({"type": "subscribe", "column_ids": [todo]})
+        receive(watcher, "subscriptions")
+        watcher.send_json({"type": "unsubscribe", "column_ids": [todo]})
+        receive(watcher, "subscriptions")
+        ws.send_json({"type": "heartbeat_ack", "sentAt": 0})
+        sync(ws)
+        ws.send_json({"type": "card_delete", "card_id": card["id"]})
+        receive(ws, "card_deleted")
+
+        ws.send_json({"type": "column_create", "title": "Later"})
+        column = receive(ws, "column_created")["column"]
+        ws.send_json({"type": "column_rename", "column_id": column["id"], "title": "Someday"})
+        receive(ws, "column_renamed")
+        ws.send_json({"type": "column_move", "column_id": column["id"], "to_index": 0})
+        receive(ws, "column_moved")
+        for title in ("b", "a"):
+            ws.send_json({"type": "card_create", "column_id": todo, "title": title})
+            receive(ws, "card_created")
+        ws.send_json({"type": "column_sort", "column_id": todo, "by": "title"})
+        receive(ws, "column_sorted")
+        ws.send_json({"type": "column_move_cards", "column_id": todo, "to_column_id": done})
+        receive(ws, "column_cards_moved")
+        ws.send_json({"type": "column_clear", "column_id": done})
+        receive(ws, "column_cleared")
+        ws.send_json({"type": "column_delete", "column_id": column["id"]})
+        receive(ws, "column_deleted")
+
+
+def test_every_budget_is_exercised():
+    """A budget no test exercises is a budget nobody enforces. Reads the @covers declarations, so it can run alone."""
+    covered = {label for test in list(globals().values()) for label in getattr(test, "budget_labels", ())}
+    assert not set(QUERY_BUDGETS) - covered, f"budgets with no test: {sorted(set(QUERY_BUDGETS) - covered)}"
@@ -0,0 +1,19 @@
+"""WebSocket connect tickets and the room-wide deny-list."""
+import time
+import uuid
+
+from app.ws.tickets import deny_list, issue_ticket, read_ticket
+
+
+def test_room_revocation_refuses_earlier_tickets_only():
+    room_id, user_id = str(uuid.uuid4()), str(uuid.uuid4())
+    before = issue_ticket(user_id, "T", room_id, ws_compression=True)
+    assert read_ticket(before, room_id)["sub"] == user_id
+    assert read_ticket(before, str(uuid.uuid4())) is None  # Bound to its room
+
+    deny_list.revoke(room_id)
+    assert read_ticket(before, room_id) is None
+
+    time.sleep(0.001)
+    after = issue_ticket(user_id, "T", room_id, ws_compression=True)
+    assert read_ticket(after, room_id) is not None
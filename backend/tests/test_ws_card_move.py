@@ -0,0 +1,23 @@
+"""WebSocket card moves: idempotency keys and rejected targets."""
+import uuid
+
+from tests.test_query_budgets import auth, receive, register
+
+
+def test_rejected_move_releases_its_idempotency_key(client):
+    owner = register(client, "mover")
+    rid = client.post("/api/rooms", json={"name": "Moves"}, headers=auth(owner)).json()["id"]
+    todo, doing, _ = [c["id"] for c in client.get(f"/api/rooms/{rid}", headers=auth(owner)).json()["columns"]]
+
+    with client.websocket_connect(f"/ws/{rid}?token={owner['token']}") as ws:
+        ws.send_json({"type": "card_create", "column_id": todo, "title": "Move me"})
+        card_id = receive(ws, "card_created")["card"]["id"]
+
+        # The target isn't a column of this room: nothing happens, and the key isn't used up
+        ws.send_json({"type": "card_move", "card_id": card_id, "to_column_id": str(uuid.uuid4()),
+                      "to_position": 0, "idempotency_key": "move-1"})
+        ws.send_json({"type": "card_move", "card_id": card_id, "to_column_id": doing,
+                      "to_position": 0, "idempotency_key": "move-1"})
+        moved = receive(ws, "card_moved")
+        assert moved["to_column_id"] == doing
+        assert moved["from_column_id"] == todo
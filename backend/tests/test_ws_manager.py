@@ -0,0 +1,84 @@
+"""ConnectionManager bookkeeping that doesn't need a live socket."""
+import asyncio
+import time
+import uuid
+
+from app.ws.heartbeat import heartbeats
+from app.ws.hibernate import RoomHibernator
+from app.ws.manager import ConnectionManager, manager
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+        self.closed = None
+
+    async def accept(self):
+        pass
+
+    async def close(self, code=1000):
+        self.closed = code
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+
+def test_reconnect_evicts_stale_socket_state():
+    async def scenario():
+        manager = ConnectionManager()
+        user = {"id": "u1", "display_name": "One"}
+        stale, fresh = FakeSocket(), FakeSocket()
+
+        await manager.connect(stale, "room", user, deflate=True)
+        manager.subscribe(stale, "room", ["col-a", "col-b"])
+        manager.focus_card(stale, "room", user, "card-1")
+
+        await manager.connect(fresh, "room", user)
+        assert stale.closed == 1000
+        assert manager.get_users("room") == [user]
+        assert stale not in manager.subscribed
+        assert stale not in manager.deflate_sockets
+        assert "room" not in manager.column_subscribers
+        assert "room" not in manager.focus
+        assert '"focus_expired"' in fresh.sent[-1]
+
+        # The stale socket's receive loop ending later must not disturb the new connection
+        await manager.leave(stale, "room")
+        assert manager.get_users("room") == [user]
+
+    asyncio.run(scenario())
+
+
+def test_sweep_keeps_caches_of_connected_quiet_rooms():
+    async def scenario():
+        room_id, ws = f"quiet-{uuid.uuid4().hex[:8]}", FakeSocket()
+        hibernator = RoomHibernator(idle_seconds=60, interval=60)
+        await manager.connect(ws, room_id, {"id": "viewer", "display_name": "Viewer"})
+        heartbeats.track(ws, room_id)
+        try:
+            # A heartbeat round trip counts as activity
+            heartbeats.pending[ws] = time.monotonic()
+            heartbeats.ack(ws, None)
+            assert room_id in heartbeats.rtt
+            assert room_id not in manager.idle_rooms(60)
+
+            # Nobody has done anything for an hour, but the board is still open
+            manager.last_active[room_id] = time.monotonic() - 3600
+            hibernator.sweep()
+            assert room_id in heartbeats.rtt
+            assert manager.get_users(room_id)
+
+            # Once everyone has left, the next sweep releases the room's caches
+            heartbeats.untrack(ws)
+            manager.disconnect(ws, room_id)
+            manager.last_active[room_id] = time.monotonic() - 3600
+            hibernator.sweep()
+            assert room_id not in heartbeats.rtt
+        finally:
+            heartbeats.untrack(ws)
+            await manager.close_room(room_id)
+
+    asyncio.run(scenario())